@@ -0,0 +1,90 @@
+# aggregate.py
+import math
+import os
+from dotenv import load_dotenv
+from sqlalchemy import Integer, cast, func
+from models import Fire
+from geo import GRID_CELL_DEG, GRID_COLS, InvalidSpatialFilter, bbox_filter
+
+# .env dosyasını yükle
+load_dotenv()
+
+# zoom verildiğinde bir harita karosu (256 px) genişliğine düşen hücre sayısı
+GRID_CELLS_PER_TILE = int(os.getenv('GRID_CELLS_PER_TILE', '32'))
+# Tek istekte dönebilecek en fazla hücre sayısı (bbox / hücre boyutu oranı)
+GRID_MAX_CELLS = int(os.getenv('GRID_MAX_CELLS', '250000'))
+
+# Yanıttaki her hücre dizisinin alanları
+GRID_COLUMNS = ['lat', 'lon', 'count', 'max_frp', 'mean_brightness', 'max_confidence']
+
+def zoom_cell_deg(zoom):
+    """Harita zoom seviyesine uygun hücre boyutu (derece)"""
+    return 360.0 / (2 ** zoom) / GRID_CELLS_PER_TILE
+
+def snap_cell_deg(cell_deg):
+    """Hücre boyutunu ızgaraya oturt: GRID_CELL_DEG ve üstü onun katlarına yuvarlanır
+
+    Katlar hazır cell kolonundan gruplanabilir; daha küçük boyutlar enlem/boylamdan hesaplanır.
+    """
+    if not (0 < cell_deg <= 90):
+        raise InvalidSpatialFilter("cell_deg 0 ile 90 arasında olmalıdır")
+    if cell_deg >= GRID_CELL_DEG:
+        return max(1, round(cell_deg / GRID_CELL_DEG)) * GRID_CELL_DEG
+    return cell_deg
+
+def grid_keys(model, cell_deg, dialect='postgresql'):
+    """Hücrenin (satır, sütun) anahtar ifadeleri
+
+    PostgreSQL'de CAST(... AS INTEGER) yuvarladığı için önce FLOOR uygulanır (bkz. geo.cell_sql).
+    """
+    if cell_deg >= GRID_CELL_DEG:
+        # Hazır hücre numarasından tamsayı bölmeyle (indeks kolonu, trigonometri yok)
+        factor = int(round(cell_deg / GRID_CELL_DEG))
+        return (model.cell / GRID_COLS) / factor, (model.cell % GRID_COLS) / factor
+    row = (model.latitude + 90) / cell_deg
+    col = (model.longitude + 180) / cell_deg
+    if dialect != 'sqlite':
+        row, col = func.floor(row), func.floor(col)
+    return cast(row, Integer), cast(col, Integer)
+
+def fire_grid(session, cell_deg, bbox=None, filters=(), postgis=False):
+    """Yangınları hücre bazında GROUP BY ile topla
+
+    Dönüş: [[merkez enlem, merkez boylam, sayı, en yüksek FRP, ortalama parlaklık, en yüksek güven], ...]
+    """
+    cell_deg = snap_cell_deg(cell_deg)
+    if bbox:
+        min_lon, min_lat, max_lon, max_lat = bbox
+        width = (max_lon - min_lon) % 360 or 360
+        height = max_lat - min_lat
+    else:
+        width, height = 360, 180
+    if math.ceil(width / cell_deg) * math.ceil(max(height, cell_deg) / cell_deg) > GRID_MAX_CELLS:
+        raise InvalidSpatialFilter("cell_deg bu bbox için çok küçük")
+
+    row, col = grid_keys(Fire, cell_deg, session.get_bind().dialect.name)
+    row, col = row.label('row'), col.label('col')
+    query = session.query(
+        row, col,
+        func.count(Fire.id),
+        func.max(Fire.frp),
+        func.avg(Fire.brightness),
+        func.max(Fire.confidence)
+    ).filter(Fire.latitude.isnot(None), Fire.longitude.isnot(None))
+    for condition in filters:
+        query = query.filter(condition)
+    if bbox:
+        query = query.filter(bbox_filter(Fire, bbox, postgis))
+    query = query.group_by(row, col)
+
+    cells = []
+    for r, c, count, max_frp, mean_brightness, max_confidence in query:
+        cells.append([
+            round(-90 + (r + 0.5) * cell_deg, 4),
+            round(-180 + (c + 0.5) * cell_deg, 4),
+            count,
+            max_frp,
+            round(mean_brightness, 2) if mean_brightness is not None else None,
+            max_confidence
+        ])
+    return cell_deg, cells
@@ -1,54 +1,64 @@
 # app.py
-from flask import Flask, jsonify, request, send_from_directory, url_for
+from flask import Blueprint, Flask, current_app, g, jsonify, request, send_from_directory, url_for
 from flask_cors import CORS
 from flask_swagger_ui import get_swaggerui_blueprint
-import requests
-from bs4 import BeautifulSoup
-from datetime import datetime
+from datetime import datetime, timedelta
 import os
 import json
-import uuid
+import time
 import psycopg2
 from psycopg2.extras import RealDictCursor
 import os
 from dotenv import load_dotenv
 from sqlalchemy.orm import sessionmaker
 from models import Earthquake, Fire, TsunamiAlert, engine, init_db
-
-app = Flask(__name__)
-
-# CORS ayarlarını güncelle
-CORS(app, resources={
-    r"/api/*": {
-        "origins": [
-            "http://localhost:3000",
-            "http://localhost:3001",
-            "http://127.0.0.1:3000",
-            "http://127.0.0.1:3001"
-        ],
-        "methods": ["GET", "POST", "OPTIONS"],
-        "allow_headers": ["Content-Type", "Authorization"]
-    }
-})
+from ingest import get_freshness, get_ingest_status
+from scheduler import build_scheduler
+from orchestrator import fetch_sources
+from pagination import InvalidCursor, clamp_limit, decode_cursor, paginate
+from cache import result_cache, get_ttl
+from geo import InvalidSpatialFilter, apply_spatial_filters, parse_bbox, postgis_enabled
+from aggregate import GRID_COLUMNS, fire_grid, zoom_cell_deg
+from streaming import STREAM_FORMATS, InvalidFormat, clamp_stream_limit, get_format, stream_response
+from dedup import attach_solutions, canonical_filter
+from tiles import TILE_LAYERS, InvalidTile, build_tile, encode_tile, tile_cache, validate_tile
+from snapshot import earthquake_snapshot, fire_snapshot
+from events import EventFilter, InvalidEventFilter, TooManySubscribers, event_bus, event_stream, parse_last_event_id
+from conditional import data_versions, etag_matches, make_etag, time_window
+from compression import Variants, compress_response, negotiate
+from leader import SCHEMA_AUTO_MIGRATE, LeaderElection, make_lock
+import metrics
+import upstream
+from functools import wraps
+
+# Route'lar bu blueprint'e tanımlanır; uygulama create_app() ile oluşturulur
+api = Blueprint('api', __name__)
 
 # SQLAlchemy session
 Session = sessionmaker(bind=engine)
 
-# Veritabanını başlat
-init_db()
-
-# API endpoint'leri
-KANDILLI_URL = "http://www.koeri.boun.edu.tr/scripts/lst0.asp"
-EMSC_API = "https://www.seismicportal.eu/fdsnws/event/1/query"
-
-# Yangın API endpoint'leri
-NASA_FIRMS_API = "https://firms.modaps.eosdis.nasa.gov/api/active_fire/csv"
-# NASA FIRMS için API key gerekli (ücretsiz kayıt)
-NASA_FIRMS_KEY = os.getenv('NASA_FIRMS_KEY', 'demo_key')  # Demo key sınırlı kullanım için
-
-# Tsunami API endpoint'leri
-NOAA_TSUNAMI_API = "https://www.tsunami.gov/events/xml/PHEBxml.xml"
-USGS_EARTHQUAKE_API = "https://earthquake.usgs.gov/earthquakes/feed/v1.0/summary/significant_hour.geojson"
+# Veri çekme modu: 'inline' (zamanlayıcı API süreçlerinden lider seçilende çalışır),
+# 'worker' (ayrı süreç: python scheduler.py) veya 'off'
+INGEST_MODE = os.getenv('INGEST_MODE', 'inline')
+ingest_scheduler = build_scheduler()
+# Kayıtlar başka süreçte yazılırken olay akışı yeni kayıtları veritabanından yoklar;
+# inline modda lider seçilen süreç doğrudan yayımlar
+event_bus.poll = INGEST_MODE in ('inline', 'worker')
+
+def start_ingest():
+    """Bu süreç lider seçildi: bekleyen şema göçlerini uygula ve zamanlayıcıyı başlat"""
+    if SCHEMA_AUTO_MIGRATE:
+        init_db()
+    event_bus.poll = False
+    ingest_scheduler.start()
+
+def stop_ingest():
+    """Liderlik kaybedildi: zamanlayıcıyı durdur, yeni kayıtları yeniden yokla"""
+    ingest_scheduler.stop(timeout=5)
+    event_bus.poll = True
+
+# Birden fazla süreçte (gunicorn işçileri) yalnızca kilidi alan süreç veri çeker (bkz. leader.py)
+ingest_leader = LeaderElection(make_lock(engine), start_ingest, stop_ingest)
 
 # Swagger yapılandırması
 SWAGGER_URL = '/api/docs'
@@ -72,7 +82,33 @@ swaggerui_blueprint = get_swaggerui_blueprint(
     }
 )
 
-app.register_blueprint(swaggerui_blueprint, url_prefix=SWAGGER_URL)
+def create_app():
+    """Flask uygulamasını oluştur
+
+    Veritabanına bağlanmaz ve şemaya dokunmaz; liderlik seçimi (inline modda)
+    sürecin ilk isteğinde başlar. Böylece gunicorn --preload ile ana süreçte
+    oluşturulup fork edilebilir. Şema göçleri lider seçilen süreçte
+    (SCHEMA_AUTO_MIGRATE) veya python migrations.py ile uygulanır.
+    """
+    app = Flask(__name__)
+    
+    # CORS ayarlarını güncelle
+    CORS(app, resources={
+        r"/api/*": {
+            "origins": [
+                "http://localhost:3000",
+                "http://localhost:3001",
+                "http://127.0.0.1:3000",
+                "http://127.0.0.1:3001"
+            ],
+            "methods": ["GET", "POST", "OPTIONS"],
+            "allow_headers": ["Content-Type", "Authorization"]
+        }
+    })
+    
+    app.register_blueprint(swaggerui_blueprint, url_prefix=SWAGGER_URL)
+    app.register_blueprint(api)
+    return app
 
 # .env dosyasını yükle
 load_dotenv()
@@ -84,385 +120,40 @@ def get_db_connection():
     """PostgreSQL bağlantısı oluştur"""
     return psycopg2.connect(DATABASE_URL)
 
-def save_to_database(earthquakes, source):
-    """Deprem verilerini veritabanına kaydet"""
-    try:
-        session = Session()
-        
-        for eq in earthquakes:
-            # Aynı event_id ile kayıt var mı kontrol et
-            existing = session.query(Earthquake).filter_by(event_id=eq['id']).first()
-            
-            if not existing:
-                # Yeni kayıt ekle
-                earthquake = Earthquake(
-                    id=str(uuid.uuid4()),
-                    event_id=eq['id'],
-                    source=source,
-                    date=datetime.fromisoformat(eq['date']),
-                    latitude=eq['latitude'],
-                    longitude=eq['longitude'],
-                    depth=eq['depth'],
-                    magnitude=eq['magnitude'],
-                    location=eq['location']
-                )
-                session.add(earthquake)
-        
-        session.commit()
-        session.close()
-        return True
-    except Exception as e:
-        print(f"Veritabanına kaydetme hatası: {str(e)}")
-        if session:
-            session.rollback()
-            session.close()
-        return False
-
-def fetch_and_save_kandilli_data():
-    """Kandilli'den deprem verilerini çek ve PostgreSQL'e kaydet"""
-    try:
-        response = requests.get(KANDILLI_URL)
-        response.encoding = 'utf-8'
-        
-        if response.status_code == 200:
-            soup = BeautifulSoup(response.text, 'html.parser')
-            pre_data = soup.find('pre')
-            
-            if pre_data:
-                lines = pre_data.text.strip().split('\n')[6:]
-                earthquakes = []
-                
-                for line in lines:
-                    try:
-                        parts = line.strip().split()
-                        if len(parts) >= 9:
-                            date_str = f"{parts[0]} {parts[1]}"
-                            date = datetime.strptime(date_str, '%Y.%m.%d %H:%M:%S')
-                            
-                            earthquake = {
-                                'id': f"kandilli_{date.timestamp()}",
-                                'date': date.isoformat(),
-                                'latitude': float(parts[2]),
-                                'longitude': float(parts[3]),
-                                'depth': float(parts[4]),
-                                'magnitude': float(parts[6]),
-                                'location': ' '.join(parts[8:])
-                            }
-                            earthquakes.append(earthquake)
-                    except Exception as e:
-                        print(f"Satır işlenirken hata: {str(e)}")
-                        continue
-                
-                # Veritabanına kaydet
-                if earthquakes:
-                    save_to_database(earthquakes, 'Kandilli')
-                return earthquakes
-    except Exception as e:
-        print(f"Kandilli verisi çekilirken hata: {str(e)}")
-    return []
-
-def fetch_and_save_emsc_data(min_magnitude=0, limit=100):
-    """EMSC'den deprem verilerini çek ve PostgreSQL'e kaydet"""
-    try:
-        params = {
-            'format': 'json',
-            'limit': limit,
-            'minmag': min_magnitude,
-            'orderby': 'time-desc'
-        }
-        
-        response = requests.get(EMSC_API, params=params)
-        
-        if response.status_code == 200:
-            data = response.json()
-            earthquakes = []
-            
-            for feature in data.get('features', []):
-                try:
-                    props = feature['properties']
-                    coords = feature['geometry']['coordinates']
-                    event_id = f"emsc_{feature['id']}"
-                    
-                    earthquake = {
-                        'id': event_id,
-                        'date': datetime.fromtimestamp(props['time'] / 1000.0).isoformat(),
-                        'latitude': coords[1],
-                        'longitude': coords[0],
-                        'depth': coords[2],
-                        'magnitude': props.get('mag', 0),
-                        'location': props.get('place', 'Unknown')
-                    }
-                    earthquakes.append(earthquake)
-                except Exception as e:
-                    print(f"EMSC verisi işlenirken hata: {str(e)}")
-                    continue
-            
-            # Veritabanına kaydet
-            if earthquakes:
-                save_to_database(earthquakes, 'EMSC')
-            return earthquakes
-    except Exception as e:
-        print(f"EMSC verisi çekilirken hata: {str(e)}")
-    return []
-
-def save_fires_to_database(fires, source):
-    """Yangın verilerini veritabanına kaydet"""
-    try:
-        session = Session()
-        
-        for fire in fires:
-            # Aynı fire_id ile kayıt var mı kontrol et
-            existing = session.query(Fire).filter_by(fire_id=fire['id']).first()
-            
-            if not existing:
-                # Yeni kayıt ekle
-                fire_record = Fire(
-                    id=str(uuid.uuid4()),
-                    fire_id=fire['id'],
-                    source=source,
-                    date=datetime.fromisoformat(fire['date']),
-                    latitude=fire['latitude'],
-                    longitude=fire['longitude'],
-                    brightness=fire.get('brightness', 0),
-                    confidence=fire.get('confidence', 0),
-                    frp=fire.get('frp', 0),
-                    scan=fire.get('scan', 0),
-                    track=fire.get('track', 0),
-                    satellite=fire.get('satellite', 'Unknown'),
-                    instrument=fire.get('instrument', 'Unknown'),
-                    version=fire.get('version', '1.0'),
-                    location=fire.get('location', 'Unknown')
-                )
-                session.add(fire_record)
-        
-        session.commit()
-        session.close()
-        return True
-    except Exception as e:
-        print(f"Yangın verilerini veritabanına kaydetme hatası: {str(e)}")
-        if session:
-            session.rollback()
-            session.close()
-        return False
-
-def fetch_and_save_nasa_firms_data(region='Global', days=1):
-    """NASA FIRMS'den yangın verilerini çek ve veritabanına kaydet"""
-    try:
-        # NASA FIRMS API - MODIS ve VIIRS aktif yangın verileri
-        # Ücretsiz demo key ile sınırlı kullanım
-        url = f"{NASA_FIRMS_API}/{NASA_FIRMS_KEY}/MODIS_NRT/{region}/{days}"
-        
-        response = requests.get(url, timeout=30)
-        
-        if response.status_code == 200:
-            lines = response.text.strip().split('\n')
-            if len(lines) < 2:
-                return []
-            
-            # CSV başlıkları
-            headers = lines[0].split(',')
-            fires = []
-            
-            for line in lines[1:]:
-                try:
-                    values = line.split(',')
-                    if len(values) >= 10:
-                        # Tarih formatını düzenle
-                        acq_date = values[5]  # YYYY-MM-DD
-                        acq_time = values[6].zfill(4)  # HHMM
-                        
-                        # Saat ve dakikayı ayır
-                        hour = acq_time[:2]
-                        minute = acq_time[2:]
-                        
-                        date_str = f"{acq_date} {hour}:{minute}:00"
-                        fire_date = datetime.strptime(date_str, '%Y-%m-%d %H:%M:%S')
-                        
-                        fire = {
-                            'id': f"nasa_modis_{values[0]}_{values[1]}_{acq_date}_{acq_time}",
-                            'date': fire_date.isoformat(),
-                            'latitude': float(values[0]),
-                            'longitude': float(values[1]),
-                            'brightness': float(values[2]) if values[2] else 0,
-                            'confidence': int(values[8]) if values[8] else 0,
-                            'frp': float(values[9]) if values[9] else 0,
-                            'scan': float(values[3]) if values[3] else 0,
-                            'track': float(values[4]) if values[4] else 0,
-                            'satellite': values[7] if len(values) > 7 else 'Terra/Aqua',
-                            'instrument': 'MODIS',
-                            'version': 'NRT',
-                            'location': f"Lat: {values[0]}, Lon: {values[1]}"
-                        }
-                        fires.append(fire)
-                except Exception as e:
-                    print(f"NASA FIRMS satır işlenirken hata: {str(e)}")
-                    continue
-            
-            # Veritabanına kaydet
-            if fires:
-                save_fires_to_database(fires, 'NASA_FIRMS_MODIS')
-            return fires
-            
-    except Exception as e:
-        print(f"NASA FIRMS verisi çekilirken hata: {str(e)}")
-    return []
-
-def fetch_and_save_nasa_viirs_data(region='Global', days=1):
-    """NASA FIRMS VIIRS'den yangın verilerini çek ve veritabanına kaydet"""
-    try:
-        # VIIRS yangın verileri - daha yüksek çözünürlük
-        url = f"{NASA_FIRMS_API}/{NASA_FIRMS_KEY}/VIIRS_SNPP_NRT/{region}/{days}"
-        
-        response = requests.get(url, timeout=30)
-        
-        if response.status_code == 200:
-            lines = response.text.strip().split('\n')
-            if len(lines) < 2:
-                return []
-            
-            fires = []
-            
-            for line in lines[1:]:
-                try:
-                    values = line.split(',')
-                    if len(values) >= 10:
-                        # Tarih formatını düzenle
-                        acq_date = values[5]  # YYYY-MM-DD
-                        acq_time = values[6].zfill(4)  # HHMM
-                        
-                        hour = acq_time[:2]
-                        minute = acq_time[2:]
-                        
-                        date_str = f"{acq_date} {hour}:{minute}:00"
-                        fire_date = datetime.strptime(date_str, '%Y-%m-%d %H:%M:%S')
-                        
-                        fire = {
-                            'id': f"nasa_viirs_{values[0]}_{values[1]}_{acq_date}_{acq_time}",
-                            'date': fire_date.isoformat(),
-                            'latitude': float(values[0]),
-                            'longitude': float(values[1]),
-                            'brightness': float(values[2]) if values[2] else 0,
-                            'confidence': int(values[8]) if values[8] else 0,
-                            'frp': float(values[9]) if values[9] else 0,
-                            'scan': float(values[3]) if values[3] else 0,
-                            'track': float(values[4]) if values[4] else 0,
-                            'satellite': 'NPP',
-                            'instrument': 'VIIRS',
-                            'version': 'NRT',
-                            'location': f"Lat: {values[0]}, Lon: {values[1]}"
-                        }
-                        fires.append(fire)
-                except Exception as e:
-                    print(f"NASA VIIRS satır işlenirken hata: {str(e)}")
-                    continue
-            
-            # Veritabanına kaydet
-            if fires:
-                save_fires_to_database(fires, 'NASA_FIRMS_VIIRS')
-            return fires
-            
-    except Exception as e:
-        print(f"NASA VIIRS verisi çekilirken hata: {str(e)}")
-    return []
-
-def save_tsunami_alerts_to_database(alerts, source):
-    """Tsunami uyarılarını veritabanına kaydet"""
-    try:
-        session = Session()
-        
-        for alert in alerts:
-            # Aynı alert_id ile kayıt var mı kontrol et
-            existing = session.query(TsunamiAlert).filter_by(alert_id=alert['id']).first()
-            
-            if not existing:
-                # Yeni kayıt ekle
-                tsunami_alert = TsunamiAlert(
-                    id=str(uuid.uuid4()),
-                    alert_id=alert['id'],
-                    source=source,
-                    date=datetime.fromisoformat(alert['date']),
-                    latitude=alert['latitude'],
-                    longitude=alert['longitude'],
-                    magnitude=alert.get('magnitude', 0),
-                    depth=alert.get('depth', 0),
-                    alert_level=alert.get('alert_level', 'Unknown'),
-                    status=alert.get('status', 'Active'),
-                    affected_regions=alert.get('affected_regions', ''),
-                    message=alert.get('message', ''),
-                    location=alert.get('location', 'Unknown')
-                )
-                session.add(tsunami_alert)
-        
-        session.commit()
-        session.close()
-        return True
-    except Exception as e:
-        print(f"Tsunami uyarılarını veritabanına kaydetme hatası: {str(e)}")
-        if session:
-            session.rollback()
-            session.close()
-        return False
-
-def fetch_and_save_usgs_tsunami_data():
-    """USGS'den tsunami potansiyeli olan depremleri çek"""
-    try:
-        # USGS Significant Earthquakes (son 24 saat)
-        response = requests.get(USGS_EARTHQUAKE_API, timeout=30)
-        
-        if response.status_code == 200:
-            data = response.json()
-            alerts = []
-            
-            for feature in data.get('features', []):
-                try:
-                    props = feature['properties']
-                    coords = feature['geometry']['coordinates']
-                    
-                    # Tsunami potansiyeli kontrolü (magnitude >= 6.0 ve deniz/kıyı yakını)
-                    magnitude = props.get('mag', 0)
-                    tsunami = props.get('tsunami', 0)
-                    
-                    if magnitude >= 6.0 or tsunami == 1:
-                        alert_id = f"usgs_tsunami_{feature['id']}"
-                        
-                        # Alert level belirleme
-                        alert_level = "Watch"
-                        if magnitude >= 7.0:
-                            alert_level = "Warning"
-                        elif magnitude >= 8.0:
-                            alert_level = "Major Warning"
-                        
-                        status = "Active" if tsunami == 1 else "Potential"
-                        
-                        alert = {
-                            'id': alert_id,
-                            'date': datetime.fromtimestamp(props['time'] / 1000.0).isoformat(),
-                            'latitude': coords[1],
-                            'longitude': coords[0],
-                            'magnitude': magnitude,
-                            'depth': coords[2] if len(coords) > 2 else 0,
-                            'alert_level': alert_level,
-                            'status': status,
-                            'affected_regions': props.get('place', 'Unknown'),
-                            'message': f"Magnitude {magnitude} earthquake detected. Tsunami {status.lower()}.",
-                            'location': props.get('place', 'Unknown')
-                        }
-                        alerts.append(alert)
-                        
-                except Exception as e:
-                    print(f"USGS tsunami verisi işlenirken hata: {str(e)}")
-                    continue
-            
-            # Veritabanına kaydet
-            if alerts:
-                save_tsunami_alerts_to_database(alerts, 'USGS')
-            return alerts
-            
-    except Exception as e:
-        print(f"USGS tsunami verisi çekilirken hata: {str(e)}")
-    return []
-
-@app.route('/')
+@api.before_app_request
+def ensure_ingest_leader():
+    """Liderlik seçimini ilk istekte başlat (debug reloader'ın ana sürecinde ve fork öncesi çalışmaz)"""
+    if INGEST_MODE == 'inline' and not ingest_leader.running:
+        ingest_leader.start()
+
+@api.before_app_request
+def start_request_timer():
+    g.request_started = time.perf_counter()
+
+@api.after_app_request
+def record_request_metrics(response):
+    """Route bazında süre ve yanıt boyutunu metriklere işle
+
+    Akış yanıtlarında süre ilk bayta kadardır ve boyut kaydedilmez.
+    """
+    started = g.get('request_started')
+    if started is not None:
+        route = request.url_rule.rule if request.url_rule else 'unmatched'
+        metrics.HTTP_REQUEST_SECONDS.observe(
+            time.perf_counter() - started, route=route, method=request.method, status=response.status_code)
+        if not response.is_streamed and response.content_length is not None:
+            metrics.HTTP_RESPONSE_BYTES.observe(response.content_length, route=route)
+    return response
+
+@api.after_app_request
+def compress_body(response):
+    """JSON yanıtlarını Accept-Encoding'e göre sıkıştır (metriklerden önce çalışır; boyut aktarılan baytlardır)
+
+    Önbellekten dönen yanıtlar zaten sıkıştırılmış kopyayla gelir.
+    """
+    return compress_response(response, request.accept_encodings)
+
+@api.route('/')
 def index():
     """API ana sayfası"""
     return jsonify({
@@ -476,21 +167,21 @@ def index():
             '/api/fires/nasa-modis': 'NASA FIRMS MODIS yangın verileri',
             '/api/fires/nasa-viirs': 'NASA FIRMS VIIRS yangın verileri',
             '/api/fires/all': 'Tüm kaynakların yangın verileri',
+            '/api/fires/grid': 'Izgara hücrelerinde toplanmış yangın yoğunluğu',
+            '/api/tiles/<katman>/<z>/<x>/<y>.json': 'Harita karoları (GeoJSON)',
             '/api/tsunami/alerts': 'Tsunami uyarıları',
             '/api/tsunami/usgs': 'USGS tsunami potansiyeli',
-            '/api/tsunami/all': 'Tüm tsunami uyarıları'
+            '/api/tsunami/all': 'Tüm tsunami uyarıları',
+            '/api/events/stream': 'Yeni kayıtların canlı akışı (Server-Sent Events)',
+            '/api/ingest/status': 'Veri çekme zamanlayıcısı durumu',
+            '/api/cache/stats': 'Sorgu önbelleği istatistikleri',
+            '/metrics': 'Prometheus metrikleri'
         }
     })
 
-@app.route('/api/earthquakes/kandilli')
-def get_kandilli_earthquakes():
-    """Kandilli deprem verilerini getir"""
-    fetch_and_save_kandilli_data()
-    
-    session = Session()
-    earthquakes = session.query(Earthquake).filter_by(source='Kandilli').order_by(Earthquake.date.desc()).all()
-    
-    result = [{
+def earthquake_to_dict(eq):
+    """Deprem kaydını API yanıtı için sözlüğe çevir"""
+    return {
         'id': eq.id,
         'source': eq.source,
         'date': eq.date.isoformat(),
@@ -499,240 +190,460 @@ def get_kandilli_earthquakes():
         'depth': eq.depth,
         'magnitude': eq.magnitude,
         'location': eq.location
-    } for eq in earthquakes]
+    }
+
+def fire_to_dict(fire):
+    """Yangın kaydını API yanıtı için sözlüğe çevir"""
+    return {
+        'id': fire.id,
+        'source': fire.source,
+        'date': fire.date.isoformat(),
+        'latitude': fire.latitude,
+        'longitude': fire.longitude,
+        'brightness': fire.brightness,
+        'confidence': fire.confidence,
+        'frp': fire.frp,
+        'satellite': fire.satellite,
+        'instrument': fire.instrument,
+        'location': fire.location
+    }
+
+def tsunami_alert_to_dict(alert):
+    """Tsunami uyarısını API yanıtı için sözlüğe çevir"""
+    return {
+        'id': alert.id,
+        'source': alert.source,
+        'date': alert.date.isoformat(),
+        'latitude': alert.latitude,
+        'longitude': alert.longitude,
+        'magnitude': alert.magnitude,
+        'depth': alert.depth,
+        'alert_level': alert.alert_level,
+        'status': alert.status,
+        'affected_regions': alert.affected_regions,
+        'message': alert.message,
+        'location': alert.location
+    }
+
+def cached_endpoint(endpoint, sources, rolling=False):
+    """Endpoint yanıtını sorgu parametrelerine göre önbellekle (refresh=true atlar)
+
+    Yanıtlar kaynakların veri sürümünden türetilen ETag ile döner; istemcinin
+    If-None-Match değeri geçerliyse sorgu çalıştırılmadan 304 döner (bkz.
+    conditional.py). Önbellekte gövdenin sıkıştırılmış kopyaları da tutulur.
+    rolling: days parametresi verilmese de varsayılan bir zaman penceresi uygulanıyor.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            if request.args.get('refresh', default='false', type=str).lower() == 'true':
+                return view(*args, **kwargs)
+            
+            # Akış yanıtları bellekte tutulmaz
+            if get_format(request.args) in STREAM_FORMATS:
+                return view(*args, **kwargs)
+            
+            key = result_cache.make_key(endpoint, request.args)
+            ttl = get_ttl(endpoint)
+            # Sürümler sorgudan önce okunur; sorgu sırasında gelen veri sonraki istekte yeni ETag üretir
+            window = time_window(ttl) if rolling or request.args.get('days') else None
+            etag = make_etag(key, data_versions.current(sources), window)
+            if etag_matches(request.headers.get('If-None-Match'), etag):
+                return conditional_headers(current_app.response_class(status=304), etag)
+            
+            # Farklı sürümde üretilmiş kayıtlar (ör. ayrı işçi yazdıysa) kullanılmaz
+            key += (etag,)
+            variants = result_cache.get(key)
+            mimetype = 'application/json'
+            if variants is None:
+                response = view(*args, **kwargs)
+                if response.status_code != 200:
+                    return response
+                mimetype = response.mimetype
+                variants = Variants(response.get_data())
+                result_cache.set(key, variants, ttl, sources, size=variants.size)
+            
+            body, encoding, created = variants.get(negotiate(request.accept_encodings))
+            if created:
+                result_cache.resize(key, variants.size)
+            response = current_app.response_class(body, mimetype=mimetype)
+            if encoding:
+                response.headers['Content-Encoding'] = encoding
+            return conditional_headers(response, etag)
+        return wrapper
+    return decorator
+
+def conditional_headers(response, etag):
+    """ETag ve tarayıcının her kullanımda yeniden doğrulaması için Cache-Control / Vary başlıkları"""
+    response.headers['ETag'] = etag
+    response.headers['Cache-Control'] = 'no-cache'
+    response.vary.add('Accept-Encoding')
+    return response
+
+def refresh_sources(sources):
+    """refresh=true: kaynakları hemen çek; yalnızca veri çekme lideri çeker, diğer süreçlerde 'skipped' döner"""
+    if not ingest_leader.is_leader:
+        return {source: {'status': 'skipped'} for source in sources}
+    return fetch_sources(sources)
+
+def list_response(session, query, model, to_dict, items_key, meta, serialize=None):
+    """Sorguyu istenen formatta yanıtla: sayfalı JSON (varsayılan) veya satır satır akış
+
+    serialize verilirse kayıt listesini sözlük listesine çevirmek için to_dict yerine kullanılır.
+    Sayfalı yanıtta session burada, akışta yanıt tamamlanınca kapatılır.
+    """
+    fmt = get_format(request.args)
+    limit = request.args.get('limit', default=None, type=int)
+    cursor = request.args.get('cursor', default=None, type=str)
+    serialize = serialize or (lambda items: [to_dict(item) for item in items])
+    # İmleç akış yanıtı başlamadan çözülür; geçersizse her iki formatta da 400 döner
+    try:
+        position = decode_cursor(cursor) if cursor else None
+    except InvalidCursor:
+        session.close()
+        raise
+    
+    if fmt in STREAM_FORMATS:
+        return stream_response(session, query, model, serialize, items_key, meta,
+                               fmt, clamp_stream_limit(limit), position)
+    
+    limit = clamp_limit(limit)
+    items, next_cursor = paginate(query, model, limit, position)
+    result = serialize(items)
     
     session.close()
     
     return jsonify({
-        'source': 'Kandilli',
+        **meta,
         'count': len(result),
-        'earthquakes': result
+        'limit': limit,
+        'next_cursor': next_cursor,
+        items_key: result
+    })
+
+def snapshot_response(snapshot, to_dict, items_key, meta, since=None, minimums=None, source=None, args=None):
+    """Sayfalı JSON isteğini bellekteki anlık görüntüden yanıtla (bkz. snapshot.py)
+
+    Akış formatları ve lat/lon/radius_km filtresi veritabanından yanıtlanır;
+    anlık görüntü istenen sayfayı kapsamıyorsa None döner. args verilmezse
+    request.args kullanılır.
+    """
+    args = args if args is not None else request.args
+    if get_format(args) in STREAM_FORMATS:
+        return None
+    if args.get('lat') or args.get('lon') or args.get('radius_km'):
+        return None
+    
+    limit = clamp_limit(args.get('limit', default=None, type=int))
+    cursor = args.get('cursor', default=None, type=str)
+    bbox = args.get('bbox')
+    page = snapshot.select(limit, decode_cursor(cursor) if cursor else None, since,
+                           parse_bbox(bbox) if bbox else None, minimums, source)
+    if page is None:
+        return None
+    
+    items, next_cursor = page
+    return jsonify({
+        **meta,
+        'count': len(items),
+        'limit': limit,
+        'next_cursor': next_cursor,
+        items_key: [to_dict(item) for item in items]
     })
 
-@app.route('/api/earthquakes/emsc')
+def fire_args():
+    """Yangın endpoint'lerinin istek parametreleri; region verilmişse bbox filtresine çevrilir
+
+    region FIRMS alan biçimindedir: 'Global' / 'world' (filtre yok) ya da
+    'batı,güney,doğu,kuzey' (bbox ile aynı sıra).
+    """
+    region = request.args.get('region', default='Global', type=str)
+    if region.lower() in ('global', 'world'):
+        return request.args
+    if request.args.get('bbox'):
+        raise InvalidSpatialFilter("region ve bbox birlikte verilemez")
+    try:
+        parse_bbox(region)
+    except InvalidSpatialFilter:
+        raise InvalidSpatialFilter("region 'Global' ya da 'batı,güney,doğu,kuzey' biçiminde olmalıdır")
+    args = request.args.copy()
+    args['bbox'] = region
+    return args
+
+@api.route('/api/earthquakes/kandilli')
+@cached_endpoint('earthquakes_kandilli', ['Kandilli'])
+def get_kandilli_earthquakes():
+    """Kandilli deprem verilerini getir"""
+    meta = {
+        'source': 'Kandilli',
+        **get_freshness(['Kandilli'])
+    }
+    response = snapshot_response(earthquake_snapshot, earthquake_to_dict, 'earthquakes', meta, source='Kandilli')
+    if response is not None:
+        return response
+    
+    session = Session()
+    earthquakes = session.query(Earthquake).filter_by(source='Kandilli')
+    earthquakes = apply_spatial_filters(earthquakes, Earthquake, request.args, postgis_enabled(engine))
+    
+    return list_response(session, earthquakes, Earthquake, earthquake_to_dict, 'earthquakes', meta)
+
+@api.route('/api/earthquakes/emsc')
+@cached_endpoint('earthquakes_emsc', ['EMSC'])
 def get_emsc_earthquakes():
     """EMSC deprem verilerini getir"""
     min_magnitude = request.args.get('min_magnitude', default=0, type=float)
-    limit = request.args.get('limit', default=100, type=int)
     
-    fetch_and_save_emsc_data(min_magnitude, limit)
+    meta = {
+        'source': 'EMSC',
+        **get_freshness(['EMSC'])
+    }
+    response = snapshot_response(earthquake_snapshot, earthquake_to_dict, 'earthquakes', meta, source='EMSC',
+                                 minimums={'magnitude': min_magnitude} if min_magnitude > 0 else None)
+    if response is not None:
+        return response
     
     session = Session()
-    earthquakes = session.query(Earthquake).filter_by(source='EMSC').order_by(Earthquake.date.desc()).all()
+    earthquakes = session.query(Earthquake).filter_by(source='EMSC')
     
-    result = [{
-        'id': eq.id,
-        'source': eq.source,
-        'date': eq.date.isoformat(),
-        'latitude': eq.latitude,
-        'longitude': eq.longitude,
-        'depth': eq.depth,
-        'magnitude': eq.magnitude,
-        'location': eq.location
-    } for eq in earthquakes]
+    if min_magnitude > 0:
+        earthquakes = earthquakes.filter(Earthquake.magnitude >= min_magnitude)
     
-    session.close()
+    earthquakes = apply_spatial_filters(earthquakes, Earthquake, request.args, postgis_enabled(engine))
     
-    return jsonify({
-        'source': 'EMSC',
-        'count': len(result),
-        'earthquakes': result
-    })
+    return list_response(session, earthquakes, Earthquake, earthquake_to_dict, 'earthquakes', meta)
 
-@app.route('/api/earthquakes/all')
+@api.route('/api/earthquakes/all')
+@cached_endpoint('earthquakes_all', ['Kandilli', 'EMSC'])
 def get_all_earthquakes():
     """Tüm kaynakların deprem verilerini getir"""
     min_magnitude = request.args.get('min_magnitude', default=0, type=float)
+    refresh = request.args.get('refresh', default='false', type=str).lower() == 'true'
+    dedup = request.args.get('dedup', default='false', type=str).lower() == 'true'
     
-    # Verileri güncelle
-    fetch_and_save_kandilli_data()
-    fetch_and_save_emsc_data(min_magnitude)
+    # İstenirse kaynakları eşzamanlı olarak hemen yenile
+    fetch = refresh_sources(['Kandilli', 'EMSC']) if refresh else None
     
-    session = Session()
-    earthquakes = session.query(Earthquake).filter(Earthquake.magnitude >= min_magnitude).order_by(Earthquake.date.desc()).all()
+    meta = {
+        'sources': ['Kandilli', 'EMSC'],
+        **get_freshness(['Kandilli', 'EMSC']),
+        'fetch': fetch,
+        'dedup': dedup
+    }
+    if not dedup:
+        response = snapshot_response(earthquake_snapshot, earthquake_to_dict, 'earthquakes', meta,
+                                     minimums={'magnitude': min_magnitude})
+        if response is not None:
+            return response
     
-    result = [{
-        'id': eq.id,
-        'source': eq.source,
-        'date': eq.date.isoformat(),
-        'latitude': eq.latitude,
-        'longitude': eq.longitude,
-        'depth': eq.depth,
-        'magnitude': eq.magnitude,
-        'location': eq.location
-    } for eq in earthquakes]
+    session = Session()
+    earthquakes = session.query(Earthquake).filter(Earthquake.magnitude >= min_magnitude)
+    earthquakes = apply_spatial_filters(earthquakes, Earthquake, request.args, postgis_enabled(engine))
     
-    session.close()
+    serialize = None
+    if dedup:
+        # Her deprem bir kez: kanonik kayıt ve diğer kaynakların çözümleri
+        earthquakes = earthquakes.filter(canonical_filter())
+        serialize = lambda items: attach_solutions(session, items, earthquake_to_dict)
     
-    return jsonify({
-        'sources': ['Kandilli', 'EMSC'],
-        'count': len(result),
-        'earthquakes': result
-    })
+    return list_response(session, earthquakes, Earthquake, earthquake_to_dict, 'earthquakes', meta, serialize)
 
-@app.route('/api/fires/nasa-modis')
+@api.route('/api/fires/nasa-modis')
+@cached_endpoint('fires_modis', ['NASA_FIRMS_MODIS'], rolling=True)
 def get_nasa_modis_fires():
     """NASA FIRMS MODIS yangın verilerini getir"""
-    region = request.args.get('region', default='Global', type=str)
+    args = fire_args()
     days = request.args.get('days', default=1, type=int)
     min_confidence = request.args.get('min_confidence', default=0, type=int)
+    since = datetime.utcnow() - timedelta(days=days) if days > 0 else None
     
-    fetch_and_save_nasa_firms_data(region, days)
+    meta = {
+        'source': 'NASA_FIRMS_MODIS',
+        **get_freshness(['NASA_FIRMS_MODIS'])
+    }
+    response = snapshot_response(fire_snapshot, fire_to_dict, 'fires', meta, since=since, source='NASA_FIRMS_MODIS',
+                                 minimums={'confidence': min_confidence} if min_confidence > 0 else None, args=args)
+    if response is not None:
+        return response
     
     session = Session()
     fires = session.query(Fire).filter_by(source='NASA_FIRMS_MODIS')
     
+    if since is not None:
+        fires = fires.filter(Fire.date >= since)
+    
     if min_confidence > 0:
         fires = fires.filter(Fire.confidence >= min_confidence)
     
-    fires = fires.order_by(Fire.date.desc()).all()
+    fires = apply_spatial_filters(fires, Fire, args, postgis_enabled(engine))
     
-    result = [{
-        'id': fire.id,
-        'source': fire.source,
-        'date': fire.date.isoformat(),
-        'latitude': fire.latitude,
-        'longitude': fire.longitude,
-        'brightness': fire.brightness,
-        'confidence': fire.confidence,
-        'frp': fire.frp,
-        'satellite': fire.satellite,
-        'instrument': fire.instrument,
-        'location': fire.location
-    } for fire in fires]
-    
-    session.close()
-    
-    return jsonify({
-        'source': 'NASA_FIRMS_MODIS',
-        'count': len(result),
-        'fires': result
-    })
+    return list_response(session, fires, Fire, fire_to_dict, 'fires', meta)
 
-@app.route('/api/fires/nasa-viirs')
+@api.route('/api/fires/nasa-viirs')
+@cached_endpoint('fires_viirs', ['NASA_FIRMS_VIIRS'], rolling=True)
 def get_nasa_viirs_fires():
     """NASA FIRMS VIIRS yangın verilerini getir"""
-    region = request.args.get('region', default='Global', type=str)
+    args = fire_args()
     days = request.args.get('days', default=1, type=int)
     min_confidence = request.args.get('min_confidence', default=0, type=int)
+    since = datetime.utcnow() - timedelta(days=days) if days > 0 else None
     
-    fetch_and_save_nasa_viirs_data(region, days)
+    meta = {
+        'source': 'NASA_FIRMS_VIIRS',
+        **get_freshness(['NASA_FIRMS_VIIRS'])
+    }
+    response = snapshot_response(fire_snapshot, fire_to_dict, 'fires', meta, since=since, source='NASA_FIRMS_VIIRS',
+                                 minimums={'confidence': min_confidence} if min_confidence > 0 else None, args=args)
+    if response is not None:
+        return response
     
     session = Session()
     fires = session.query(Fire).filter_by(source='NASA_FIRMS_VIIRS')
     
+    if since is not None:
+        fires = fires.filter(Fire.date >= since)
+    
     if min_confidence > 0:
         fires = fires.filter(Fire.confidence >= min_confidence)
     
-    fires = fires.order_by(Fire.date.desc()).all()
+    fires = apply_spatial_filters(fires, Fire, args, postgis_enabled(engine))
     
-    result = [{
-        'id': fire.id,
-        'source': fire.source,
-        'date': fire.date.isoformat(),
-        'latitude': fire.latitude,
-        'longitude': fire.longitude,
-        'brightness': fire.brightness,
-        'confidence': fire.confidence,
-        'frp': fire.frp,
-        'satellite': fire.satellite,
-        'instrument': fire.instrument,
-        'location': fire.location
-    } for fire in fires]
-    
-    session.close()
-    
-    return jsonify({
-        'source': 'NASA_FIRMS_VIIRS',
-        'count': len(result),
-        'fires': result
-    })
+    return list_response(session, fires, Fire, fire_to_dict, 'fires', meta)
 
-@app.route('/api/fires/all')
+@api.route('/api/fires/all')
+@cached_endpoint('fires_all', ['NASA_FIRMS_MODIS', 'NASA_FIRMS_VIIRS'], rolling=True)
 def get_all_fires():
     """Tüm kaynakların yangın verilerini getir"""
-    region = request.args.get('region', default='Global', type=str)
+    args = fire_args()
     days = request.args.get('days', default=1, type=int)
     min_confidence = request.args.get('min_confidence', default=0, type=int)
     min_frp = request.args.get('min_frp', default=0, type=float)
+    refresh = request.args.get('refresh', default='false', type=str).lower() == 'true'
     
-    # Verileri güncelle
-    fetch_and_save_nasa_firms_data(region, days)
-    fetch_and_save_nasa_viirs_data(region, days)
+    # İstenirse kaynakları eşzamanlı olarak hemen yenile
+    fetch = refresh_sources(['NASA_FIRMS_MODIS', 'NASA_FIRMS_VIIRS']) if refresh else None
+    since = datetime.utcnow() - timedelta(days=days) if days > 0 else None
+    
+    meta = {
+        'sources': ['NASA_FIRMS_MODIS', 'NASA_FIRMS_VIIRS'],
+        **get_freshness(['NASA_FIRMS_MODIS', 'NASA_FIRMS_VIIRS']),
+        'fetch': fetch
+    }
+    minimums = {}
+    if min_confidence > 0:
+        minimums['confidence'] = min_confidence
+    if min_frp > 0:
+        minimums['frp'] = min_frp
+    response = snapshot_response(fire_snapshot, fire_to_dict, 'fires', meta, since=since, minimums=minimums, args=args)
+    if response is not None:
+        return response
     
     session = Session()
     fires = session.query(Fire)
     
+    if since is not None:
+        fires = fires.filter(Fire.date >= since)
+    
     if min_confidence > 0:
         fires = fires.filter(Fire.confidence >= min_confidence)
     
     if min_frp > 0:
         fires = fires.filter(Fire.frp >= min_frp)
     
-    fires = fires.order_by(Fire.date.desc()).all()
+    fires = apply_spatial_filters(fires, Fire, args, postgis_enabled(engine))
     
-    result = [{
-        'id': fire.id,
-        'source': fire.source,
-        'date': fire.date.isoformat(),
-        'latitude': fire.latitude,
-        'longitude': fire.longitude,
-        'brightness': fire.brightness,
-        'confidence': fire.confidence,
-        'frp': fire.frp,
-        'satellite': fire.satellite,
-        'instrument': fire.instrument,
-        'location': fire.location
-    } for fire in fires]
+    return list_response(session, fires, Fire, fire_to_dict, 'fires', meta)
+
+@api.route('/api/fires/grid')
+@cached_endpoint('fires_grid', ['NASA_FIRMS_MODIS', 'NASA_FIRMS_VIIRS'], rolling=True)
+def get_fire_grid():
+    """Yangınları ızgara hücrelerinde toplanmış olarak getir (düşük zoom yoğunluk katmanı)"""
+    zoom = request.args.get('zoom', default=2, type=int)
+    cell_deg = request.args.get('cell_deg', default=None, type=float)
+    days = request.args.get('days', default=1, type=int)
+    min_confidence = request.args.get('min_confidence', default=0, type=int)
+    min_frp = request.args.get('min_frp', default=0, type=float)
+    source = request.args.get('source', default='', type=str).lower()
+    bbox = fire_args().get('bbox', default=None, type=str)
     
-    session.close()
+    if cell_deg is None:
+        if not (0 <= zoom <= 22):
+            raise InvalidSpatialFilter("zoom 0 ile 22 arasında olmalıdır")
+        cell_deg = zoom_cell_deg(zoom)
+    bbox = parse_bbox(bbox) if bbox else None
+    
+    sources = {'modis': 'NASA_FIRMS_MODIS', 'viirs': 'NASA_FIRMS_VIIRS'}
+    filters = []
+    if source:
+        if source not in sources:
+            raise InvalidSpatialFilter("source 'modis' veya 'viirs' olmalıdır")
+        filters.append(Fire.source == sources[source])
+    
+    if days > 0:
+        filters.append(Fire.date >= datetime.utcnow() - timedelta(days=days))
+    
+    if min_confidence > 0:
+        filters.append(Fire.confidence >= min_confidence)
+    
+    if min_frp > 0:
+        filters.append(Fire.frp >= min_frp)
+    
+    session = Session()
+    try:
+        cell_deg, cells = fire_grid(session, cell_deg, bbox, filters, postgis_enabled(engine))
+    finally:
+        session.close()
     
     return jsonify({
-        'sources': ['NASA_FIRMS_MODIS', 'NASA_FIRMS_VIIRS'],
-        'count': len(result),
-        'fires': result
+        'sources': [sources[source]] if source else list(sources.values()),
+        'cell_deg': cell_deg,
+        'bbox': bbox,
+        'count': len(cells),
+        **get_freshness(['NASA_FIRMS_MODIS', 'NASA_FIRMS_VIIRS']),
+        'columns': GRID_COLUMNS,
+        'cells': cells
     })
 
-@app.route('/api/tsunami/usgs')
+@api.route('/api/tiles/<layer>/<int:z>/<int:x>/<int:y>.json')
+def get_tile(layer, z, x, y):
+    """Katmanın z/x/y karosunu getir (disk önbelleğinden veya üretilerek)"""
+    days = request.args.get('days', default=TILE_LAYERS[layer][1] if layer in TILE_LAYERS else 1, type=int)
+    validate_tile(layer, z, x, y, days)
+    
+    # Nesil karo üretilmeden önce okunur; üretim sırasında gelen veri karoyu geçersiz kılar
+    generation = tile_cache.generation(layer)
+    refresh = request.args.get('refresh', default='false', type=str).lower() == 'true'
+    body = None if refresh else tile_cache.get(layer, generation, z, x, y, days)
+    if body is None:
+        session = Session()
+        try:
+            body = encode_tile(build_tile(session, layer, z, x, y, days, postgis_enabled(engine)))
+        finally:
+            session.close()
+        tile_cache.set(layer, generation, z, x, y, days, body)
+    
+    return current_app.response_class(body, mimetype='application/geo+json')
+
+@api.route('/api/tsunami/usgs')
+@cached_endpoint('tsunami_usgs', ['USGS'])
 def get_usgs_tsunami_alerts():
     """USGS tsunami uyarılarını getir"""
-    fetch_and_save_usgs_tsunami_data()
-    
     session = Session()
-    alerts = session.query(TsunamiAlert).filter_by(source='USGS').order_by(TsunamiAlert.date.desc()).all()
-    
-    result = [{
-        'id': alert.id,
-        'source': alert.source,
-        'date': alert.date.isoformat(),
-        'latitude': alert.latitude,
-        'longitude': alert.longitude,
-        'magnitude': alert.magnitude,
-        'depth': alert.depth,
-        'alert_level': alert.alert_level,
-        'status': alert.status,
-        'affected_regions': alert.affected_regions,
-        'message': alert.message,
-        'location': alert.location
-    } for alert in alerts]
+    alerts = session.query(TsunamiAlert).filter_by(source='USGS')
+    alerts = apply_spatial_filters(alerts, TsunamiAlert, request.args, postgis_enabled(engine))
     
-    session.close()
-    
-    return jsonify({
+    return list_response(session, alerts, TsunamiAlert, tsunami_alert_to_dict, 'tsunami_alerts', {
         'source': 'USGS',
-        'count': len(result),
-        'tsunami_alerts': result
+        **get_freshness(['USGS'])
     })
 
-@app.route('/api/tsunami/all')
+@api.route('/api/tsunami/all')
+@cached_endpoint('tsunami_all', ['USGS'])
 def get_all_tsunami_alerts():
     """Tüm tsunami uyarılarını getir"""
     min_magnitude = request.args.get('min_magnitude', default=6.0, type=float)
     alert_level = request.args.get('alert_level', default='', type=str)
     
-    # Verileri güncelle
-    fetch_and_save_usgs_tsunami_data()
-    
     session = Session()
     alerts = session.query(TsunamiAlert)
     
@@ -742,32 +653,58 @@ def get_all_tsunami_alerts():
     if alert_level:
         alerts = alerts.filter(TsunamiAlert.alert_level.ilike(f'%{alert_level}%'))
     
-    alerts = alerts.order_by(TsunamiAlert.date.desc()).all()
-    
-    result = [{
-        'id': alert.id,
-        'source': alert.source,
-        'date': alert.date.isoformat(),
-        'latitude': alert.latitude,
-        'longitude': alert.longitude,
-        'magnitude': alert.magnitude,
-        'depth': alert.depth,
-        'alert_level': alert.alert_level,
-        'status': alert.status,
-        'affected_regions': alert.affected_regions,
-        'message': alert.message,
-        'location': alert.location
-    } for alert in alerts]
-    
-    session.close()
+    alerts = apply_spatial_filters(alerts, TsunamiAlert, request.args, postgis_enabled(engine))
     
-    return jsonify({
+    return list_response(session, alerts, TsunamiAlert, tsunami_alert_to_dict, 'tsunami_alerts', {
         'sources': ['USGS'],
-        'count': len(result),
-        'tsunami_alerts': result
+        **get_freshness(['USGS'])
     })
 
-@app.errorhandler(404)
+@api.route('/api/events/stream')
+def stream_events():
+    """Yeni kaydedilen deprem, yangın ve tsunami kayıtlarını Server-Sent Events olarak gönder
+
+    Filtreler: types (earthquakes,fires,tsunami), source, min_magnitude, bbox.
+    Yeniden bağlanırken Last-Event-ID başlığı (veya last_event_id) kullanılır.
+    """
+    event_filter = EventFilter.from_args(request.args)
+    last_id = parse_last_event_id(request.headers.get('Last-Event-ID') or request.args.get('last_event_id'))
+    try:
+        return event_stream(event_bus, event_filter, last_id)
+    except TooManySubscribers as e:
+        return jsonify({
+            "error": "Servis meşgul",
+            "message": str(e)
+        }), 503
+
+@api.route('/api/ingest/status')
+def get_ingest_scheduler_status():
+    """Veri çekme zamanlayıcısının ve kaynakların durumunu getir"""
+    return jsonify({
+        'mode': INGEST_MODE,
+        'scheduler_running': ingest_scheduler.running,
+        'leader': ingest_leader.status(),
+        'jobs': ingest_scheduler.status(),
+        'sources': get_ingest_status(),
+        'breakers': upstream.breaker_status(),
+        'events': event_bus.stats()
+    })
+
+@api.route('/api/cache/stats')
+def get_cache_stats():
+    """Sorgu önbelleğinin isabet/ıskalama sayaçlarını getir"""
+    return jsonify({
+        **result_cache.stats(),
+        'tiles': tile_cache.stats(),
+        'snapshot': {'earthquakes': earthquake_snapshot.stats(), 'fires': fire_snapshot.stats()}
+    })
+
+@api.route('/metrics')
+def get_metrics():
+    """Veri çekme aşamalarının ve route'ların metriklerini Prometheus metin biçiminde getir"""
+    return current_app.response_class(metrics.registry.render(), content_type=metrics.CONTENT_TYPE)
+
+@api.app_errorhandler(404)
 def not_found_error(error):
     """404 hatası için özel yanıt"""
     return jsonify({
@@ -782,12 +719,30 @@ def not_found_error(error):
             "/api/fires/nasa-modis": "NASA FIRMS MODIS yangın verileri",
             "/api/fires/nasa-viirs": "NASA FIRMS VIIRS yangın verileri",
             "/api/fires/all": "Tüm kaynakların yangın verileri",
+            "/api/fires/grid": "Izgara hücrelerinde toplanmış yangın yoğunluğu",
+            "/api/tiles/<katman>/<z>/<x>/<y>.json": "Harita karoları (GeoJSON)",
             "/api/tsunami/usgs": "USGS tsunami uyarıları",
-            "/api/tsunami/all": "Tüm tsunami uyarıları"
+            "/api/tsunami/all": "Tüm tsunami uyarıları",
+            "/api/events/stream": "Yeni kayıtların canlı akışı (Server-Sent Events)",
+            "/api/ingest/status": "Veri çekme zamanlayıcısı durumu",
+            "/api/cache/stats": "Sorgu önbelleği istatistikleri",
+            "/metrics": "Prometheus metrikleri"
         }
     }), 404
 
-@app.errorhandler(500)
+@api.app_errorhandler(InvalidCursor)
+@api.app_errorhandler(InvalidSpatialFilter)
+@api.app_errorhandler(InvalidFormat)
+@api.app_errorhandler(InvalidTile)
+@api.app_errorhandler(InvalidEventFilter)
+def bad_request_error(error):
+    """Geçersiz sayfalama imleci, mekânsal filtre, format, karo veya olay filtresi için 400 yanıtı"""
+    return jsonify({
+        "error": "Geçersiz istek",
+        "message": str(error)
+    }), 400
+
+@api.app_errorhandler(500)
 def internal_error(error):
     """500 hatası için özel yanıt"""
     return jsonify({
@@ -796,6 +751,10 @@ def internal_error(error):
     }), 500
 
 if __name__ == '__main__':
+    # Geliştirme sunucusu (tek süreç): şemayı hemen hazırla; üretimde wsgi.py kullanılır
+    init_db()
+    app = create_app()
+    
     # static klasörünü oluştur
     if not os.path.exists('static'):
         os.makedirs('static')
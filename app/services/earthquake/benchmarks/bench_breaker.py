@@ -0,0 +1,90 @@
+# bench_breaker.py
+"""Erişilemeyen kaynakta devre kesici ve yeniden deneme bütçesinin etkisi
+
+Kullanım: python benchmarks/bench_breaker.py [çağrı sayısı] [okuma zaman aşımı sn]
+Yerel bir sunucu iki bozuk kaynağı taklit eder: /hang zaman aşımından uzun
+bekler, /fail 503 döner. Her senaryoda upstream.get art arda çağrılır (her
+çağrı bir zamanlayıcı turuna karşılık gelir); devre kesici kapalıyken
+(eşik sonsuz) ve varsayılan eşikle çağrı başına p50 / en uzun süre, toplam
+süre ve kaynağa giden istek sayısı raporlanır.
+"""
+import os
+import statistics
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+hits = {'/hang': 0, '/fail': 0}
+hits_lock = threading.Lock()
+
+class Handler(BaseHTTPRequestHandler):
+    hang = 2.0
+
+    def do_GET(self):
+        with hits_lock:
+            hits[self.path] = hits.get(self.path, 0) + 1
+        if self.path == '/hang':
+            time.sleep(self.hang)
+        try:
+            self.send_response(503)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+        except OSError:
+            pass
+
+    def log_message(self, format, *args):
+        pass
+
+def run(upstream, url, source, calls, breaker):
+    upstream._breakers.pop(source, None)
+    if breaker is not None:
+        upstream._breakers[source] = breaker
+    path = '/' + url.rsplit('/', 1)[-1]
+    with hits_lock:
+        before = hits.get(path, 0)
+    timings = []
+    rejected = 0
+    started = time.perf_counter()
+    for _ in range(calls):
+        call_started = time.perf_counter()
+        try:
+            upstream.get(url, source=source).close()
+        except upstream.CircuitOpenError:
+            rejected += 1
+        except Exception:
+            pass
+        timings.append((time.perf_counter() - call_started) * 1000)
+    total = time.perf_counter() - started
+    with hits_lock:
+        requests = hits.get(path, 0) - before
+    return statistics.median(timings), max(timings), total, requests, rejected
+
+def main():
+    calls = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    read_timeout = float(sys.argv[2]) if len(sys.argv) > 2 else 1.0
+
+    os.environ['UPSTREAM_READ_TIMEOUT'] = str(read_timeout)
+    os.environ.setdefault('UPSTREAM_BACKOFF', '0.1')
+    import upstream
+
+    Handler.hang = read_timeout * 2
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+
+    print(f"{calls} çağrı; okuma zaman aşımı {read_timeout} sn, en fazla {upstream.UPSTREAM_RETRIES} yeniden deneme, "
+          f"devre eşiği {upstream.UPSTREAM_BREAKER_FAILURES}")
+    print(f"{'senaryo':<30}{'p50 ms':>10}{'en uzun ms':>12}{'toplam sn':>11}{'istek':>8}{'reddedilen':>12}")
+    for path in ('hang', 'fail'):
+        for label, breaker in (('devre kesici yok', upstream.CircuitBreaker(path, failures=10 ** 9)),
+                               ('devre kesici', None)):
+            p50, longest, total, requests, rejected = run(upstream, f"{base}/{path}", path, calls, breaker)
+            print(f"{f'/{path} {label}':<30}{p50:>10.1f}{longest:>12.1f}{total:>11.2f}{requests:>8}{rejected:>12}")
+    server.shutdown()
+
+if __name__ == '__main__':
+    main()
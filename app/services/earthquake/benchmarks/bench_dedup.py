@@ -0,0 +1,115 @@
+# bench_dedup.py
+"""Kaynaklar arası eşleştirme: (zaman kovası, hücre) indeksi ile tüm adayları tarama karşılaştırması
+
+Kullanım: python benchmarks/bench_dedup.py [kayıtlı olay sayısı] [yeni olay sayısı]
+Kayıtlı olaylar bir günlük pencereye ve Türkiye çevresine dağıtılır; yeni
+olayların yarısı kayıtlı bir olayın birkaç saniye / km yakınına konur.
+
+Ayrıca geçici bir SQLite veritabanında save_to_database ile bir olaya aynı
+kaynaktan ayrı partilerde gelen iki çözümün ikisinin birden bağlanmadığı
+(ve yeniden gönderilen kaydın bağlantıyı değiştirmediği) doğrulanır.
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+# Parti denetimi geçici bir SQLite veritabanı kullanır (modeller içe aktarılmadan önce)
+os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench_dedup.db')}"
+os.environ['INGEST_MODE'] = 'off'
+
+import dedup
+
+def make_events(stored_count, new_count):
+    start = datetime(2026, 10, 1)
+    stored = []
+    for i in range(stored_count):
+        utc = start + timedelta(seconds=random.uniform(0, 86400))
+        stored.append(dedup._event(
+            f"emsc_{i}", None, 'EMSC', utc, random.uniform(35, 42), random.uniform(25, 45), round(random.uniform(1, 5), 1)
+        ))
+    new = []
+    for i in range(new_count):
+        if i % 2 == 0:
+            base = random.choice(stored)
+            utc = base['utc'] + timedelta(seconds=random.uniform(-5, 5))
+            latitude, longitude = base['latitude'] + random.uniform(-0.1, 0.1), base['longitude'] + random.uniform(-0.1, 0.1)
+            magnitude = base['magnitude']
+        else:
+            utc = start + timedelta(seconds=random.uniform(0, 86400))
+            latitude, longitude, magnitude = random.uniform(35, 42), random.uniform(25, 45), 2.0
+        # Kandilli yerel saatle kaydeder
+        new.append(dedup._event(f"kandilli_{i}", None, 'Kandilli', utc + timedelta(hours=3), latitude, longitude, magnitude))
+    return stored, new
+
+def scan_match(stored, event, sources):
+    """İndekssiz: tüm kayıtlı olayları dolaş"""
+    class Everything:
+        def candidates(self, *args):
+            return stored
+    return dedup.find_match(Everything(), event, sources)
+
+def check_batches():
+    """Aynı kaynaktan iki ayrı partide gelen yakın olaylar aynı kanonik olaya bağlanmamalı"""
+    from models import Earthquake, Session, init_db
+    from ingest import save_to_database
+    init_db()
+
+    def quake(id, seconds, latitude):
+        return {'id': id, 'date': (datetime(2026, 10, 1, 12) + timedelta(seconds=seconds)).isoformat(),
+                'latitude': latitude, 'longitude': 30.0, 'depth': 7.0, 'magnitude': 4.0, 'location': 'TEST'}
+
+    # Kandilli yerel saatle (UTC+3) kaydeder
+    save_to_database([quake('kandilli_1', 3 * 3600, 38.0)], 'Kandilli')
+    save_to_database([quake('emsc_1', 2, 38.05)], 'EMSC')
+    save_to_database([quake('emsc_2', 4, 38.02)], 'EMSC')
+    # Yeniden gönderilen kayıt atlanır, bağlantı sayılmaz
+    save_to_database([quake('emsc_1', 2, 38.05)], 'EMSC')
+
+    session = Session()
+    try:
+        rows = {eq.event_id: eq for eq in session.query(Earthquake)}
+    finally:
+        session.close()
+    kandilli = rows['kandilli_1'].id
+    linked = sorted(event_id for event_id, eq in rows.items() if eq.source == 'EMSC' and eq.canonical_id == kandilli)
+    ok = linked == ['emsc_1'] and rows['emsc_2'].canonical_id == rows['emsc_2'].id
+    print(f"iki partide aynı kaynak: kandilli_1'e bağlı EMSC çözümleri {linked} -> {'doğru' if ok else 'HATALI'}")
+    return ok
+
+def main():
+    stored_count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    new_count = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+    stored, new = make_events(stored_count, new_count)
+
+    sources = defaultdict(set)
+    started = time.perf_counter()
+    index = dedup.EventIndex()
+    for event in stored:
+        index.add(event)
+        sources[event['id']].add(event['source'])
+    build_ms = (time.perf_counter() - started) * 1000
+
+    started = time.perf_counter()
+    indexed = [dedup.find_match(index, event, sources) for event in new]
+    indexed_ms = (time.perf_counter() - started) * 1000
+
+    started = time.perf_counter()
+    scanned = [scan_match(stored, event, sources) for event in new]
+    scan_ms = (time.perf_counter() - started) * 1000
+
+    same = all((a or {}).get('id') == (b or {}).get('id') for a, b in zip(indexed, scanned))
+    matched = sum(1 for match in indexed if match)
+    print(f"{stored_count} kayıtlı, {new_count} yeni olay; {matched} eşleşme, sonuçlar {'aynı' if same else 'FARKLI'}")
+    print(f"  indeks  kurulum {build_ms:8.1f} ms  eşleştirme {indexed_ms:8.1f} ms  ({indexed_ms / new_count * 1000:.0f} µs/olay)")
+    print(f"  tarama                    eşleştirme {scan_ms:8.1f} ms  ({scan_ms / new_count * 1000:.0f} µs/olay)")
+    if not check_batches():
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
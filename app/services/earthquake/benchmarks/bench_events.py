@@ -0,0 +1,96 @@
+# bench_events.py
+"""Olay akışı (GET /api/events/stream) ile liste yoklamasının karşılaştırması
+
+Kullanım: python benchmarks/bench_events.py [tur] [turdaki yeni deprem] [yoklama aralığı sn]
+Veritabanına 2000 deprem eklenir ve API yerel bir sunucuda çalıştırılır. Her
+turda save_to_database ile yeni depremler yazılır; bağlı SSE istemcisinin
+bunları yayımdan (commit sonrası) ne kadar sonra aldığı ve aldığı bayt ölçülür. Karşılaştırma
+için /api/earthquakes/all yanıtının boyutu, veri çekme aralığı (300 sn)
+boyunca verilen aralıkla yoklayan bir panonun indireceği toplamla raporlanır.
+"""
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+INGEST_INTERVAL = 300
+
+def quakes(count, prefix):
+    now = datetime.utcnow()
+    return [{
+        'id': f"{prefix}-{i}",
+        'date': (now - timedelta(seconds=random.uniform(0, 600))).isoformat(),
+        'latitude': random.uniform(35, 42), 'longitude': random.uniform(25, 45),
+        'depth': random.uniform(1, 30), 'magnitude': round(random.uniform(1, 5), 1),
+        'location': f"BENCH {prefix} {i}"
+    } for i in range(count)]
+
+def main():
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    per_round = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    poll_interval = float(sys.argv[3]) if len(sys.argv) > 3 else 5
+
+    workdir = tempfile.mkdtemp()
+    os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(workdir, 'bench_events.db')}"
+    os.environ['TILE_CACHE_DIR'] = os.path.join(workdir, 'tiles')
+    os.environ['INGEST_MODE'] = 'off'
+
+    import requests
+    from werkzeug.serving import make_server
+    import app as api
+    from models import init_db
+    init_db()
+    import ingest
+
+    ingest.save_to_database(quakes(2000, 'seed'), 'EMSC')
+    server = make_server('127.0.0.1', 0, api.create_app(), threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_port}"
+
+    received = []  # (yayım -> alınma gecikmesi ms, kayıt sayısı)
+    sse_bytes = [0]
+    ready = threading.Event()
+
+    def listen():
+        response = requests.get(f"{base}/api/events/stream?types=earthquakes", stream=True)
+        ready.set()
+        event_id = None
+        for chunk in response.iter_lines():
+            sse_bytes[0] += len(chunk) + 1
+            if chunk.startswith(b'id: '):
+                # Olay kimliği mikro saniye cinsinden yayım zamanıdır
+                event_id = int(chunk[4:])
+            elif chunk.startswith(b'data: '):
+                received.append((time.time() * 1000 - event_id / 1000, json.loads(chunk[6:])['count']))
+
+    threading.Thread(target=listen, daemon=True).start()
+    ready.wait(5)
+    time.sleep(0.2)
+
+    for i in range(rounds):
+        count = len(received)
+        ingest.save_to_database(quakes(per_round, f"r{i}"), 'EMSC')
+        deadline = time.perf_counter() + 5
+        while len(received) == count and time.perf_counter() < deadline:
+            time.sleep(0.0005)
+    latencies = [latency for latency, _ in received]
+
+    poll_size = len(requests.get(f"{base}/api/earthquakes/all").content)
+    polls = INGEST_INTERVAL / poll_interval
+    events = sum(count for _, count in received)
+    print(f"{rounds} tur x {per_round} yeni deprem; SSE: {events} kayıt, {sse_bytes[0] / 1024:.1f} KB, "
+          f"yayım sonrası gecikme p50 {statistics.median(latencies):.1f} ms, en fazla {max(latencies):.1f} ms")
+    print(f"Yoklama: /api/earthquakes/all {poll_size / 1024:.1f} KB; {poll_interval:g} sn aralıkla "
+          f"{INGEST_INTERVAL} sn'lik bir veri çekme aralığında {polls * poll_size / 1024:.0f} KB, "
+          f"ortalama gecikme {poll_interval / 2:g} sn")
+    server.shutdown()
+
+if __name__ == '__main__':
+    main()
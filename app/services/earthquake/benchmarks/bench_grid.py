@@ -0,0 +1,52 @@
+# bench_grid.py
+"""/api/fires/grid ile /api/fires/all yanıt boyutu ve süresi karşılaştırması
+
+Kullanım: python benchmarks/bench_grid.py [satır sayısı]
+"""
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from bench_streaming import seed
+
+URLS = [
+    '/api/fires/all?format=stream',
+    '/api/fires/grid?zoom=2',
+    '/api/fires/grid?zoom=5&bbox=-30,-40,60,40',
+    '/api/fires/grid?zoom=7&bbox=26,36,45,42',
+    '/api/fires/grid?cell_deg=0.1&bbox=26,36,45,42',
+]
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+
+    path = os.path.join(tempfile.mkdtemp(), 'bench_grid.db')
+    os.environ['DATABASE_URL'] = f"sqlite:///{path}"
+    os.environ['INGEST_MODE'] = 'off'
+
+    import app as api
+    from models import init_db
+    init_db()
+    seed(path, 0, rows)
+    client = api.create_app().test_client()
+
+    print(f"{rows} yangın")
+    print(f"{'istek':<48}{'hücre':>8}{'KB':>10}{'ms':>9}")
+    for url in URLS:
+        api.result_cache.clear()
+        started = time.perf_counter()
+        response = client.get(url)
+        data = response.get_data()
+        elapsed = (time.perf_counter() - started) * 1000
+        body = json.loads(data)
+        cells = body.get('count')
+        if 'cells' in body:
+            assert sum(cell[2] for cell in body['cells']) <= rows
+        print(f"{url:<48}{cells:>8}{len(data) / 1024:>10.1f}{elapsed:>9.1f}")
+
+if __name__ == '__main__':
+    main()
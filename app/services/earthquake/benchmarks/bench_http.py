@@ -0,0 +1,78 @@
+# bench_http.py
+"""Liste endpoint'leri: koşullu GET (ETag / 304) ve önbellekteki sıkıştırılmış kopyalar
+
+Kullanım: python benchmarks/bench_http.py [satır sayısı] [istek sayısı]
+Son 24 saate dağılmış yangınlar eklenir (bkz. bench_tiles.seed). Her URL için
+aktarılan bayt ve p50 gecikme raporlanır: önbellek boşken, önbellekten
+sıkıştırmasız, önbellekten gzip (kopya yeniden kullanılır), her istekte
+yeniden gzip'leme (önbellekten sıkıştırmasız süre + gzip.compress süresi) ve
+If-None-Match ile 304.
+"""
+import gzip
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_tiles import seed
+
+URLS = [
+    '/api/fires/all',
+    '/api/fires/all?limit=5000',
+    '/api/fires/all?days=1&min_confidence=80&limit=5000',
+    '/api/fires/grid?zoom=3'
+]
+
+def timed(client, url, requests, headers=None, before=None):
+    timings = []
+    response = None
+    for _ in range(requests):
+        if before:
+            before()
+        started = time.perf_counter()
+        response = client.get(url, headers=headers or {})
+        response.get_data()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings), response
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    requests = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+
+    workdir = tempfile.mkdtemp()
+    os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(workdir, 'bench_http.db')}"
+    os.environ['TILE_CACHE_DIR'] = os.path.join(workdir, 'tiles')
+    os.environ['INGEST_MODE'] = 'off'
+
+    import app as api
+    from models import init_db
+    init_db()
+    import compression
+    seed(os.path.join(workdir, 'bench_http.db'), rows)
+    client = api.create_app().test_client()
+    gzip_header = {'Accept-Encoding': 'gzip'}
+    encodings = ['gzip'] + (['br'] if compression.brotli is not None else [])
+
+    print(f"{rows} yangın; sıkıştırma: {', '.join(encodings)}")
+    print(f"{'url':<52}{'ham KB':>9}{'gzip KB':>9}{'boş ms':>9}{'ham ms':>9}"
+          f"{'gzip ms':>9}{'her sefer':>11}{'304 ms':>9}")
+    for url in URLS:
+        miss_ms, plain = timed(client, url, requests, before=api.result_cache.clear)
+        hit_ms, _ = timed(client, url, requests)
+        gzip_ms, gzipped = timed(client, url, requests, headers=gzip_header)
+        assert gzip.decompress(gzipped.get_data()) == plain.get_data()
+        started = time.perf_counter()
+        for _ in range(requests):
+            compression.compress(plain.get_data(), 'gzip')
+        compress_ms = (time.perf_counter() - started) * 1000 / requests
+        not_modified_ms, not_modified = timed(client, url, requests, headers={'If-None-Match': plain.headers['ETag']})
+        assert not_modified.status_code == 304
+        print(f"{url:<52}{len(plain.get_data()) / 1024:>9.1f}{len(gzipped.get_data()) / 1024:>9.1f}"
+              f"{miss_ms:>9.1f}{hit_ms:>9.2f}{gzip_ms:>9.2f}{hit_ms + compress_ms:>11.2f}{not_modified_ms:>9.2f}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,115 @@
+# bench_indexes.py
+"""Bileşik indeks göçünün (migrations.py #2) öncesi / sonrası sorgu süreleri
+
+Kullanım: python benchmarks/bench_indexes.py [yangın sayısı] [deprem sayısı]
+Geçici bir SQLite veritabanı oluşturur, göç 1'e kadar uygular, API'nin ilk
+sayfa sorgularını ölçer, ardından göç 2'yi uygulayıp aynı sorguları tekrarlar.
+"""
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+REPEAT = 10
+PAGE_SIZE = 500
+
+def seed(path, fires, earthquakes):
+    """Kaynaklara ve zamana dağılmış kayıtlar ekle"""
+    from geo import cell_id
+    conn = sqlite3.connect(path)
+    start = datetime(2026, 1, 1)
+
+    rows = []
+    for i in range(fires):
+        lat, lon = random.uniform(-60, 70), random.uniform(-180, 180)
+        rows.append((
+            f"f{i}", f"f{i}", random.choice(['NASA_FIRMS_MODIS', 'NASA_FIRMS_VIIRS']),
+            (start + timedelta(seconds=random.randint(0, 60 * 86400))).isoformat(' '),
+            lat, lon, random.randint(0, 100), random.uniform(0, 200), cell_id(lat, lon)
+        ))
+    conn.executemany(
+        'INSERT INTO "Fire" (id, fire_id, source, date, latitude, longitude, confidence, frp, cell) '
+        'VALUES (?,?,?,?,?,?,?,?,?)', rows
+    )
+
+    rows = []
+    for i in range(earthquakes):
+        lat, lon = random.uniform(35, 43), random.uniform(25, 45)
+        rows.append((
+            f"e{i}", f"e{i}", random.choice(['Kandilli', 'EMSC']),
+            (start + timedelta(seconds=random.randint(0, 60 * 86400))).isoformat(' '),
+            lat, lon, random.uniform(0, 30), round(random.expovariate(1.2), 1), cell_id(lat, lon)
+        ))
+    conn.executemany(
+        'INSERT INTO "Earthquake" (id, event_id, source, date, latitude, longitude, depth, magnitude, cell) '
+        'VALUES (?,?,?,?,?,?,?,?,?)', rows
+    )
+    conn.commit()
+    conn.execute('ANALYZE')
+    conn.close()
+
+def queries(models):
+    """API endpoint'lerinin ilk sayfa sorguları"""
+    from pagination import paginate
+    Earthquake, Fire = models.Earthquake, models.Fire
+    return {
+        '/earthquakes/kandilli': lambda s: paginate(s.query(Earthquake).filter_by(source='Kandilli'), Earthquake, PAGE_SIZE),
+        '/earthquakes/all?min_magnitude=3': lambda s: paginate(s.query(Earthquake).filter(Earthquake.magnitude >= 3), Earthquake, PAGE_SIZE),
+        '/fires/nasa-modis': lambda s: paginate(s.query(Fire).filter_by(source='NASA_FIRMS_MODIS'), Fire, PAGE_SIZE),
+        '/fires/all': lambda s: paginate(s.query(Fire), Fire, PAGE_SIZE),
+        '/fires/all?min_confidence=95&min_frp=150': lambda s: paginate(
+            s.query(Fire).filter(Fire.confidence >= 95, Fire.frp >= 150), Fire, PAGE_SIZE),
+    }
+
+def measure(models):
+    session = models.Session()
+    results = {}
+    for name, run in queries(models).items():
+        started = time.perf_counter()
+        for _ in range(REPEAT):
+            run(session)
+        results[name] = (time.perf_counter() - started) / REPEAT * 1000
+    session.close()
+    return results
+
+def main():
+    fires = int(sys.argv[1]) if len(sys.argv) > 1 else 500000
+    earthquakes = int(sys.argv[2]) if len(sys.argv) > 2 else 100000
+
+    path = os.path.join(tempfile.mkdtemp(), 'bench_indexes.db')
+    os.environ['DATABASE_URL'] = f"sqlite:///{path}"
+
+    import models
+    from migrations import run_migrations
+
+    # Yeni tablolar create_all ile indeksli oluşacağından, göç öncesi durumu
+    # taklit etmek için göç 2'nin indeksleri oluşturulmadan tablolar kurulur
+    for model in (models.Earthquake, models.Fire, models.TsunamiAlert):
+        model.__table__.create(models.engine, checkfirst=True)
+        conn = sqlite3.connect(path)
+        for index in model.__table__.indexes:
+            if not index.name.endswith('_cell'):
+                conn.execute(f'DROP INDEX IF EXISTS "{index.name}"')
+        conn.close()
+    run_migrations(target=1)
+    seed(path, fires, earthquakes)
+
+    before = measure(models)
+    started = time.perf_counter()
+    run_migrations(target=2)
+    migrate_seconds = time.perf_counter() - started
+    sqlite3.connect(path).execute('ANALYZE').connection.commit()
+    after = measure(models)
+
+    print(f"{fires} yangın, {earthquakes} deprem; göç 2 süresi {migrate_seconds:.1f} sn")
+    print(f"{'sorgu':<45}{'önce (ms)':>12}{'sonra (ms)':>12}")
+    for name in before:
+        print(f"{name:<45}{before[name]:>12.2f}{after[name]:>12.2f}")
+
+if __name__ == '__main__':
+    main()
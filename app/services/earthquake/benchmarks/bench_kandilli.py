@@ -0,0 +1,105 @@
+# bench_kandilli.py
+"""Kandilli lst0.asp ayrıştırma: eski BeautifulSoup yolu ile kandilli.py karşılaştırması
+
+Kullanım: python benchmarks/bench_kandilli.py [kayıtlı sayfa.html ...]
+Sayfa verilmezse lst0.asp biçiminde 500 satırlık örnek bir sayfa üretilir.
+Kaydetmek için: curl -o lst0.html http://www.koeri.boun.edu.tr/scripts/lst0.asp
+"""
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import kandilli
+
+REPEAT = 50
+
+HEADER = [
+    '',
+    'RECENT EARTHQUAKES IN TURKEY',
+    'KOERI REGIONAL EARTHQUAKE-TSUNAMI MONITORING CENTER',
+    '(QUICK EPICENTER DETERMINATIONS)',
+    '',
+    'Tarih      Saat      Enlem(N)  Boylam(E) Derinlik(km)  MD   ML   Mw    Yer                                             Çözüm Niteliği',
+    '---------- --------  --------  -------   ----------    ------------    --------------                                  --------------',
+]
+
+def sample_page(rows=500):
+    """lst0.asp biçiminde örnek sayfa (MD/Mw çoğunlukla '-.-', arada revize kayıtlar)"""
+    now = datetime(2026, 10, 1, 12, 0, 0)
+    lines = list(HEADER)
+    for i in range(rows):
+        date = now - timedelta(minutes=11 * i, seconds=i % 60)
+        ml = f"{random.uniform(0.8, 4.5):.1f}" if i % 25 else '-.-'
+        md = f"{random.uniform(0.8, 4.5):.1f}" if i % 4 == 0 else '-.-'
+        mw = f"{random.uniform(3.5, 5.5):.1f}" if i % 40 == 0 else '-.-'
+        location = f"YER-{i} ({random.choice(['IZMIR', 'MUGLA', 'MALATYA', 'KAHRAMANMARAS'])})"
+        quality = f"REVIZE01 ({date + timedelta(minutes=3):%Y.%m.%d %H:%M:%S})" if i % 10 == 0 else 'İlksel'
+        lines.append(
+            f"{date:%Y.%m.%d %H:%M:%S}  {random.uniform(35, 42):7.4f}   {random.uniform(26, 45):7.4f}"
+            f"{random.uniform(1, 30):>11.1f}      {md}  {ml}  {mw}   {location:<50}{quality}"
+        )
+    return '<HTML><HEAD><TITLE>Son Depremler</TITLE></HEAD><BODY><pre>' + '\n'.join(lines) + '\n</pre></BODY></HTML>'
+
+def parse_bs4(page):
+    """Önceki ayrıştırma yolu (BeautifulSoup + boşlukla bölme)"""
+    from bs4 import BeautifulSoup
+    soup = BeautifulSoup(page, 'html.parser')
+    pre_data = soup.find('pre')
+    earthquakes = []
+    errors = 0
+    for line in pre_data.text.strip().split('\n')[6:]:
+        try:
+            parts = line.strip().split()
+            if len(parts) >= 9:
+                date = datetime.strptime(f"{parts[0]} {parts[1]}", '%Y.%m.%d %H:%M:%S')
+                earthquakes.append({
+                    'id': f"kandilli_{date.timestamp()}",
+                    'date': date.isoformat(),
+                    'latitude': float(parts[2]),
+                    'longitude': float(parts[3]),
+                    'depth': float(parts[4]),
+                    'magnitude': float(parts[6]),
+                    'location': ' '.join(parts[8:])
+                })
+        except Exception:
+            errors += 1
+    return earthquakes, errors
+
+def timed(parse, page):
+    started = time.perf_counter()
+    for _ in range(REPEAT):
+        result = parse(page)
+    return (time.perf_counter() - started) / REPEAT * 1000, result
+
+def main():
+    pages = [(path, open(path, encoding='utf-8', errors='replace').read()) for path in sys.argv[1:]]
+    if not pages:
+        pages = [('örnek (500 satır)', sample_page())]
+
+    for name, page in pages:
+        print(f"\n{name}: {len(page) / 1024:.0f} KB")
+        new_ms, records = timed(kandilli.parse_page, page)
+        print(f"  kandilli.py   {new_ms:8.2f} ms  {len(records)} kayıt, "
+              f"{sum(1 for r in records if r['quality'] != 'İlksel')} revize")
+        try:
+            old_ms, (old_records, errors) = timed(parse_bs4, page)
+        except ImportError:
+            print("  beautifulsoup4 yüklü değil, eski yol ölçülmedi")
+            continue
+        polluted = sum(1 for r in old_records if 'REVIZE' in r['location'] or 'İlksel' in r['location'])
+        print(f"  bs4 + split   {old_ms:8.2f} ms  {len(old_records)} kayıt, {errors} satır atıldı, "
+              f"{polluted} kayıtta yer alanına çözüm niteliği karışmış")
+        print(f"  hızlanma      {old_ms / new_ms:8.1f}x")
+
+        # Artımlı çekme: su seviyesinden sonra yalnızca birkaç yeni satır var
+        if len(records) > 5:
+            since = datetime.fromisoformat(records[4]['date'])
+            delta_ms, delta = timed(lambda text: kandilli.parse_page(text, since), page)
+            print(f"  kandilli.py + su seviyesi {delta_ms:8.2f} ms  {len(delta)} kayıt")
+
+if __name__ == '__main__':
+    main()
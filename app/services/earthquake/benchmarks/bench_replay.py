@@ -0,0 +1,150 @@
+# bench_replay.py
+"""Yerel kaynak sunucusuyla (replay.py) veri çekme ve API ölçümü
+
+Kullanım: python benchmarks/bench_replay.py [--firms-rows 50000] [--requests 50] ...
+Canlı kaynaklara gidilmez: KANDILLI_URL, EMSC_API, NASA_FIRMS_API ve
+USGS_EARTHQUAKE_API yerel sunucuya yönlendirilir. Varsayılan olarak geçici bir
+SQLite veritabanı kullanılır (BENCH_DATABASE_URL ile değiştirilebilir; tablolar
+her turda boşaltılır).
+
+1. Her fetch_and_save_* yolu boş veritabanında --repeat kez çalıştırılır,
+   eklenen kayıt / sn ortancası raporlanır.
+2. Son turun verisiyle dolu veritabanında her route için --requests istek
+   yapılır; sorgu önbelleği her istekten önce temizlenir (soğuk) ve ayrıca
+   önbellekten (sıcak) ölçülür. p50 / p99 gecikmeler raporlanır.
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import replay
+
+ROUTES = [
+    '/api/earthquakes/all',
+    '/api/earthquakes/all?dedup=true',
+    '/api/earthquakes/kandilli',
+    '/api/earthquakes/emsc',
+    '/api/fires/all',
+    '/api/fires/all?bbox=26,36,45,42',
+    '/api/fires/all?min_confidence=80&days=1',
+    '/api/fires/grid?zoom=3',
+    '/api/tiles/fires/6/37/24.json',
+    '/api/tsunami/all',
+    '/api/ingest/status',
+    '/metrics'
+]
+
+def percentile(values, p):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(p / 100 * (len(ordered) - 1))))]
+
+def reset():
+    """Tabloları, su seviyelerini ve kaynak doğrulayıcılarını temizle"""
+    import upstream
+    from models import Earthquake, Fire, IngestStatus, Session, TsunamiAlert
+    session = Session()
+    for model in (Earthquake, Fire, TsunamiAlert, IngestStatus):
+        session.query(model).delete()
+    session.commit()
+    session.close()
+    upstream.forget_all()
+
+def count_rows(model):
+    from models import Session
+    session = Session()
+    try:
+        return session.query(model).count()
+    finally:
+        session.close()
+
+def bench_ingest(repeat):
+    import ingest
+    from models import Earthquake, Fire, TsunamiAlert
+
+    paths = [
+        ('Kandilli', ingest.fetch_and_save_kandilli_data, {}, Earthquake),
+        ('EMSC', ingest.fetch_and_save_emsc_data, {'limit': ingest.EMSC_LIMIT}, Earthquake),
+        ('NASA_FIRMS_MODIS', ingest.fetch_and_save_nasa_firms_data, {}, Fire),
+        ('NASA_FIRMS_VIIRS', ingest.fetch_and_save_nasa_viirs_data, {}, Fire),
+        ('USGS', ingest.fetch_and_save_usgs_tsunami_data, {}, TsunamiAlert)
+    ]
+
+    print(f"{'kaynak':<18}{'kayıt':>8}{'ms':>10}{'kayıt/sn':>12}")
+    for name, func, kwargs, model in paths:
+        timings = []
+        rows = 0
+        for _ in range(repeat):
+            reset()
+            started = time.perf_counter()
+            func(**kwargs)
+            timings.append(time.perf_counter() - started)
+            rows = count_rows(model)
+        elapsed = statistics.median(timings)
+        print(f"{name:<18}{rows:>8}{elapsed * 1000:>10.1f}{rows / elapsed if elapsed else 0:>12.0f}")
+
+    # Route ölçümü için tüm kaynakların verisi birlikte yüklenir
+    reset()
+    for _, func, kwargs, _ in paths:
+        func(**kwargs)
+
+def bench_routes(requests):
+    import app as api
+
+    client = api.create_app().test_client()
+    print(f"\n{'route':<42}{'soğuk p50':>11}{'p99':>9}{'sıcak p50':>11}{'p99':>9}{'KB':>9}")
+    for url in ROUTES:
+        cold, warm = [], []
+        size = 0
+        for _ in range(requests):
+            api.result_cache.clear()
+            api.tile_cache.invalidate_layer('fires')
+            started = time.perf_counter()
+            size = len(client.get(url).get_data())
+            cold.append((time.perf_counter() - started) * 1000)
+        for _ in range(requests):
+            started = time.perf_counter()
+            client.get(url).get_data()
+            warm.append((time.perf_counter() - started) * 1000)
+        print(f"{url:<42}{percentile(cold, 50):>11.1f}{percentile(cold, 99):>9.1f}"
+              f"{percentile(warm, 50):>11.1f}{percentile(warm, 99):>9.1f}{size / 1024:>9.1f}")
+
+def main():
+    parser = argparse.ArgumentParser(description='Yerel kaynak sunucusuyla veri çekme ve API ölçümü')
+    parser.add_argument('--kandilli-rows', type=int, default=500)
+    parser.add_argument('--emsc-rows', type=int, default=500)
+    parser.add_argument('--firms-rows', type=int, default=50000)
+    parser.add_argument('--usgs-rows', type=int, default=100)
+    parser.add_argument('--record-dir', help='kayıtlı yanıtların bulunduğu klasör (bkz. replay.py)')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--requests', type=int, default=50)
+    args = parser.parse_args()
+
+    server, env = replay.start(sizes={
+        'kandilli': args.kandilli_rows, 'emsc': args.emsc_rows, 'firms': args.firms_rows, 'usgs': args.usgs_rows
+    }, record_dir=args.record_dir)
+    workdir = tempfile.mkdtemp()
+    os.environ.update(env)
+    os.environ['EMSC_LIMIT'] = str(args.emsc_rows)
+    os.environ['DATABASE_URL'] = os.getenv('BENCH_DATABASE_URL') or f"sqlite:///{os.path.join(workdir, 'bench_replay.db')}"
+    os.environ['TILE_CACHE_DIR'] = os.path.join(workdir, 'tiles')
+    os.environ['INGEST_MODE'] = 'off'
+
+    # Yanıt gövdeleri ölçümden önce üretilir
+    for name in replay.RECORDED_FILES:
+        server.data.body(name)
+    server.data.body('emsc', args.emsc_rows)
+    from models import init_db
+    init_db()
+
+    bench_ingest(args.repeat)
+    bench_routes(args.requests)
+    server.shutdown()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,104 @@
+# bench_retention.py
+"""Saklama politikası: biriken yangın kayıtlarıyla ve arşivlemeden sonra /api/fires/* ölçümü
+
+Kullanım: python benchmarks/bench_retention.py [satır sayısı] [gün] [istek sayısı]
+Son [gün] güne eşit dağılmış yangınlar eklenir (varsayılan 600000 satır, 120 gün).
+Sorgular veritabanından ölçülür (SNAPSHOT_ENABLED=false, sorgu önbelleği her
+istekten önce temizlenir); ardından FIRE_RETENTION_DAYS (verilmezse 30)
+uygulanır ve aynı sorgular tekrarlanır. PostgreSQL için BENCH_DATABASE_URL verin.
+"""
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+URLS = [
+    '/api/fires/all',
+    '/api/fires/all?min_confidence=95',
+    '/api/fires/all?days=1&min_frp=190',
+    '/api/fires/all?days=7&bbox=26,36,45,42',
+    '/api/fires/grid?zoom=3&days=7'
+]
+
+def seed(rows, days):
+    """Son [gün] güne dağılmış rastgele yangın kayıtları ekle"""
+    from geo import cell_id
+    from models import Fire, engine
+    now = datetime.utcnow()
+    batch = []
+    with engine.begin() as conn:
+        for i in range(rows):
+            lat, lon = random.uniform(-60, 70), random.uniform(-180, 180)
+            batch.append({
+                'id': f"r{i}", 'fire_id': f"r{i}", 'source': random.choice(['NASA_FIRMS_MODIS', 'NASA_FIRMS_VIIRS']),
+                'date': now - timedelta(seconds=random.uniform(0, days * 86400)), 'latitude': lat, 'longitude': lon,
+                'brightness': random.uniform(300, 400), 'confidence': random.randint(0, 100),
+                'frp': random.uniform(0, 200), 'location': f"{lat:.4f}, {lon:.4f}", 'cell': cell_id(lat, lon),
+                'created_at': now, 'updated_at': now
+            })
+            if len(batch) == 10000:
+                conn.execute(Fire.__table__.insert(), batch)
+                batch = []
+        if batch:
+            conn.execute(Fire.__table__.insert(), batch)
+
+def measure(client, api, requests):
+    results = {}
+    for url in URLS:
+        timings = []
+        for _ in range(requests):
+            api.result_cache.clear()
+            started = time.perf_counter()
+            client.get(url).get_data()
+            timings.append((time.perf_counter() - started) * 1000)
+        results[url] = statistics.median(timings)
+    return results
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 600000
+    days = int(sys.argv[2]) if len(sys.argv) > 2 else 120
+    requests = int(sys.argv[3]) if len(sys.argv) > 3 else 10
+
+    workdir = tempfile.mkdtemp()
+    os.environ['DATABASE_URL'] = os.getenv('BENCH_DATABASE_URL') or f"sqlite:///{os.path.join(workdir, 'bench_retention.db')}"
+    os.environ['ARCHIVE_DIR'] = os.path.join(workdir, 'archive')
+    os.environ['TILE_CACHE_DIR'] = os.path.join(workdir, 'tiles')
+    os.environ['INGEST_MODE'] = 'off'
+    os.environ['SNAPSHOT_ENABLED'] = 'false'
+    os.environ.setdefault('FIRE_RETENTION_DAYS', '30')
+
+    import app as api
+    from models import init_db
+    init_db()
+    import partitions
+    from models import Fire, Session
+    session = Session()
+    session.query(Fire).delete()
+    session.commit()
+    seed(rows, days)
+    client = api.create_app().test_client()
+
+    before = measure(client, api, requests)
+    started = time.perf_counter()
+    archived = partitions.apply_retention()
+    elapsed = time.perf_counter() - started
+    remaining = session.query(Fire).count()
+    session.close()
+    after = measure(client, api, requests)
+
+    size = sum(os.path.getsize(os.path.join(root, name))
+               for root, _, names in os.walk(os.environ['ARCHIVE_DIR']) for name in names)
+    print(f"{rows} yangın / {days} gün; saklama {partitions.FIRE_RETENTION_DAYS} gün: {archived} kayıt "
+          f"{elapsed:.1f} sn'de arşivlendi ({archived / elapsed if elapsed else 0:.0f} kayıt/sn, "
+          f"{size / 1024 / 1024:.1f} MB gzip), {remaining} kayıt kaldı")
+    print(f"{'url':<44}{'önce ms':>10}{'sonra ms':>10}")
+    for url in URLS:
+        print(f"{url:<44}{before[url]:>10.1f}{after[url]:>10.1f}")
+
+if __name__ == '__main__':
+    main()
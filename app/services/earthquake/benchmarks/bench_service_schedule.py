@@ -0,0 +1,114 @@
+# bench_service_schedule.py
+"""earthquake_service.py: sabit 300 sn aralık ile uyarlanan kaynak aralıklarının karşılaştırması
+
+Kullanım: python benchmarks/bench_service_schedule.py [gün] [tur]
+1) Benzetim (sanal zaman): sakin bir dönemin ortasında büyük bir deprem ve
+   Omori yasasıyla (n(t) = K / (t + c)) azalan artçı dizisi üretilir. Her
+   çekmede son çekmeden bu yana oluşan olaylar "yeni" sayılır; olay yoksa
+   kaynak değişmemiş (304) kabul edilir. Sabit aralık ve PollJob.adapt için
+   istek sayısı ile olayların fark edilme gecikmesi (ortalama / p95) raporlanır.
+2) Zamanlama (gerçek zaman): 0.3 sn süren bir çekme 1 sn aralıkla çalıştırılır;
+   çekme sonrası sabit bekleyen eski döngü ile ServiceScheduler'ın başlangıç
+   zamanlarının plandan kayması karşılaştırılır.
+"""
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from earthquake_service import PollJob, ServiceScheduler
+
+def events(days, background_per_hour=0.5, k=120.0, c=0.05, seed=1):
+    """Sakin arka plan + gün ortasında ana şok ve artçılar (saniye cinsinden olay zamanları)"""
+    rng = random.Random(seed)
+    horizon = days * 86400
+    times = []
+    t = 0.0
+    while True:
+        t += rng.expovariate(background_per_hour / 3600)
+        if t >= horizon:
+            break
+        times.append(t)
+    mainshock = horizon / 2
+    times.append(mainshock)
+    # Omori: saat başına K / (t + c); inceltme yöntemiyle üretilir
+    peak = k / c
+    t = 0.0
+    while mainshock + t * 3600 < horizon:
+        t += rng.expovariate(peak)
+        if rng.random() < (k / (t + c)) / peak:
+            times.append(mainshock + t * 3600)
+    return sorted(time for time in times if time < horizon), mainshock
+
+def simulate(times, horizon, job=None, interval=300.0):
+    """Çekme zamanlarını üret; dönüş: (çekme zamanları, [(olay zamanı, fark edilme gecikmesi)])"""
+    delays = []
+    polls = []
+    now = 0.0
+    index = 0
+    while now < horizon:
+        polls.append(now)
+        new = 0
+        while index < len(times) and times[index] <= now:
+            delays.append((times[index], now - times[index]))
+            index += 1
+            new += 1
+        if job is not None:
+            interval = job.adapt('new' if new else 'unchanged')
+        now += interval
+    return polls, delays
+
+def compare(days):
+    times, mainshock = events(days)
+    horizon = days * 86400
+    periods = (('sakin', 0, mainshock), ('ilk 6 sa', mainshock, mainshock + 6 * 3600),
+               ('sonrası', mainshock + 6 * 3600, horizon))
+    print(f"{days} gün, {len(times)} olay (ana şok {mainshock / 3600:.0f}. saatte)")
+    print(f"{'aralık':<16}{'dönem':<12}{'olay':>7}{'istek':>8}{'ort. gecikme sn':>17}{'p95 sn':>9}")
+    for label, job in (('sabit 300 sn', None), ('uyarlanan', PollJob('USGS', None, None, None))):
+        polls, delays = simulate(times, horizon, job)
+        for period, start, end in periods:
+            period_delays = sorted(delay for time, delay in delays if start <= time < end)
+            requests = sum(1 for poll in polls if start <= poll < end)
+            p95 = period_delays[int(len(period_delays) * 0.95)] if period_delays else 0
+            mean = statistics.mean(period_delays) if period_delays else 0
+            print(f"{label:<16}{period:<12}{len(period_delays):>7}{requests:>8}{mean:>17.0f}{p95:>9.0f}")
+
+def drift(runs):
+    work, interval = 0.3, 1.0
+
+    # Eski döngü: çekme + sabit bekleme
+    starts = []
+    origin = time.monotonic()
+    for _ in range(runs):
+        starts.append(time.monotonic() - origin)
+        time.sleep(work)
+        time.sleep(interval)
+    old = starts[-1] - (runs - 1) * interval
+
+    starts = []
+    def fetch():
+        starts.append(time.monotonic())
+        time.sleep(work)
+        return []
+    job = PollJob('bench', fetch, None, None, interval, minimum=interval, maximum=interval)
+    scheduler = ServiceScheduler([job], jitter=0)
+    scheduler.start()
+    while len(starts) < runs:
+        time.sleep(0.05)
+    scheduler.stop(timeout=2)
+    new = (starts[runs - 1] - starts[0]) - (runs - 1) * interval
+    print(f"{runs} tur, {work} sn çekme, {interval} sn aralık: son turun plandan kayması "
+          f"sabit bekleme {old:.2f} sn, ServiceScheduler {new:.3f} sn")
+
+def main():
+    days = float(sys.argv[1]) if len(sys.argv) > 1 else 2
+    runs = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    compare(days)
+    drift(runs)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+# bench_snapshot.py
+"""Liste endpoint'leri: bellekteki kolon dizileri (snapshot.py) ile ORM sorgusu karşılaştırması
+
+Kullanım: python benchmarks/bench_snapshot.py [satır sayısı] [istek sayısı]
+Son 24 saate dağılmış yangınlar eklenir (bkz. bench_tiles.seed). Her URL sorgu
+önbelleği temizlenerek önce anlık görüntüden, sonra SNAPSHOT_ENABLED kapalıyken
+veritabanından istenir; p50 gecikmeler ve yanıtların aynı olup olmadığı raporlanır.
+"""
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_tiles import seed
+
+URLS = [
+    '/api/fires/all',
+    '/api/fires/all?days=1',
+    '/api/fires/all?days=1&min_confidence=80',
+    '/api/fires/all?days=1&min_confidence=50&min_frp=150',
+    '/api/fires/all?days=1&bbox=26,36,45,42',
+    '/api/fires/all?days=1&bbox=26,36,45,42&min_frp=190',
+    '/api/fires/nasa-viirs?days=1&min_confidence=90'
+]
+
+def measure(client, api, url, requests):
+    timings = []
+    body = None
+    for _ in range(requests):
+        api.result_cache.clear()
+        started = time.perf_counter()
+        body = client.get(url).get_data()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings), body
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    requests = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+
+    workdir = tempfile.mkdtemp()
+    os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(workdir, 'bench_snapshot.db')}"
+    os.environ['INGEST_MODE'] = 'off'
+
+    import app as api
+    from models import init_db
+    init_db()
+    import snapshot
+    seed(os.path.join(workdir, 'bench_snapshot.db'), rows)
+    client = api.create_app().test_client()
+
+    started = time.perf_counter()
+    snapshot.fire_snapshot.refresh(force=True)
+    load_ms = (time.perf_counter() - started) * 1000
+    started = time.perf_counter()
+    snapshot.fire_snapshot.refresh(force=True)
+    refresh_ms = (time.perf_counter() - started) * 1000
+    stats = snapshot.fire_snapshot.stats()
+    print(f"{rows} yangın; ilk yükleme {load_ms:.0f} ms, artımlı yenileme {refresh_ms:.0f} ms, "
+          f"{stats['bytes'] / 1024 / 1024:.1f} MB dizi, {stats['strings']} metin")
+
+    print(f"{'url':<56}{'bellek ms':>11}{'ORM ms':>10}{'kat':>7}  aynı")
+    for url in URLS:
+        snapshot_ms, snapshot_body = measure(client, api, url, requests)
+        snapshot.SNAPSHOT_ENABLED = False
+        orm_ms, orm_body = measure(client, api, url, requests)
+        snapshot.SNAPSHOT_ENABLED = True
+        print(f"{url:<56}{snapshot_ms:>11.1f}{orm_ms:>10.1f}{orm_ms / snapshot_ms:>7.1f}  "
+              f"{'evet' if snapshot_body == orm_body else 'HAYIR'}")
+
+if __name__ == '__main__':
+    main()
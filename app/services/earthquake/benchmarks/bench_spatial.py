@@ -0,0 +1,96 @@
+# bench_spatial.py
+"""bbox / yarıçap filtrelerinin indeksli ve indekssiz sürelerini karşılaştır
+
+Kullanım: python benchmarks/bench_spatial.py [satır sayısı ...]
+Her boyut için geçici bir SQLite veritabanı oluşturulur.
+"""
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from sqlalchemy import text
+from sqlalchemy.orm import Query
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+# Türkiye
+BBOX = (26.0, 36.0, 45.0, 42.0)
+RADIUS = (39.93, 32.85, 100)  # Ankara, 100 km
+REPEAT = 20
+
+def seed(path, rows):
+    """Dünya geneline rastgele dağılmış yangın kayıtları ekle"""
+    from geo import cell_id
+    conn = sqlite3.connect(path)
+    batch = []
+    for i in range(rows):
+        lat, lon = random.uniform(-60, 70), random.uniform(-180, 180)
+        batch.append((f"b{i}", f"b{i}", 'BENCH', '2026-01-01 00:00:00', lat, lon, random.randint(0, 100), cell_id(lat, lon)))
+        if len(batch) == 50000:
+            conn.executemany(
+                'INSERT INTO "Fire" (id, fire_id, source, date, latitude, longitude, confidence, cell) VALUES (?,?,?,?,?,?,?,?)',
+                batch
+            )
+            batch = []
+    if batch:
+        conn.executemany(
+            'INSERT INTO "Fire" (id, fire_id, source, date, latitude, longitude, confidence, cell) VALUES (?,?,?,?,?,?,?,?)',
+            batch
+        )
+    conn.commit()
+    conn.execute('ANALYZE')
+    conn.close()
+
+def timed(session, query):
+    started = time.perf_counter()
+    for _ in range(REPEAT):
+        count = query.with_session(session).count()
+    return (time.perf_counter() - started) / REPEAT * 1000, count
+
+def run(rows):
+    path = os.path.join(tempfile.mkdtemp(), 'bench_spatial.db')
+    os.environ['DATABASE_URL'] = f"sqlite:///{path}"
+
+    import importlib
+    import geo
+    import models
+    models = importlib.reload(models)
+    models.init_db()
+    seed(path, rows)
+
+    session = models.Session()
+    Fire = models.Fire
+
+    indexed_bbox = Query(Fire).filter(geo.bbox_filter(Fire, BBOX))
+    indexed_radius = Query(Fire).filter(geo.radius_filter(Fire, *RADIUS))
+
+    # Hücre filtresi olmadan (yalnızca lat/lon aralığı) = tam tarama
+    max_rows = geo.MAX_CELL_ROWS
+    geo.MAX_CELL_ROWS = 0
+    scan_bbox = Query(Fire).filter(geo.bbox_filter(Fire, BBOX))
+    scan_radius = Query(Fire).filter(geo.radius_filter(Fire, *RADIUS))
+    geo.MAX_CELL_ROWS = max_rows
+
+    results = {}
+    for name, query in (('bbox/indexed', indexed_bbox), ('bbox/scan', scan_bbox),
+                        ('radius/indexed', indexed_radius), ('radius/scan', scan_radius)):
+        results[name] = timed(session, query)
+
+    statement = indexed_bbox.statement.compile(compile_kwargs={'literal_binds': True})
+    plan = session.execute(text(f"EXPLAIN QUERY PLAN {statement}")).fetchall()
+    session.close()
+    return results, [row[-1] for row in plan]
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [100000, 1000000]
+    for rows in sizes:
+        results, plan = run(rows)
+        print(f"\n{rows} satır")
+        for name, (ms, count) in results.items():
+            print(f"  {name:<16} {ms:8.2f} ms  ({count} kayıt)")
+        print(f"  plan: {'; '.join(dict.fromkeys(plan))}")
+
+if __name__ == '__main__':
+    main()
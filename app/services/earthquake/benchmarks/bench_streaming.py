@@ -0,0 +1,80 @@
+# bench_streaming.py
+"""/api/fires/all için sayfalı JSON ve akış (stream / ndjson) yanıtlarını karşılaştır
+
+Kullanım: python benchmarks/bench_streaming.py [satır sayısı ...]
+İlk bayta kadar geçen süre (TTFB), toplam süre ve Python tarafı bellek tepe
+değeri ölçülür. JSON modunun tek sayfada tüm satırları döndürebilmesi için
+API_MAX_PAGE_SIZE en büyük boyuta yükseltilir.
+"""
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+def seed(path, start, rows):
+    """Rastgele yangın kayıtları ekle"""
+    from geo import cell_id
+    conn = sqlite3.connect(path)
+    batch = []
+    for i in range(start, rows):
+        lat, lon = random.uniform(-60, 70), random.uniform(-180, 180)
+        batch.append((
+            f"s{i}", f"s{i}", random.choice(['NASA_FIRMS_MODIS', 'NASA_FIRMS_VIIRS']),
+            f"2026-01-{1 + i % 28:02d} {i % 24:02d}:00:00.000000", lat, lon,
+            random.uniform(300, 400), random.randint(0, 100), random.uniform(0, 200),
+            'Terra', 'MODIS', f"{lat:.4f}, {lon:.4f}", cell_id(lat, lon)
+        ))
+    conn.executemany(
+        'INSERT INTO "Fire" (id, fire_id, source, date, latitude, longitude, brightness, confidence, frp, '
+        'satellite, instrument, location, cell) VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?)', batch
+    )
+    conn.commit()
+    conn.close()
+
+def measure(client, url):
+    """Yanıtı parça parça tüket: (TTFB ms, toplam ms, bayt, bellek tepe MB)"""
+    tracemalloc.start()
+    started = time.perf_counter()
+    response = client.get(url, buffered=False)
+    ttfb = None
+    size = 0
+    for chunk in response.response:
+        if ttfb is None:
+            ttfb = time.perf_counter() - started
+        size += len(chunk)
+    total = time.perf_counter() - started
+    response.close()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return ttfb * 1000, total * 1000, size, peak / 1024 / 1024
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [20000, 100000]
+
+    path = os.path.join(tempfile.mkdtemp(), 'bench_streaming.db')
+    os.environ['DATABASE_URL'] = f"sqlite:///{path}"
+    os.environ['INGEST_MODE'] = 'off'
+    os.environ['API_MAX_PAGE_SIZE'] = str(max(sizes))
+
+    import app as api
+    from models import init_db
+    init_db()
+    client = api.create_app().test_client()
+    seeded = 0
+
+    print(f"{'satır':>8} {'format':<8}{'TTFB ms':>10}{'toplam ms':>12}{'MB':>8}{'bellek MB':>12}")
+    for rows in sorted(sizes):
+        seed(path, seeded, rows)
+        seeded = rows
+        for fmt in ('json', 'stream', 'ndjson'):
+            api.result_cache.clear()
+            ttfb, total, size, peak = measure(client, f"/api/fires/all?limit={rows}&format={fmt}")
+            print(f"{rows:>8} {fmt:<8}{ttfb:>10.1f}{total:>12.1f}{size / 1024 / 1024:>8.1f}{peak:>12.1f}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,93 @@
+# bench_tiles.py
+"""Harita gezintisi: /api/tiles karoları (soğuk / disk önbelleği) ile /api/fires/all?bbox=... karşılaştırması
+
+Kullanım: python benchmarks/bench_tiles.py [satır sayısı]
+Son 24 saate dağılmış yangınlar eklenir; Türkiye çevresinde birkaç zoom
+seviyesinde görünümü kaplayan karolar istenir.
+"""
+import math
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+VIEW = (26.0, 36.0, 45.0, 42.0)
+ZOOMS = [4, 6, 8]
+
+def seed(path, rows):
+    """Son 24 saate dağılmış rastgele yangın kayıtları ekle (yarısı görünüm içinde)"""
+    from geo import cell_id
+    now = datetime.utcnow()
+    conn = sqlite3.connect(path)
+    batch = []
+    for i in range(rows):
+        if i % 2:
+            lat, lon = random.uniform(VIEW[1], VIEW[3]), random.uniform(VIEW[0], VIEW[2])
+        else:
+            lat, lon = random.uniform(-60, 70), random.uniform(-180, 180)
+        date = now - timedelta(seconds=random.uniform(0, 86000))
+        batch.append((
+            f"t{i}", f"t{i}", random.choice(['NASA_FIRMS_MODIS', 'NASA_FIRMS_VIIRS']),
+            date.strftime('%Y-%m-%d %H:%M:%S.%f'), lat, lon,
+            random.uniform(300, 400), random.randint(0, 100), random.uniform(0, 200),
+            'Terra', 'MODIS', f"{lat:.4f}, {lon:.4f}", cell_id(lat, lon)
+        ))
+    conn.executemany(
+        'INSERT INTO "Fire" (id, fire_id, source, date, latitude, longitude, brightness, confidence, frp, '
+        'satellite, instrument, location, cell) VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?)', batch
+    )
+    conn.commit()
+    conn.close()
+
+def tile_xy(lon, lat, z):
+    n = 2 ** z
+    x = int((lon + 180) / 360 * n)
+    y = int((1 - math.asinh(math.tan(math.radians(lat))) / math.pi) / 2 * n)
+    return min(x, n - 1), min(y, n - 1)
+
+def view_tiles(z):
+    min_x, max_y = tile_xy(VIEW[0], VIEW[1], z)
+    max_x, min_y = tile_xy(VIEW[2], VIEW[3], z)
+    return [(x, y) for x in range(min_x, max_x + 1) for y in range(min_y, max_y + 1)]
+
+def fetch(client, urls):
+    started = time.perf_counter()
+    size = 0
+    for url in urls:
+        size += len(client.get(url).get_data())
+    return (time.perf_counter() - started) * 1000, size
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+
+    workdir = tempfile.mkdtemp()
+    os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(workdir, 'bench_tiles.db')}"
+    os.environ['TILE_CACHE_DIR'] = os.path.join(workdir, 'tiles')
+    os.environ['INGEST_MODE'] = 'off'
+    os.environ['API_MAX_STREAM_SIZE'] = str(rows)
+
+    import app as api
+    from models import init_db
+    init_db()
+    seed(os.path.join(workdir, 'bench_tiles.db'), rows)
+    client = api.create_app().test_client()
+    bbox = ','.join(str(v) for v in VIEW)
+
+    print(f"{rows} yangın, görünüm {bbox}")
+    print(f"{'zoom':>4}{'karo':>6}{'soğuk ms':>11}{'önbellek ms':>13}{'KB':>9}{'   liste ms':>11}{'liste KB':>10}")
+    for z in ZOOMS:
+        urls = [f"/api/tiles/fires/{z}/{x}/{y}.json" for x, y in view_tiles(z)]
+        cold_ms, size = fetch(client, urls)
+        warm_ms, _ = fetch(client, urls)
+        api.result_cache.clear()
+        list_ms, list_size = fetch(client, [f"/api/fires/all?days=1&bbox={bbox}&format=stream"])
+        print(f"{z:>4}{len(urls):>6}{cold_ms:>11.1f}{warm_ms:>13.1f}{size / 1024:>9.1f}"
+              f"{list_ms:>11.1f}{list_size / 1024:>10.1f}")
+
+if __name__ == '__main__':
+    main()
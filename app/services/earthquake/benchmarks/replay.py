@@ -0,0 +1,216 @@
+# replay.py
+"""Kaynakların yerine geçen yerel HTTP sunucusu (ölçüm ve test için)
+
+Kandilli lst0.asp, EMSC FDSN JSON, NASA FIRMS CSV (MODIS / VIIRS) ve USGS
+GeoJSON yanıtlarını ya kayıtlı dosyalardan ya da istenen boyutta rastgele
+üreterek döndürür. Uygulama ortam değişkenleriyle buraya yönlendirilir:
+
+    python benchmarks/replay.py --port 8765 --firms-rows 100000
+    # yazdırılan KANDILLI_URL=... EMSC_API=... satırlarını uygulamanın ortamına ekleyin
+
+Kayıtlı yanıtlar --record-dir altında aşağıdaki adlarla aranır; bulunmayanlar üretilir:
+kandilli.html, emsc.json, firms_modis.csv, firms_viirs.csv, usgs.geojson
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import threading
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_kandilli import sample_page
+
+DEFAULT_SIZES = {'kandilli': 500, 'emsc': 500, 'firms': 20000, 'usgs': 100}
+
+RECORDED_FILES = {
+    'kandilli': 'kandilli.html',
+    'emsc': 'emsc.json',
+    'firms_modis': 'firms_modis.csv',
+    'firms_viirs': 'firms_viirs.csv',
+    'usgs': 'usgs.geojson'
+}
+
+MODIS_COLUMNS = 'latitude,longitude,brightness,scan,track,acq_date,acq_time,satellite,instrument,confidence,version,bright_t31,frp,daynight'
+VIIRS_COLUMNS = 'latitude,longitude,bright_ti4,scan,track,acq_date,acq_time,satellite,instrument,confidence,version,bright_ti5,frp,daynight'
+
+def emsc_json(rows, now=None):
+    """FDSN event servisi biçiminde (format=json) olaylar"""
+    now = now or datetime.utcnow()
+    features = []
+    for i in range(rows):
+        time = now - timedelta(seconds=97 * i)
+        features.append({
+            'type': 'Feature',
+            'id': f"2026{i:08d}",
+            'geometry': {'type': 'Point', 'coordinates': [
+                round(random.uniform(25, 45), 4), round(random.uniform(35, 42), 4), round(random.uniform(2, 30), 1)
+            ]},
+            'properties': {
+                'time': time.strftime('%Y-%m-%dT%H:%M:%S.%fZ'),
+                'lastupdate': (time + timedelta(minutes=5)).strftime('%Y-%m-%dT%H:%M:%S.%fZ'),
+                'mag': round(random.uniform(1, 5), 1),
+                'place': f"REGION {i}"
+            }
+        })
+    return json.dumps({'type': 'FeatureCollection', 'features': features})
+
+def firms_csv(rows, instrument, now=None):
+    """FIRMS active_fire/csv biçiminde yangın noktaları"""
+    now = now or datetime.utcnow()
+    lines = [MODIS_COLUMNS if instrument == 'MODIS' else VIIRS_COLUMNS]
+    for i in range(rows):
+        time = now - timedelta(minutes=i % 1440)
+        lat, lon = random.uniform(-60, 70), random.uniform(-180, 180)
+        if instrument == 'MODIS':
+            lines.append(
+                f"{lat:.5f},{lon:.5f},{random.uniform(300, 400):.1f},1.0,1.0,{time:%Y-%m-%d},{time:%H%M},"
+                f"{random.choice('TA')},MODIS,{random.randint(0, 100)},6.1NRT,290.1,{random.uniform(0, 200):.1f},D"
+            )
+        else:
+            lines.append(
+                f"{lat:.5f},{lon:.5f},{random.uniform(300, 400):.1f},0.4,0.4,{time:%Y-%m-%d},{time:%H%M},"
+                f"N,VIIRS,{random.choice('lnh')},2.0NRT,290.1,{random.uniform(0, 200):.1f},N"
+            )
+    return '\n'.join(lines) + '\n'
+
+def usgs_geojson(rows, now=None):
+    """USGS özet akışı biçiminde (tümü tsunami uyarısına dönüşecek büyüklükte) depremler"""
+    now = now or datetime.utcnow()
+    features = []
+    for i in range(rows):
+        time = now - timedelta(minutes=7 * i)
+        features.append({
+            'type': 'Feature',
+            'id': f"us{i:08d}",
+            'geometry': {'type': 'Point', 'coordinates': [
+                round(random.uniform(-180, 180), 4), round(random.uniform(-60, 60), 4), round(random.uniform(5, 100), 1)
+            ]},
+            'properties': {
+                'time': int(time.timestamp() * 1000),
+                'mag': round(random.uniform(6, 8.5), 1),
+                'tsunami': random.randint(0, 1),
+                'place': f"{random.randint(1, 300)} km of Region {i}"
+            }
+        })
+    return json.dumps({'type': 'FeatureCollection', 'features': features})
+
+class ReplayData:
+    """Yanıt gövdeleri: kayıtlı dosya varsa o, yoksa üretilmiş veri (bir kez üretilir)"""
+
+    def __init__(self, sizes=None, record_dir=None):
+        self.sizes = dict(DEFAULT_SIZES, **(sizes or {}))
+        self.record_dir = record_dir
+        self._bodies = {}
+        self._lock = threading.Lock()
+
+    def _recorded(self, name):
+        if not self.record_dir:
+            return None
+        path = os.path.join(self.record_dir, RECORDED_FILES[name])
+        if not os.path.exists(path):
+            return None
+        with open(path, 'rb') as f:
+            return f.read()
+
+    def _generate(self, name):
+        if name == 'kandilli':
+            return sample_page(self.sizes['kandilli']).encode('utf-8')
+        if name == 'emsc':
+            return emsc_json(self.sizes['emsc']).encode('utf-8')
+        if name == 'firms_modis':
+            return firms_csv(self.sizes['firms'], 'MODIS').encode('utf-8')
+        if name == 'firms_viirs':
+            return firms_csv(self.sizes['firms'], 'VIIRS').encode('utf-8')
+        return usgs_geojson(self.sizes['usgs']).encode('utf-8')
+
+    def body(self, name, limit=None):
+        """Gövdeyi getir; limit verilirse (EMSC) yalnızca ilk limit olay"""
+        with self._lock:
+            if name not in self._bodies:
+                self._bodies[name] = self._recorded(name) or self._generate(name)
+            if limit is None:
+                return self._bodies[name]
+            key = (name, limit)
+            if key not in self._bodies:
+                parsed = json.loads(self._bodies[name])
+                parsed['features'] = parsed['features'][:limit]
+                self._bodies[key] = json.dumps(parsed).encode('utf-8')
+            return self._bodies[key]
+
+# Yol önekleri -> (gövde adı, içerik türü)
+ROUTES = {
+    '/kandilli': ('kandilli', 'text/html; charset=utf-8'),
+    '/emsc': ('emsc', 'application/json'),
+    '/firms': (None, 'text/csv'),
+    '/usgs': ('usgs', 'application/json')
+}
+
+def make_handler(data):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def do_GET(self):
+            url = urlsplit(self.path)
+            prefix = '/' + url.path.strip('/').split('/', 1)[0]
+            if prefix not in ROUTES:
+                self.send_error(404)
+                return
+            name, content_type = ROUTES[prefix]
+            if prefix == '/firms':
+                # /firms/<anahtar>/<ürün>/<bölge>/<gün>: ürün adı VIIRS içeriyorsa VIIRS kolonları
+                name = 'firms_viirs' if 'VIIRS' in url.path else 'firms_modis'
+            limit = parse_qs(url.query).get('limit') if prefix == '/emsc' else None
+            body = data.body(name, int(limit[0]) if limit else None)
+            self.send_response(200)
+            self.send_header('Content-Type', content_type)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+    return Handler
+
+def start(port=0, sizes=None, record_dir=None):
+    """Sunucuyu arka planda başlat; (sunucu, ortam değişkenleri) döner"""
+    data = ReplayData(sizes, record_dir)
+    server = ThreadingHTTPServer(('127.0.0.1', port), make_handler(data))
+    server.daemon_threads = True
+    server.data = data
+    threading.Thread(target=server.serve_forever, name='replay', daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_port}"
+    env = {
+        'KANDILLI_URL': f"{base}/kandilli",
+        'EMSC_API': f"{base}/emsc",
+        'NASA_FIRMS_API': f"{base}/firms",
+        'USGS_EARTHQUAKE_API': f"{base}/usgs"
+    }
+    return server, env
+
+def main():
+    parser = argparse.ArgumentParser(description='Kaynakların yerine geçen yerel HTTP sunucusu')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--record-dir', help='kayıtlı yanıtların bulunduğu klasör')
+    parser.add_argument('--kandilli-rows', type=int, default=DEFAULT_SIZES['kandilli'])
+    parser.add_argument('--emsc-rows', type=int, default=DEFAULT_SIZES['emsc'])
+    parser.add_argument('--firms-rows', type=int, default=DEFAULT_SIZES['firms'])
+    parser.add_argument('--usgs-rows', type=int, default=DEFAULT_SIZES['usgs'])
+    args = parser.parse_args()
+
+    server, env = start(args.port, {
+        'kandilli': args.kandilli_rows, 'emsc': args.emsc_rows, 'firms': args.firms_rows, 'usgs': args.usgs_rows
+    }, args.record_dir)
+    for key, value in env.items():
+        print(f"{key}={value}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,125 @@
+# bulk.py
+import sqlite3
+from sqlalchemy import func, literal_column, or_, select
+from sqlalchemy.dialects import postgresql, sqlite
+
+# Tek INSERT ifadesine konacak en fazla satır sayısı
+BULK_CHUNK_SIZE = 1000
+
+# Sürücülerin tek ifadede kabul ettiği en fazla parametre sayısı
+POSTGRES_MAX_PARAMS = 65535
+SQLITE_MAX_PARAMS = 32766 if sqlite3.sqlite_version_info >= (3, 32, 0) else 999
+
+# Her yazmada değişen zaman damgaları; kaydın değişip değişmediğine bakılırken karşılaştırılmaz
+TIMESTAMP_COLUMNS = ('created_at', 'updated_at')
+
+def _chunk_size(dialect_name, column_count, chunk_size):
+    """Parametre sınırını aşmayacak satır sayısını hesapla"""
+    if dialect_name == 'postgresql':
+        max_params = POSTGRES_MAX_PARAMS
+    elif dialect_name == 'sqlite':
+        max_params = SQLITE_MAX_PARAMS
+    else:
+        return chunk_size
+    return max(1, min(chunk_size, max_params // max(1, column_count)))
+
+def _dedupe(rows, key):
+    """Aynı partide tekrar eden anahtarları ayıkla (ilk kayıt kalır)"""
+    seen = set()
+    unique = []
+    for row in rows:
+        if row[key] in seen:
+            continue
+        seen.add(row[key])
+        unique.append(row)
+    return unique
+
+def _count_existing(session, table, key, keys):
+    """Verilen anahtarlardan tabloda zaten bulunanların sayısı"""
+    column = table.c[key]
+    return session.execute(select(func.count()).select_from(table).where(column.in_(keys))).scalar()
+
+def _changed(conditions):
+    """Kolonlardan en az biri farklı mı (karşılaştırılacak kolon yoksa None: her zaman güncellenir)"""
+    return or_(*conditions) if conditions else None
+
+def bulk_upsert(session, model, rows, key, update_columns=None, chunk_size=BULK_CHUNK_SIZE, conflict_columns=None):
+    """Bir partiyi parçalı çok satırlı INSERT ... ON CONFLICT ile yaz
+
+    update_columns verilmezse çakışan kayıtlar atlanır (DO NOTHING), verilirse
+    bu kolonlar güncellenir (DO UPDATE); yalnızca zaman damgaları dışındaki
+    değerlerinden biri değişen kayıtlar güncellenir ve 'updated' sayılır,
+    aynı gelen kayıtlar 'skipped' sayılır. Çakışma hedefi varsayılan olarak key
+    kolonudur; benzersizlik başka kolonları da içeriyorsa (bölümlü tablolar)
+    conflict_columns ile verilir. Commit çağıranın sorumluluğundadır.
+    Dönüş: {'inserted': .., 'updated': .., 'skipped': ..}
+    """
+    stats = {'inserted': 0, 'updated': 0, 'skipped': 0}
+    if not rows:
+        return stats
+
+    table = model.__table__
+    unique_rows = _dedupe(rows, key)
+    stats['skipped'] += len(rows) - len(unique_rows)
+
+    dialect_name = session.get_bind().dialect.name
+    compare = [column for column in (update_columns or []) if column not in TIMESTAMP_COLUMNS]
+    index_elements = [table.c[column] for column in (conflict_columns or [key])]
+    size = _chunk_size(dialect_name, len(unique_rows[0]), chunk_size)
+
+    for start in range(0, len(unique_rows), size):
+        chunk = unique_rows[start:start + size]
+        keys = [row[key] for row in chunk]
+
+        if dialect_name in ('postgresql', 'sqlite'):
+            insert = postgresql.insert if dialect_name == 'postgresql' else sqlite.insert
+            stmt = insert(table).values(chunk)
+
+            if update_columns:
+                # IS DISTINCT FROM (SQLite: IS NOT): NULL değerler de karşılaştırılır
+                changed = _changed([table.c[c].is_distinct_from(stmt.excluded[c]) for c in compare])
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=index_elements,
+                    set_={column: stmt.excluded[column] for column in update_columns},
+                    where=changed
+                )
+                if dialect_name == 'postgresql':
+                    # xmax = 0: satır bu ifadeyle eklendi, aksi halde güncellendi
+                    inserted = session.execute(stmt.returning(literal_column('xmax = 0'))).scalars().all()
+                    written = len(inserted)
+                    stats['inserted'] += sum(1 for flag in inserted if flag)
+                    stats['updated'] += sum(1 for flag in inserted if not flag)
+                else:
+                    # SQLite sürücüsü RETURNING desteklemez: etkilenen satırlardan mevcut olmayanlar eklenmiştir
+                    existing = _count_existing(session, table, key, keys)
+                    written = session.execute(stmt).rowcount
+                    stats['inserted'] += len(chunk) - existing
+                    stats['updated'] += written - (len(chunk) - existing)
+                stats['skipped'] += len(chunk) - written
+            else:
+                stmt = stmt.on_conflict_do_nothing(index_elements=index_elements)
+                inserted = session.execute(stmt).rowcount
+                stats['inserted'] += inserted
+                stats['skipped'] += len(chunk) - inserted
+        else:
+            # Diğer veritabanları için: mevcut anahtarları tek sorguda bul, eksikleri ekle
+            column = table.c[key]
+            existing = set(session.execute(select(column).where(column.in_(keys))).scalars())
+            missing = [row for row in chunk if row[key] not in existing]
+            if missing:
+                session.execute(table.insert(), missing)
+            if update_columns:
+                for row in chunk:
+                    if row[key] in existing:
+                        update = table.update().where(column == row[key]).values({c: row[c] for c in update_columns})
+                        changed = _changed([table.c[c].is_distinct_from(row[c]) for c in compare])
+                        if changed is not None:
+                            update = update.where(changed)
+                        updated = session.execute(update).rowcount
+                        stats['updated'] += updated
+                        stats['skipped'] += 1 - updated
+            else:
+                stats['skipped'] += len(existing)
+            stats['inserted'] += len(missing)
+
+    return stats
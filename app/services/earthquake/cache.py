@@ -0,0 +1,127 @@
+# cache.py
+import os
+import threading
+import time
+from collections import OrderedDict
+from dotenv import load_dotenv
+
+# .env dosyasını yükle
+load_dotenv()
+
+# Önbelleğin toplam boyut sınırı (bayt)
+RESULT_CACHE_MAX_BYTES = int(os.getenv('RESULT_CACHE_MAX_BYTES', str(64 * 1024 * 1024)))
+# Varsayılan yaşam süresi (sn); endpoint bazında RESULT_CACHE_TTL_<ENDPOINT> ile değiştirilebilir
+RESULT_CACHE_TTL = int(os.getenv('RESULT_CACHE_TTL', '60'))
+
+class ResultCache:
+    """Endpoint + sorgu parametrelerine göre anahtarlanan, boyut sınırlı LRU önbellek
+
+    Her kayıt hangi kaynaklardan üretildiğini bilir; bir kaynağa yeni veri
+    yazıldığında yalnızca o kaynağa bağlı kayıtlar silinir.
+    """
+
+    def __init__(self, max_bytes=RESULT_CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # anahtar -> (bitiş zamanı, boyut, değer, kaynaklar)
+        self._size = 0
+        self._lock = threading.Lock()
+        self._stats = {}  # endpoint -> {'hits', 'misses'}
+        self.evictions = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def make_key(endpoint, args):
+        """Sorgu parametrelerini normalize ederek anahtar oluştur"""
+        items = sorted(
+            (key.lower(), value.strip())
+            for key, values in args.lists()
+            for value in values
+            if value.strip() != ''
+        )
+        return (endpoint, tuple(items))
+
+    def _count(self, endpoint, field):
+        stats = self._stats.setdefault(endpoint, {'hits': 0, 'misses': 0})
+        stats[field] += 1
+
+    def get(self, key):
+        """Geçerli kaydı getir, yoksa None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    self._remove(key)
+                self._count(key[0], 'misses')
+                return None
+            self._entries.move_to_end(key)
+            self._count(key[0], 'hits')
+            return entry[2]
+
+    def set(self, key, value, ttl, sources, size=None):
+        """Kaydı ekle; sınır aşılırsa en az kullanılanları çıkar"""
+        size = size if size is not None else len(value)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (time.monotonic() + ttl, size, value, frozenset(sources))
+            self._size += size
+            while self._size > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def resize(self, key, size):
+        """Kaydın boyutunu güncelle (ör. sıkıştırılmış kopya eklendiğinde); süresi değişmez"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return
+            self._entries[key] = (entry[0], size, entry[2], entry[3])
+            self._size += size - entry[1]
+            while self._size > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def _remove(self, key):
+        entry = self._entries.pop(key)
+        self._size -= entry[1]
+
+    def invalidate_source(self, source):
+        """Kaynağa bağlı tüm kayıtları sil"""
+        with self._lock:
+            keys = [key for key, entry in self._entries.items() if source in entry[3]]
+            for key in keys:
+                self._remove(key)
+            self.invalidations += len(keys)
+            return len(keys)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def stats(self):
+        """Önbellek sayaçlarını getir"""
+        with self._lock:
+            hits = sum(s['hits'] for s in self._stats.values())
+            misses = sum(s['misses'] for s in self._stats.values())
+            return {
+                'entries': len(self._entries),
+                'size_bytes': self._size,
+                'max_bytes': self.max_bytes,
+                'hits': hits,
+                'misses': misses,
+                'hit_ratio': round(hits / (hits + misses), 4) if hits + misses else None,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations,
+                'endpoints': {endpoint: dict(stats) for endpoint, stats in self._stats.items()}
+            }
+
+def get_ttl(endpoint):
+    """Endpoint'in önbellek süresini getir"""
+    return int(os.getenv(f"RESULT_CACHE_TTL_{endpoint.upper()}", RESULT_CACHE_TTL))
+
+result_cache = ResultCache()
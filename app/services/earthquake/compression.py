@@ -0,0 +1,90 @@
+# compression.py
+"""Yanıt sıkıştırma: Accept-Encoding'e göre gzip veya (yüklüyse) brotli
+
+Önbellekteki yanıtlar için sıkıştırılmış kopyalar Variants içinde tutulur;
+aynı gövde her istekte yeniden sıkıştırılmaz. Diğer yanıtlar after_request
+içinde compress_response() ile sıkıştırılır. Akış yanıtları (ndjson/csv, SSE)
+sıkıştırılmaz.
+"""
+import gzip
+import os
+import threading
+from dotenv import load_dotenv
+
+try:
+    import brotli  # isteğe bağlı: pip install brotli
+except ImportError:
+    brotli = None
+
+# .env dosyasını yükle
+load_dotenv()
+
+# Bu boyuttan küçük gövdeler sıkıştırılmaz (bayt)
+COMPRESS_MIN_BYTES = int(os.getenv('COMPRESS_MIN_BYTES', '1024'))
+# gzip seviyesi (1-9)
+COMPRESS_GZIP_LEVEL = int(os.getenv('COMPRESS_GZIP_LEVEL', '6'))
+# brotli kalitesi (0-11); yüksek değerler büyük yanıtlarda çok yavaştır
+COMPRESS_BROTLI_QUALITY = int(os.getenv('COMPRESS_BROTLI_QUALITY', '5'))
+
+# Eşit tercih edildiğinde ilk sıradaki seçilir
+ENCODINGS = ['br', 'gzip'] if brotli is not None else ['gzip']
+
+COMPRESSIBLE_MIMETYPES = {'application/json', 'application/geo+json', 'text/plain'}
+
+def negotiate(accept_encodings):
+    """İstemcinin kabul ettiği kodlamalardan birini seç (request.accept_encodings); yoksa None"""
+    return accept_encodings.best_match(ENCODINGS)
+
+def compress(body, encoding):
+    if encoding == 'br':
+        return brotli.compress(body, quality=COMPRESS_BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=COMPRESS_GZIP_LEVEL, mtime=0)
+
+class Variants:
+    """Bir yanıt gövdesi ve istenen kodlamalarda, ilk istendiğinde üretilen sıkıştırılmış kopyaları"""
+
+    def __init__(self, body):
+        self.body = body
+        self._encoded = {}
+        self._lock = threading.Lock()
+
+    @property
+    def size(self):
+        return len(self.body) + sum(len(data) for data in self._encoded.values())
+
+    def get(self, encoding):
+        """(gövde, kodlama, yeni kopya üretildi mi); küçük gövdeler ve encoding=None sıkıştırılmaz"""
+        if encoding is None or len(self.body) < COMPRESS_MIN_BYTES:
+            return self.body, None, False
+        with self._lock:
+            data = self._encoded.get(encoding)
+            if data is not None:
+                return data, encoding, False
+        data = compress(self.body, encoding)
+        with self._lock:
+            created = encoding not in self._encoded
+            self._encoded.setdefault(encoding, data)
+        return data, encoding, created
+
+def compressible(response):
+    """Yanıt gövdesi sıkıştırılabilir bir tür mü (akış ve zaten kodlanmış yanıtlar hariç)"""
+    return (
+        response.status_code == 200
+        and not response.direct_passthrough
+        and not response.is_streamed
+        and 'Content-Encoding' not in response.headers
+        and response.mimetype in COMPRESSIBLE_MIMETYPES
+    )
+
+def compress_response(response, accept_encodings):
+    """after_request: yanıtı istemcinin kabul ettiği kodlamayla yerinde sıkıştır"""
+    if not compressible(response):
+        return response
+    response.vary.add('Accept-Encoding')
+    body = response.get_data()
+    encoding = negotiate(accept_encodings)
+    if encoding is None or len(body) < COMPRESS_MIN_BYTES:
+        return response
+    response.set_data(compress(body, encoding))
+    response.headers['Content-Encoding'] = encoding
+    return response
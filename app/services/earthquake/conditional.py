@@ -0,0 +1,96 @@
+# conditional.py
+"""Veri sürümünden türetilen ETag'ler ve koşullu GET (If-None-Match -> 304)
+
+Kayıtlar yazılırken kaynağın IngestStatus.data_version değeri aynı
+transaction'da artırılır (bkz. ingest.bump_data_version). Bir yanıtın ETag'i
+endpoint, normalize edilmiş sorgu parametreleri ve kaynakların (data_version,
+last_success_at, stale_since) değerlerinden hesaplanır; istemcinin gönderdiği ETag hâlâ
+geçerliyse sorgu hiç çalıştırılmadan 304 döner.
+
+days parametresi içeren sorgularda pencere veri gelmeden de kaydığı için
+ETag'e endpoint'in önbellek süresi (RESULT_CACHE_TTL) uzunluğundaki zaman
+dilimi de girer.
+
+Sürümler veritabanında tutulduğu için ayrı süreçte yazan işçinin
+(INGEST_MODE=worker) değişiklikleri de görülür: bir kaynağın sürümü bu
+süreçte son görülenden ilerlemişse sorgu önbelleğindeki kayıtları silinir ve
+bellekteki anlık görüntüsü yenilenir.
+"""
+import hashlib
+import threading
+import time
+from models import IngestStatus, Session
+from cache import result_cache
+from snapshot import earthquake_snapshot, fire_snapshot
+
+# Kaynak -> bu süreçte tutulan anlık görüntü
+SOURCE_SNAPSHOTS = {
+    'Kandilli': earthquake_snapshot,
+    'EMSC': earthquake_snapshot,
+    'NASA_FIRMS_MODIS': fire_snapshot,
+    'NASA_FIRMS_VIIRS': fire_snapshot
+}
+
+class DataVersions:
+    """Kaynakların veri sürümlerini okur ve bu süreçte son görülen sürümleri izler"""
+
+    def __init__(self):
+        self._seen = {}
+        self._lock = threading.Lock()
+        self.changes = 0
+
+    def current(self, sources):
+        """{kaynak: (data_version, last_success_at, stale_since)}; ilerleyen kaynakların yerel önbelleklerini tazeler"""
+        session = Session()
+        try:
+            rows = session.query(
+                IngestStatus.source, IngestStatus.data_version, IngestStatus.last_success_at, IngestStatus.stale_since
+            ).filter(IngestStatus.source.in_(sources)).all()
+        finally:
+            session.close()
+        versions = {source: (0, None, None) for source in sources}
+        versions.update({source: (version or 0, success, stale) for source, version, success, stale in rows})
+
+        changed = []
+        with self._lock:
+            for source in sources:
+                version = versions[source][0]
+                seen = self._seen.get(source)
+                if seen is None or version > seen:
+                    self._seen[source] = version
+                    # İlk görülen sürüm bir değişiklik değildir
+                    if seen is not None:
+                        changed.append(source)
+            self.changes += len(changed)
+        for source in changed:
+            result_cache.invalidate_source(source)
+            snapshot = SOURCE_SNAPSHOTS.get(source)
+            if snapshot is not None:
+                snapshot.update()
+        return versions
+
+data_versions = DataVersions()
+
+def make_etag(key, versions, window=None):
+    """Önbellek anahtarı, kaynak sürümleri ve (days sorgularında) zaman diliminden zayıf ETag"""
+    state = repr((key, sorted(versions.items()), window))
+    return f'W/"{hashlib.sha1(state.encode("utf-8")).hexdigest()[:24]}"'
+
+def time_window(ttl):
+    """Kayan pencereli sorgular için ETag'e giren zaman dilimi numarası"""
+    return int(time.time() // max(ttl, 1))
+
+def etag_matches(if_none_match, etag):
+    """If-None-Match başlığı ETag'i içeriyor mu (zayıf karşılaştırma)"""
+    if not if_none_match:
+        return False
+    opaque = etag[2:] if etag.startswith('W/') else etag
+    for candidate in if_none_match.split(','):
+        candidate = candidate.strip()
+        if candidate == '*':
+            return True
+        if candidate.startswith('W/'):
+            candidate = candidate[2:]
+        if candidate == opaque:
+            return True
+    return False
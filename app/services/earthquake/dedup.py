@@ -0,0 +1,195 @@
+# dedup.py
+"""Kaynaklar arası aynı deprem kayıtlarının eşleştirilmesi
+
+Aynı fiziksel deprem Kandilli, EMSC vb. kaynaklardan farklı kimliklerle gelir.
+Her yeni kayıt, farklı kaynaklardan daha önce kaydedilmiş ve zaman penceresi,
+mesafe ve büyüklük farkı sınırları içinde kalan en yakın olaya bağlanır
+(canonical_id). Eşleşme bulunamazsa kayıt kendi olayının kanonik kaydı olur.
+
+Adaylar (zaman kovası, ızgara hücresi) anahtarlı bir indekste tutulur;
+her kayıt için yalnızca komşu kovalar ve hücreler taranır.
+
+Eşleştirme yalnızca ingest.py üzerinden models.Earthquake şemasına yazılan
+kaynakları (Kandilli, EMSC) kapsar. AFAD ve USGS kayıtlarını earthquake_service.py
+ayrı bir şemayla ("eventId", geom, "createdAt") yazar; bu kayıtlar canonical_id
+almaz ve dedup=true yanıtlarında ayrı depremler olarak kalır.
+"""
+import math
+import os
+from collections import defaultdict
+from datetime import datetime, timedelta
+from dotenv import load_dotenv
+from sqlalchemy import or_
+from models import Earthquake
+from geo import GRID_CELL_DEG, GRID_COLS, GRID_ROWS, KM_PER_DEG, cell_id
+
+# .env dosyasını yükle
+load_dotenv()
+
+DEDUP_ENABLED = os.getenv('DEDUP_ENABLED', 'true').lower() == 'true'
+# Eşleşme sınırları: oluş zamanı farkı (sn), merkez üssü uzaklığı (km), büyüklük farkı
+DEDUP_TIME_WINDOW = int(os.getenv('DEDUP_TIME_WINDOW', '30'))
+DEDUP_DISTANCE_KM = float(os.getenv('DEDUP_DISTANCE_KM', '50'))
+DEDUP_MAGNITUDE_DIFF = float(os.getenv('DEDUP_MAGNITUDE_DIFF', '1.0'))
+
+# Kaynakların zaman dilimi (UTC'ye göre saat); Kandilli yerel saatle (TSİ) yayımlar
+SOURCE_UTC_OFFSETS = {
+    'Kandilli': float(os.getenv('KANDILLI_UTC_OFFSET_HOURS', '3'))
+}
+
+EARTH_RADIUS_KM = 6371.0
+_EPOCH = datetime(1970, 1, 1)
+
+def to_utc(source, date):
+    """Kaynağın kaydettiği zamanı UTC'ye çevir"""
+    return date - timedelta(hours=SOURCE_UTC_OFFSETS.get(source, 0))
+
+def distance_km(lat1, lon1, lat2, lon2):
+    """İki nokta arasındaki büyük daire uzaklığı (haversine)"""
+    dlat = math.radians(lat2 - lat1)
+    dlon = math.radians(lon2 - lon1)
+    a = (math.sin(dlat / 2) ** 2 +
+         math.cos(math.radians(lat1)) * math.cos(math.radians(lat2)) * math.sin(dlon / 2) ** 2)
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+class EventIndex:
+    """Olayları (zaman kovası, ızgara hücresi) anahtarıyla tutan aday indeksi"""
+
+    def __init__(self):
+        self._buckets = defaultdict(list)
+
+    @staticmethod
+    def _bucket(utc):
+        return int((utc - _EPOCH).total_seconds() // DEDUP_TIME_WINDOW)
+
+    def add(self, event):
+        self._buckets[(self._bucket(event['utc']), cell_id(event['latitude'], event['longitude']))].append(event)
+
+    def candidates(self, utc, latitude, longitude):
+        """Zaman penceresi ve uzaklık sınırına girebilecek olaylar"""
+        bucket = self._bucket(utc)
+        row, col = divmod(cell_id(latitude, longitude), GRID_COLS)
+        cell_km = KM_PER_DEG * GRID_CELL_DEG
+        rows = math.ceil(DEDUP_DISTANCE_KM / cell_km)
+        # Boylam hücreleri kutuplara doğru daralır
+        cols = min(math.ceil(DEDUP_DISTANCE_KM / (cell_km * max(math.cos(math.radians(latitude)), 0.01))), GRID_COLS // 2)
+        for b in (bucket - 1, bucket, bucket + 1):
+            for r in range(max(0, row - rows), min(GRID_ROWS - 1, row + rows) + 1):
+                for c in range(col - cols, col + cols + 1):
+                    yield from self._buckets.get((b, r * GRID_COLS + c % GRID_COLS), ())
+
+def _event(id, canonical_id, source, date, latitude, longitude, magnitude):
+    return {
+        'id': id,
+        'canonical_id': canonical_id or id,
+        'source': source,
+        'utc': to_utc(source, date),
+        'latitude': latitude,
+        'longitude': longitude,
+        'magnitude': magnitude
+    }
+
+def find_match(index, event, sources_by_canonical):
+    """Olayın bağlanacağı kanonik kaydı bul (yoksa None)"""
+    best = None
+    best_score = None
+    for candidate in index.candidates(event['utc'], event['latitude'], event['longitude']):
+        if candidate['source'] == event['source'] or candidate['id'] != candidate['canonical_id']:
+            continue
+        # Bir olaya her kaynaktan yalnızca bir çözüm bağlanır
+        if event['source'] in sources_by_canonical[candidate['id']]:
+            continue
+        dt = abs((candidate['utc'] - event['utc']).total_seconds())
+        if dt > DEDUP_TIME_WINDOW:
+            continue
+        distance = distance_km(event['latitude'], event['longitude'], candidate['latitude'], candidate['longitude'])
+        if distance > DEDUP_DISTANCE_KM:
+            continue
+        if (event['magnitude'] is not None and candidate['magnitude'] is not None and
+                abs(event['magnitude'] - candidate['magnitude']) > DEDUP_MAGNITUDE_DIFF):
+            continue
+        score = dt / DEDUP_TIME_WINDOW + distance / DEDUP_DISTANCE_KM
+        if best is None or score < best_score:
+            best, best_score = candidate, score
+    return best
+
+def assign_canonical(session, rows, source):
+    """Kaydedilecek deprem satırlarının canonical_id alanını doldur
+
+    Zaman aralığındaki diğer kaynak kayıtları tek sorguyla indekse yüklenir.
+    Aynı kaynağın önceki partilerde yaptığı bağlantılar da okunur; böylece bir
+    olaya aynı kaynaktan ikinci bir çözüm bağlanmaz. Zaten kayıtlı event_id'ler
+    (yazmada atlanacakları için) eşleştirilmez.
+    Dönüş: başka bir olaya bağlanan satır sayısı
+    """
+    for row in rows:
+        row['canonical_id'] = row['id']
+    events = [
+        (row, _event(row['id'], None, source, row['date'], row['latitude'], row['longitude'], row['magnitude']))
+        for row in rows
+        if row['latitude'] is not None and row['longitude'] is not None
+    ]
+    if not DEDUP_ENABLED or not events:
+        return 0
+
+    # Kayıtlı zamanlar kaynağın saat diliminde: UTC aralığı her kaynağın farkı kadar genişletilir
+    offsets = [0] + list(SOURCE_UTC_OFFSETS.values())
+    window = timedelta(seconds=DEDUP_TIME_WINDOW)
+    start = min(event['utc'] for _, event in events) - window + timedelta(hours=min(offsets))
+    end = max(event['utc'] for _, event in events) + window + timedelta(hours=max(offsets))
+
+    stored = session.query(
+        Earthquake.id, Earthquake.canonical_id, Earthquake.source, Earthquake.date,
+        Earthquake.latitude, Earthquake.longitude, Earthquake.magnitude
+    ).filter(
+        Earthquake.source != source,
+        Earthquake.date.between(start, end),
+        Earthquake.latitude.isnot(None),
+        Earthquake.longitude.isnot(None)
+    )
+
+    # Bu kaynağın aynı aralıktaki kayıtları: mevcut event_id'ler ve önceki bağlantılar
+    own = session.query(Earthquake.event_id, Earthquake.id, Earthquake.canonical_id).filter(
+        Earthquake.source == source,
+        Earthquake.date.between(start, end)
+    )
+
+    index = EventIndex()
+    sources_by_canonical = defaultdict(set)
+    existing = set()
+    for event_id, id, canonical_id in own:
+        existing.add(event_id)
+        if canonical_id is not None and canonical_id != id:
+            sources_by_canonical[canonical_id].add(source)
+    for record in stored:
+        event = _event(*record)
+        index.add(event)
+        sources_by_canonical[event['canonical_id']].add(event['source'])
+
+    linked = 0
+    for row, event in events:
+        if row['event_id'] in existing:
+            continue
+        match = find_match(index, event, sources_by_canonical)
+        if match:
+            row['canonical_id'] = match['id']
+            sources_by_canonical[match['id']].add(source)
+            linked += 1
+    return linked
+
+def canonical_filter():
+    """Yalnızca kanonik kayıtları seçen filtre"""
+    return or_(Earthquake.canonical_id.is_(None), Earthquake.canonical_id == Earthquake.id)
+
+def attach_solutions(session, earthquakes, to_dict):
+    """Kanonik kayıtları, bağlı diğer kaynak çözümleriyle birlikte sözlüğe çevir"""
+    solutions = defaultdict(list)
+    ids = [eq.id for eq in earthquakes]
+    if ids:
+        linked = session.query(Earthquake).filter(
+            Earthquake.canonical_id.in_(ids),
+            Earthquake.id != Earthquake.canonical_id
+        ).order_by(Earthquake.date)
+        for eq in linked:
+            solutions[eq.canonical_id].append(to_dict(eq))
+    return [dict(to_dict(eq), solutions=solutions[eq.id]) for eq in earthquakes]
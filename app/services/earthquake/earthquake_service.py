@@ -1,10 +1,13 @@
-import requests
 import psycopg2
 import json
 from datetime import datetime, timedelta
+import random
+import threading
 import time
 import os
 from dotenv import load_dotenv
+import upstream
+import metrics
 
 # .env dosyasından veritabanı bağlantı bilgilerini yükle
 load_dotenv()
@@ -12,63 +15,87 @@ load_dotenv()
 # Veritabanı bağlantı bilgileri
 DB_CONNECTION = os.getenv('DATABASE_URL')
 
-# API endpoint'leri
-AFAD_URL = "https://deprem.afad.gov.tr/last-earthquakes.html"
-USGS_URL = "https://earthquake.usgs.gov/earthquakes/feed/v1.0/summary/2.5_day.geojson"
-NOAA_TSUNAMI_URL = "https://www.tsunami.gov/json/web_tsu.json"
+# API endpoint'leri (ölçüm / test için ortam değişkeniyle yerel bir sunucuya yönlendirilebilir)
+AFAD_URL = os.getenv('AFAD_URL', "https://deprem.afad.gov.tr/last-earthquakes.html")
+USGS_URL = os.getenv('USGS_URL', "https://earthquake.usgs.gov/earthquakes/feed/v1.0/summary/2.5_day.geojson")
+NOAA_TSUNAMI_URL = os.getenv('NOAA_TSUNAMI_URL', "https://www.tsunami.gov/json/web_tsu.json")
+
+# Kaynak başına başlangıç çekme aralığı (sn), SERVICE_INTERVAL_<KAYNAK> ile değiştirilebilir (0: kapalı)
+SERVICE_INTERVAL = float(os.getenv('SERVICE_INTERVAL', '300'))
+# Uyarlanan aralığın alt ve üst sınırları (sn)
+SERVICE_INTERVAL_MIN = float(os.getenv('SERVICE_INTERVAL_MIN', '60'))
+SERVICE_INTERVAL_MAX = float(os.getenv('SERVICE_INTERVAL_MAX', '1200'))
+# Yeni kayıt gelince aralık bu katsayıyla kısalır, kaynak değişmemişse bu katsayıyla uzar
+SERVICE_SPEEDUP = float(os.getenv('SERVICE_SPEEDUP', '0.5'))
+SERVICE_BACKOFF = float(os.getenv('SERVICE_BACKOFF', '1.25'))
+# Her beklemeye eklenen rastgele sapma (aralığın oranı); kaynaklar aynı anda istenmez
+SERVICE_JITTER = float(os.getenv('SERVICE_JITTER', '0.1'))
+# Aynı anda çalışabilecek çekme + yazma sayısı
+SERVICE_MAX_CONCURRENCY = int(os.getenv('SERVICE_MAX_CONCURRENCY', '2'))
+
+# Çekme fonksiyonları kaynak değişmemişse (304 / aynı gövde) None döndürür; bağlantı,
+# HTTP, ayrıştırma ve açık devre (CircuitOpenError) hataları çağırana iletilir
 
 def get_afad_earthquakes():
     """AFAD'dan son depremleri çek"""
-    try:
-        response = requests.get(AFAD_URL)
-        response.raise_for_status()
-        data = response.json()
-        return [{"source": "AFAD", "data": eq} for eq in data]
-    except Exception as e:
-        print(f"AFAD verisi çekilirken hata oluştu: {e}")
-        return []
+    response = upstream.conditional_get(AFAD_URL, source='AFAD')
+    if response is None:
+        # Son çekmeden bu yana değişiklik yok
+        return None
+    started = time.perf_counter()
+    data = response.json()
+    earthquakes = [{"source": "AFAD", "data": eq} for eq in data]
+    metrics.record_parse('AFAD', len(earthquakes), time.perf_counter() - started)
+    upstream.mark_processed(response)
+    return earthquakes
 
 def get_usgs_earthquakes():
     """USGS'den son depremleri çek"""
-    try:
-        response = requests.get(USGS_URL)
-        response.raise_for_status()
-        data = response.json()
-        earthquakes = []
-        for feature in data['features']:
-            eq = {
-                "source": "USGS",
-                "data": {
-                    "eventId": feature['id'],
-                    "date": datetime.fromtimestamp(feature['properties']['time'] / 1000.0),
-                    "latitude": feature['geometry']['coordinates'][1],
-                    "longitude": feature['geometry']['coordinates'][0],
-                    "depth": feature['geometry']['coordinates'][2],
-                    "magnitude": feature['properties']['mag'],
-                    "type": feature['properties']['magType'],
-                    "location": feature['properties']['place'],
-                    "tsunamiAlert": feature['properties'].get('tsunami', 0) > 0
-                }
+    response = upstream.conditional_get(USGS_URL, source='USGS')
+    if response is None:
+        return None
+    started = time.perf_counter()
+    data = response.json()
+    earthquakes = []
+    for feature in data['features']:
+        eq = {
+            "source": "USGS",
+            "data": {
+                "eventId": feature['id'],
+                "date": datetime.fromtimestamp(feature['properties']['time'] / 1000.0),
+                "latitude": feature['geometry']['coordinates'][1],
+                "longitude": feature['geometry']['coordinates'][0],
+                "depth": feature['geometry']['coordinates'][2],
+                "magnitude": feature['properties']['mag'],
+                "type": feature['properties']['magType'],
+                "location": feature['properties']['place'],
+                "tsunamiAlert": feature['properties'].get('tsunami', 0) > 0
             }
-            earthquakes.append(eq)
-        return earthquakes
-    except Exception as e:
-        print(f"USGS verisi çekilirken hata oluştu: {e}")
-        return []
+        }
+        earthquakes.append(eq)
+    metrics.record_parse('USGS', len(earthquakes), time.perf_counter() - started)
+    # Yalnızca tümü ayrıştırılan yanıt işlenmiş sayılır; aksi halde sonraki çekmede yeniden denenir
+    upstream.mark_processed(response)
+    return earthquakes
 
 def get_tsunami_alerts():
     """NOAA'dan tsunami uyarılarını çek"""
-    try:
-        response = requests.get(NOAA_TSUNAMI_URL)
-        response.raise_for_status()
-        data = response.json()
-        return data['tsunamiAlerts'] if 'tsunamiAlerts' in data else []
-    except Exception as e:
-        print(f"Tsunami verisi çekilirken hata oluştu: {e}")
-        return []
+    response = upstream.conditional_get(NOAA_TSUNAMI_URL, source='NOAA')
+    if response is None:
+        return None
+    started = time.perf_counter()
+    data = response.json()
+    alerts = data['tsunamiAlerts'] if 'tsunamiAlerts' in data else []
+    metrics.record_parse('NOAA', len(alerts), time.perf_counter() - started)
+    upstream.mark_processed(response)
+    return alerts
+
+def save_tsunami_alert(cursor, alert_data, now=None):
+    """Tsunami uyarısını veritabanına kaydet (now: çekme başına bir kez alınan zaman damgası)
 
-def save_tsunami_alert(cursor, alert_data):
-    """Tsunami uyarısını veritabanına kaydet"""
+    Dönüş: uyarı yeni eklendiyse 1, mevcut uyarı güncellendiyse 0
+    """
+    now = now or datetime.now()
     try:
         # Çokgen geometrisi oluştur (basitleştirilmiş örnek)
         geom = None
@@ -92,6 +119,7 @@ def save_tsunami_alert(cursor, alert_data):
             "expiryDate" = EXCLUDED."expiryDate",
             description = EXCLUDED.description,
             "updatedAt" = EXCLUDED."updatedAt"
+        RETURNING (xmax = 0)
         """
         
         values = (
@@ -105,19 +133,22 @@ def save_tsunami_alert(cursor, alert_data):
             alert_data.get('affectedAreas', []),
             geom,
             geom,
-            datetime.now(),
-            datetime.now()
+            now,
+            now
         )
         
         cursor.execute(insert_query, values)
-        return cursor.fetchone()[0] if cursor.rowcount > 0 else None
+        # xmax = 0 yalnızca yeni eklenen satırda doğrudur (ON CONFLICT güncellemesinde dolu)
+        row = cursor.fetchone()
+        return 1 if row and row[0] else 0
         
     except Exception as e:
         print(f"Tsunami uyarısı kaydedilirken hata oluştu: {e}")
-        return None
+        return 0
 
-def save_earthquake(cursor, earthquake):
-    """Deprem verisini veritabanına kaydet"""
+def save_earthquake(cursor, earthquake, now=None):
+    """Deprem verisini veritabanına kaydet (now: çekme başına bir kez alınan zaman damgası)"""
+    now = now or datetime.now()
     try:
         source = earthquake['source']
         data = earthquake['data']
@@ -150,52 +181,198 @@ def save_earthquake(cursor, earthquake):
             data['location'],
             geom,
             data.get('tsunamiAlert', False),
-            datetime.now(),
-            datetime.now()
+            now,
+            now
         )
         
         cursor.execute(insert_query, values)
+        return cursor.rowcount
         
     except Exception as e:
         print(f"Deprem verisi kaydedilirken hata oluştu: {e}")
+        return 0
 
-def main():
-    """Ana servis döngüsü"""
-    while True:
+def write_earthquakes(cursor, source, earthquakes):
+    """Bir kaynağın depremlerini kaydet ve metriklere işle
+
+    Dönüş: eklenen yeni kayıt sayısı
+    """
+    started = time.perf_counter()
+    now = datetime.now()
+    inserted = sum(save_earthquake(cursor, eq, now) for eq in earthquakes)
+    metrics.record_write(source, {'inserted': inserted, 'skipped': len(earthquakes) - inserted},
+                         time.perf_counter() - started)
+    return inserted
+
+def write_tsunami_alerts(cursor, source, alerts):
+    """Tsunami uyarılarını kaydet ve metriklere işle
+
+    Dönüş: yeni eklenen uyarı sayısı; mevcut uyarıların güncellenmesi sayılmaz,
+    böylece zamanlayıcı yalnızca yeni uyarıda aralığı kısaltır
+    """
+    started = time.perf_counter()
+    now = datetime.now()
+    inserted = sum(save_tsunami_alert(cursor, alert, now) for alert in alerts)
+    metrics.record_write(source, {'inserted': inserted, 'updated': len(alerts) - inserted},
+                         time.perf_counter() - started)
+    return inserted
+
+# Kaynak -> (çekme, yazma, adres)
+SERVICE_SOURCES = {
+    'AFAD': (get_afad_earthquakes, write_earthquakes, AFAD_URL),
+    'USGS': (get_usgs_earthquakes, write_earthquakes, USGS_URL),
+    'NOAA': (get_tsunami_alerts, write_tsunami_alerts, NOAA_TSUNAMI_URL)
+}
+
+class PollJob:
+    """Tek bir kaynağın, gözlenen değişime göre aralığı uyarlanan çekme görevi"""
+
+    def __init__(self, name, fetch, write, url, interval=SERVICE_INTERVAL,
+                 minimum=SERVICE_INTERVAL_MIN, maximum=SERVICE_INTERVAL_MAX):
+        self.name = name
+        self.fetch = fetch
+        self.write = write
+        self.url = url
+        self.minimum = minimum
+        self.maximum = maximum
+        self.interval = min(max(interval, minimum), maximum)
+        self.last_run = None
+        self.last_duration = None
+        self.last_new = None
+        self.last_result = None
+        self.runs = 0
+        self.failures = 0
+
+    def adapt(self, result):
+        """Çekme sonucuna ('new' / 'changed' / 'unchanged' / 'error') göre sonraki aralığı belirle
+
+        Yeni kayıt geldiyse aralık kısalır (artçı dizisi gibi yoğun dönemler
+        sık örneklenir), yalnızca kaynak değişmemişse (304 / aynı gövde) uzar.
+        Kaynak değişip yeni kayıt çıkmadıysa (yalnızca güncellemeler) veya
+        çekme / yazma başarısızsa aralık korunur; erişilemeyen kaynağın
+        beklemesini devre kesici belirler (bkz. upstream.py).
+        """
+        if result == 'new':
+            self.interval = max(self.minimum, self.interval * SERVICE_SPEEDUP)
+        elif result == 'unchanged':
+            self.interval = min(self.maximum, self.interval * SERVICE_BACKOFF)
+        return self.interval
+
+class ServiceScheduler:
+    """Her kaynağı kendi (uyarlanan) aralığında çeken zamanlayıcı
+
+    Sonraki çalışma zamanı önceki planlanan zamana göre hesaplanır, böylece
+    çekme ve yazma süresi (ve eşzamanlılık sınırında bekleme) aralığa eklenmez.
+    Sapma (SERVICE_JITTER) yalnızca beklemeye eklenir, plana birikmez.
+    """
+
+    def __init__(self, jobs, max_concurrency=SERVICE_MAX_CONCURRENCY, jitter=SERVICE_JITTER):
+        self.jobs = {job.name: job for job in jobs}
+        self.jitter = jitter
+        self._slots = threading.BoundedSemaphore(max(1, max_concurrency))
+        self._stop = threading.Event()
+        self._threads = []
+
+    def start(self):
+        """Her görev için bir daemon thread başlat"""
+        self._stop.clear()
+        for job in self.jobs.values():
+            thread = threading.Thread(target=self._loop, args=(job,), name=f"service-{job.name}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self, timeout=None):
+        """Tüm görevleri durdur"""
+        self._stop.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def _loop(self, job):
+        next_run = time.monotonic()
+        while not self._stop.is_set():
+            with self._slots:
+                if self._stop.is_set():
+                    break
+                result = self.run_job(job)
+            next_run += job.adapt(result)
+            delay = next_run - time.monotonic()
+            if delay < 0:
+                # Çekme aralıktan uzun sürdüyse kaçan turları atla
+                next_run = time.monotonic()
+                delay = 0
+            delay += random.uniform(-self.jitter, self.jitter) * job.interval
+            self._stop.wait(max(0, delay))
+
+    def run_job(self, job):
+        """Kaynağı bir kez çek ve yaz; dönüş: 'new' / 'changed' / 'unchanged' / 'error'"""
+        started = time.perf_counter()
+        status = 'ok'
+        new = 0
         try:
-            # Veritabanına bağlan
-            conn = psycopg2.connect(DB_CONNECTION)
-            cursor = conn.cursor()
-            
-            # Tüm kaynaklardan deprem verilerini çek
-            all_earthquakes = []
-            all_earthquakes.extend(get_afad_earthquakes())
-            all_earthquakes.extend(get_usgs_earthquakes())
-            
-            # Tsunami uyarılarını çek
-            tsunami_alerts = get_tsunami_alerts()
-            
-            if all_earthquakes or tsunami_alerts:
-                # Deprem verilerini kaydet
-                for eq in all_earthquakes:
-                    save_earthquake(cursor, eq)
-                
-                # Tsunami uyarılarını kaydet
-                for alert in tsunami_alerts:
-                    save_tsunami_alert(cursor, alert)
-                
-                # Değişiklikleri kaydet
-                conn.commit()
-                print(f"{datetime.now()} - Veriler başarıyla güncellendi")
-            
-            cursor.close()
-            conn.close()
-            
+            items = job.fetch()
+            if items is None:
+                result = 'unchanged'
+            elif items:
+                conn = psycopg2.connect(DB_CONNECTION)
+                try:
+                    with conn.cursor() as cursor:
+                        new = job.write(cursor, job.name, items)
+                    conn.commit()
+                finally:
+                    conn.close()
+                print(f"{datetime.now()} - {job.name}: {len(items)} kayıt, {new} yeni")
+                result = 'new' if new else 'changed'
+            else:
+                result = 'changed'
         except Exception as e:
-            print(f"Servis hatası: {e}")
-        
-        # 5 dakika bekle
-        time.sleep(300)
+            print(f"{job.name} servis hatası: {e}")
+            status = result = 'error'
+            job.failures += 1
+            # Kaydedilemeyen veriler bir sonraki turda yeniden işlensin
+            upstream.forget(job.url)
+            new = 0
+        finally:
+            job.runs += 1
+            job.last_run = datetime.now()
+            job.last_duration = time.perf_counter() - started
+            job.last_new = new
+            job.last_result = result
+            metrics.INGEST_RUN_SECONDS.observe(job.last_duration, source=job.name, status=status)
+        return result
+
+    def status(self):
+        """Görevlerin anlık durumunu getir"""
+        return {name: {
+            'interval': round(job.interval, 1),
+            'runs': job.runs,
+            'failures': job.failures,
+            'last_run': job.last_run.isoformat() if job.last_run else None,
+            'last_duration_ms': round(job.last_duration * 1000) if job.last_duration is not None else None,
+            'last_new': job.last_new,
+            'last_result': job.last_result
+        } for name, job in self.jobs.items()}
+
+def build_scheduler():
+    """SERVICE_SOURCES ve ortam değişkenlerinden zamanlayıcıyı oluştur"""
+    jobs = []
+    for name, (fetch, write, url) in SERVICE_SOURCES.items():
+        interval = float(os.getenv(f"SERVICE_INTERVAL_{name}", SERVICE_INTERVAL))
+        if interval > 0:
+            jobs.append(PollJob(name, fetch, write, url, interval))
+    return ServiceScheduler(jobs)
+
+def main():
+    """Ana servis: her kaynak kendi aralığında çekilir"""
+    metrics.serve()
+    scheduler = build_scheduler()
+    scheduler.start()
+    print(f"{datetime.now()} - Servis başlatıldı: {', '.join(scheduler.jobs)}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        scheduler.stop(timeout=5)
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    main()
@@ -0,0 +1,347 @@
+# events.py
+"""Yeni kaydedilen depremlerin, yangınların ve tsunami uyarılarının Server-Sent Events ile yayımlanması
+
+save_* fonksiyonları commit sonrası yeni kayıtları publish_committed() ile
+süreç içi olay kuyruğuna (EventBus) ekler; GET /api/events/stream bağlantıları
+kuyruktaki partileri filtreleyerek gönderir. Her parti bir SSE olayıdır:
+
+    id: 1760000000000000
+    event: earthquakes
+    data: {"source": "Kandilli", "count": 2, "earthquakes": [...]}
+
+Olay kimlikleri mikro saniye cinsinden yayım zamanıdır ve süreç yeniden
+başlasa da artar. İstemci Last-Event-ID ile yeniden bağlandığında sonraki
+partiler kuyruktan gönderilir; istenen kimlik kuyruktan çıkmışsa (veya önceki
+bir sürece aitse) 'reset' olayı gönderilir ve istemci listeyi REST
+endpoint'lerinden yeniden yüklemelidir.
+
+Kayıtlar başka süreçte yazılırken (INGEST_MODE=worker veya bu süreç veri
+çekme lideri değilken, bkz. leader.py) poll açılır; ilk abonede başlayan bir
+iş parçacığı veritabanını EVENT_POLL_INTERVAL aralıkla yoklar ve son abone
+ayrılınca durur. Her tür için görülen en yeni created_at (su seviyesi)
+tutulur. created_at yazmadan önce uygulamada atandığı için eşzamanlı partiler
+(ör. MODIS ve VIIRS) bu sırayla commit edilmeyebilir; bu yüzden her yoklama
+su seviyesinin EVENT_POLL_OVERLAP sn gerisinden başlar, kayıtlar
+(created_at, id) sırasıyla EVENT_POLL_BATCH'lik sayfalarla okunur ve
+pencerede daha önce yayımlanan kimlikler atlanır. Su seviyesi iş parçacığı
+durduğunda korunur, yeniden başladığında aradaki kayıtlar da yayımlanır.
+"""
+import json
+import os
+import threading
+import time
+from collections import deque
+from datetime import timedelta
+from flask import Response, stream_with_context
+from dotenv import load_dotenv
+from sqlalchemy import and_, func, or_
+from models import Earthquake, Fire, TsunamiAlert, Session
+from geo import parse_bbox
+import metrics
+
+# .env dosyasını yükle
+load_dotenv()
+
+# Kuyrukta tutulan en fazla kayıt sayısı (yeniden bağlanma için); aşılınca en eski partiler çıkar
+EVENT_BUFFER_ITEMS = int(os.getenv('EVENT_BUFFER_ITEMS', '50000'))
+# Eşzamanlı SSE bağlantısı sınırı (her bağlantı bir iş parçacığı tutar)
+EVENT_MAX_CLIENTS = int(os.getenv('EVENT_MAX_CLIENTS', '100'))
+# Olay yokken gönderilen canlı tutma yorumunun aralığı (sn)
+EVENT_HEARTBEAT = float(os.getenv('EVENT_HEARTBEAT', '15'))
+# INGEST_MODE=worker iken veritabanı yoklama aralığı (sn)
+EVENT_POLL_INTERVAL = float(os.getenv('EVENT_POLL_INTERVAL', '2'))
+# Yoklamada bir sorguda okunan en fazla kayıt (fazlası sonraki sayfalarda okunur)
+EVENT_POLL_BATCH = int(os.getenv('EVENT_POLL_BATCH', '5000'))
+# Eşzamanlı partiler created_at sırasıyla commit edilmeyebilir; yoklama su seviyesinin
+# bu kadar sn gerisinden başlar (pencerede yayımlanmış kimlikler atlanır)
+EVENT_POLL_OVERLAP = int(os.getenv('EVENT_POLL_OVERLAP', '300'))
+
+# Olay türü -> (model, gönderilen alanlar); alanlar REST yanıtlarındaki *_to_dict çıktısıyla aynıdır
+EVENT_TYPES = {
+    'earthquakes': (Earthquake, (
+        'id', 'source', 'date', 'latitude', 'longitude', 'depth', 'magnitude', 'location')),
+    'fires': (Fire, (
+        'id', 'source', 'date', 'latitude', 'longitude', 'brightness', 'confidence', 'frp',
+        'satellite', 'instrument', 'location')),
+    'tsunami': (TsunamiAlert, (
+        'id', 'source', 'date', 'latitude', 'longitude', 'magnitude', 'depth', 'alert_level',
+        'status', 'affected_regions', 'message', 'location'))
+}
+
+class InvalidEventFilter(ValueError):
+    """Hatalı olay türü veya Last-Event-ID"""
+
+class TooManySubscribers(Exception):
+    """EVENT_MAX_CLIENTS aşıldı"""
+
+def _now_id():
+    return int(time.time() * 1000000)
+
+def _dumps(value):
+    return json.dumps(value, ensure_ascii=False, separators=(',', ':'))
+
+def _item(fields, row):
+    item = dict(zip(fields, row))
+    if item['date'] is not None:
+        item['date'] = item['date'].isoformat()
+    return item
+
+class EventBus:
+    """Yayımlanan partilerin sınırlı kuyruğu ve abonelerin beklediği koşul değişkeni"""
+
+    def __init__(self, max_items=EVENT_BUFFER_ITEMS):
+        self.max_items = max_items
+        self._batches = deque()  # (kimlik, tür, kaynak, kayıtlar)
+        self._items = 0
+        self._last_id = _now_id()
+        # Bu kimliğe kadar olan partiler kuyrukta yok (süreç başlangıcı veya çıkarılanlar)
+        self._floor = self._last_id
+        self._cond = threading.Condition()
+        self.subscribers = 0
+        self.poll = False
+        self._poller = None
+        self._marks = {}  # tür -> yoklamada görülen en yeni created_at
+        self._seen = {}  # tür -> {id: created_at}; örtüşme penceresinde yayımlanmış kayıtlar
+
+    def publish(self, kind, source, items):
+        """Bir partiyi kuyruğa ekle ve bekleyen bağlantıları uyandır"""
+        if not items:
+            return None
+        with self._cond:
+            self._last_id = max(self._last_id + 1, _now_id())
+            self._batches.append((self._last_id, kind, source, items))
+            self._items += len(items)
+            while self._items > self.max_items and len(self._batches) > 1:
+                dropped = self._batches.popleft()
+                self._items -= len(dropped[3])
+                self._floor = dropped[0]
+            self._cond.notify_all()
+        metrics.EVENTS_PUBLISHED.inc(len(items), type=kind)
+        return self._last_id
+
+    def publish_committed(self, session, kind, source, written_at):
+        """save_* fonksiyonlarında commit sonrası: bu partide eklenen kayıtları yayımla
+
+        Partide eklenen kayıtların created_at değeri written_at'e eşittir; atlanan
+        veya güncellenen mevcut kayıtlarınki değişmez.
+        """
+        model, fields = EVENT_TYPES[kind]
+        try:
+            rows = session.query(*[getattr(model, name) for name in fields]).filter(
+                model.source == source, model.created_at == written_at
+            ).all()
+            return self.publish(kind, source, [_item(fields, row) for row in rows])
+        except Exception as e:
+            print(f"Olay yayımlama hatası ({kind}): {str(e)}")
+            return None
+
+    def _after(self, last_id):
+        if last_id < self._floor:
+            # Aradaki partiler kuyruktan çıkmış
+            return [], True
+        return [batch for batch in self._batches if batch[0] > last_id], False
+
+    def since(self, last_id):
+        """last_id sonrasındaki partiler; (partiler, kaçırılan parti var mı)"""
+        with self._cond:
+            return self._after(last_id)
+
+    def wait(self, last_id, timeout):
+        """last_id sonrasında parti gelene kadar en fazla timeout sn bekle; since() ile aynı dönüş"""
+        with self._cond:
+            self._cond.wait_for(lambda: self._last_id > last_id, timeout)
+            return self._after(last_id)
+
+    @property
+    def last_id(self):
+        return self._last_id
+
+    def subscribe(self):
+        with self._cond:
+            if self.subscribers >= EVENT_MAX_CLIENTS:
+                raise TooManySubscribers(f"En fazla {EVENT_MAX_CLIENTS} eşzamanlı bağlantı")
+            self.subscribers += 1
+            if self.poll and self._poller is None:
+                self._poller = threading.Thread(target=self._poll_loop, name='events-poll', daemon=True)
+                self._poller.start()
+
+    def unsubscribe(self):
+        with self._cond:
+            self.subscribers -= 1
+
+    def _poll_stop(self):
+        """Abone kalmadıysa yoklayıcıyı bırak (yeni abone aynı kilitle yeni iş parçacığı başlatır)"""
+        with self._cond:
+            if self.subscribers > 0:
+                return False
+            self._poller = None
+            return True
+
+    def _prime(self, session):
+        """Su seviyelerini mevcut en yeni kayıtlara ayarla (öncekiler yayımlanmaz)"""
+        for kind, (model, _) in EVENT_TYPES.items():
+            latest = session.query(func.max(model.created_at)).scalar()
+            self._marks[kind] = latest
+            self._seen[kind] = dict(session.query(model.id, model.created_at).filter(
+                model.created_at >= latest - timedelta(seconds=EVENT_POLL_OVERLAP)
+            ).all()) if latest else {}
+
+    def _poll_kind(self, session, kind):
+        """Türün örtüşme penceresinden sonraki kayıtlarını sayfa sayfa yayımla (yayımlanmışlar atlanır)"""
+        model, fields = EVENT_TYPES[kind]
+        columns = [model.created_at, model.id] + [getattr(model, name) for name in fields]
+        mark = self._marks[kind]
+        seen = self._seen.setdefault(kind, {})
+        start = mark - timedelta(seconds=EVENT_POLL_OVERLAP) if mark is not None else None
+        if start is not None:
+            # Pencereden çıkan kimlikler bir daha okunmaz
+            for id in [id for id, created_at in seen.items() if created_at < start]:
+                del seen[id]
+        page = None
+        while True:
+            query = session.query(*columns)
+            if page is not None:
+                query = query.filter(or_(
+                    model.created_at > page[0],
+                    and_(model.created_at == page[0], model.id > page[1])
+                ))
+            elif start is not None:
+                query = query.filter(model.created_at >= start)
+            else:
+                query = query.filter(model.created_at.isnot(None))
+            rows = query.order_by(model.created_at, model.id).limit(EVENT_POLL_BATCH).all()
+            if not rows:
+                return
+            by_source = {}
+            for row in rows:
+                if row[1] in seen:
+                    continue
+                seen[row[1]] = row[0]
+                item = _item(fields, row[2:])
+                by_source.setdefault(item['source'], []).append(item)
+            for source, items in by_source.items():
+                self.publish(kind, source, items)
+            page = (rows[-1][0], rows[-1][1])
+            self._marks[kind] = page[0] if mark is None else max(mark, page[0])
+            if len(rows) < EVENT_POLL_BATCH:
+                return
+
+    def _poll_loop(self):
+        """Başka süreçte yazılan kayıtları su seviyesi ve örtüşme penceresiyle yoklayarak yayımla"""
+        while not self._poll_stop():
+            if not self.poll:
+                # Bu süreç yazmaya başladı (lider oldu): kayıtlar doğrudan yayımlanır
+                self._marks = {}
+                self._seen = {}
+                time.sleep(EVENT_POLL_INTERVAL)
+                continue
+            session = Session()
+            try:
+                if not self._marks:
+                    self._prime(session)
+                for kind in EVENT_TYPES:
+                    self._poll_kind(session, kind)
+            except Exception as e:
+                print(f"Olay yoklama hatası: {str(e)}")
+            finally:
+                session.close()
+            time.sleep(EVENT_POLL_INTERVAL)
+
+    def stats(self):
+        with self._cond:
+            return {
+                'subscribers': self.subscribers,
+                'buffered_batches': len(self._batches),
+                'buffered_items': self._items,
+                'last_event_id': self._last_id,
+                'polling': self._poller is not None
+            }
+
+event_bus = EventBus()
+
+class EventFilter:
+    """Bağlantının tür, kaynak, en küçük büyüklük ve bbox filtresi"""
+
+    def __init__(self, types=None, sources=None, min_magnitude=None, bbox=None):
+        self.types = set(types) if types else set(EVENT_TYPES)
+        self.sources = set(sources) if sources else None
+        self.min_magnitude = min_magnitude
+        self.bbox = bbox
+
+    @classmethod
+    def from_args(cls, args):
+        types = [t.strip() for t in args.get('types', '').split(',') if t.strip()]
+        unknown = set(types) - set(EVENT_TYPES)
+        if unknown:
+            raise InvalidEventFilter(f"Geçersiz olay türü: {', '.join(sorted(unknown))} "
+                                       f"({', '.join(EVENT_TYPES)} olmalıdır)")
+        sources = [s.strip() for s in args.get('source', '').split(',') if s.strip()]
+        bbox = args.get('bbox')
+        return cls(types, sources, args.get('min_magnitude', default=None, type=float),
+                   parse_bbox(bbox) if bbox else None)
+
+    def _match(self, item):
+        # Büyüklük filtresi büyüklük alanı olan türlere (deprem, tsunami) uygulanır
+        if self.min_magnitude is not None and 'magnitude' in item:
+            if item['magnitude'] is None or item['magnitude'] < self.min_magnitude:
+                return False
+        if self.bbox is not None:
+            min_lon, min_lat, max_lon, max_lat = self.bbox
+            lat, lon = item['latitude'], item['longitude']
+            if lat is None or lon is None or not (min_lat <= lat <= max_lat):
+                return False
+            if min_lon <= max_lon:
+                return min_lon <= lon <= max_lon
+            return lon >= min_lon or lon <= max_lon
+        return True
+
+    def apply(self, kind, source, items):
+        if kind not in self.types or (self.sources is not None and source not in self.sources):
+            return []
+        return [item for item in items if self._match(item)]
+
+def _event(batch_id, kind, data):
+    return f"id: {batch_id}\nevent: {kind}\ndata: {_dumps(data)}\n\n"
+
+def parse_last_event_id(value):
+    """Last-Event-ID başlığını (veya last_event_id parametresini) çöz"""
+    if not value:
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        raise InvalidEventFilter(f"Geçersiz Last-Event-ID: {value}")
+
+def event_stream(bus, event_filter, last_id=None):
+    """SSE yanıtı; last_id verilirse (Last-Event-ID) sonrasındaki partilerden başlar
+
+    Bağlantı sınırı aşılmışsa TooManySubscribers fırlatır.
+    """
+    bus.subscribe()
+
+    def generate():
+        yield "retry: 3000\n\n"
+        cursor = bus.last_id if last_id is None else last_id
+        batches, gap = bus.since(cursor)
+        while True:
+            if gap:
+                # İstemci listeyi REST endpoint'lerinden yeniden yüklemeli
+                cursor = bus.last_id
+                yield _event(cursor, 'reset', {'last_event_id': last_id})
+            for batch_id, kind, source, items in batches:
+                cursor = max(cursor, batch_id)
+                matched = event_filter.apply(kind, source, items)
+                if matched:
+                    metrics.EVENTS_SENT.inc(len(matched), type=kind)
+                    yield _event(batch_id, kind, {'source': source, 'count': len(matched), kind: matched})
+            batches, gap = bus.wait(cursor, EVENT_HEARTBEAT)
+            if not batches and not gap:
+                yield ": keepalive\n\n"
+
+    response = Response(stream_with_context(generate()), mimetype='text/event-stream')
+    # Bağlantı kapanınca (akış hiç başlamamış olsa da) aboneliği bırak
+    response.call_on_close(bus.unsubscribe)
+    response.headers['Cache-Control'] = 'no-cache'
+    # Ters vekillerin (nginx) yanıtı tamponlamaması için
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
@@ -0,0 +1,165 @@
+# geo.py
+import math
+from sqlalchemy import and_, case, func, or_, text
+
+# Izgara hücresi boyutu (derece). Değiştirilirse cell kolonları yeniden hesaplanmalıdır.
+GRID_CELL_DEG = 0.5
+GRID_COLS = int(360 / GRID_CELL_DEG)
+GRID_ROWS = int(180 / GRID_CELL_DEG)
+
+# Kutu bu kadar hücre satırından fazlasını kapsıyorsa hücre filtresi yerine düz aralık kullanılır
+MAX_CELL_ROWS = 60
+
+KM_PER_DEG = 111.32
+
+class InvalidSpatialFilter(ValueError):
+    """Hatalı bbox / lat-lon-radius parametreleri"""
+
+def cell_id(latitude, longitude):
+    """Koordinatın ızgara hücresi numarası"""
+    if latitude is None or longitude is None:
+        return None
+    row = min(int((latitude + 90) / GRID_CELL_DEG), GRID_ROWS - 1)
+    col = min(int((longitude + 180) / GRID_CELL_DEG), GRID_COLS - 1)
+    return row * GRID_COLS + col
+
+def cell_sql(lat_column='latitude', lon_column='longitude', dialect='postgresql'):
+    """cell_id ile aynı sonucu veren SQL ifadesi (mevcut kayıtları doldurmak için)
+
+    cell_id int() ile aşağı keser; PostgreSQL'de CAST(... AS INTEGER) yuvarladığı
+    için önce FLOOR uygulanır. SQLite'ta CAST zaten keser (değerler negatif
+    değil) ve FLOOR her derlemede bulunmadığından kullanılmaz.
+    """
+    def index(expression):
+        if dialect != 'sqlite':
+            expression = f"FLOOR({expression})"
+        return f"CAST({expression} AS INTEGER)"
+    return (
+        f"(CASE WHEN {lat_column} >= 90 THEN {GRID_ROWS - 1} "
+        f"ELSE {index(f'({lat_column} + 90) / {GRID_CELL_DEG}')} END) * {GRID_COLS} + "
+        f"(CASE WHEN {lon_column} >= 180 THEN {GRID_COLS - 1} "
+        f"ELSE {index(f'({lon_column} + 180) / {GRID_CELL_DEG}')} END)"
+    )
+
+def parse_bbox(value):
+    """'minLon,minLat,maxLon,maxLat' biçimindeki bbox parametresini çöz"""
+    try:
+        min_lon, min_lat, max_lon, max_lat = [float(part) for part in value.split(',')]
+    except ValueError:
+        raise InvalidSpatialFilter("bbox 'minLon,minLat,maxLon,maxLat' biçiminde olmalıdır")
+    if not (-90 <= min_lat <= max_lat <= 90) or not (-180 <= min_lon <= 180 and -180 <= max_lon <= 180):
+        raise InvalidSpatialFilter("bbox koordinatları geçersiz")
+    return min_lon, min_lat, max_lon, max_lat
+
+def radius_bbox(latitude, longitude, radius_km):
+    """Merkez ve yarıçapı kapsayan bbox'ı hesapla"""
+    if not (-90 <= latitude <= 90) or not (-180 <= longitude <= 180) or radius_km <= 0:
+        raise InvalidSpatialFilter("lat/lon/radius_km değerleri geçersiz")
+    dlat = radius_km / KM_PER_DEG
+    cos_lat = math.cos(math.radians(latitude))
+    min_lat, max_lat = max(-90, latitude - dlat), min(90, latitude + dlat)
+    if cos_lat < 1e-6 or max_lat >= 90 or min_lat <= -90:
+        # Kutuplara yakın: tüm boylamlar
+        return -180, min_lat, 180, max_lat
+    dlon = dlat / cos_lat
+    if dlon >= 180:
+        return -180, min_lat, 180, max_lat
+    min_lon = longitude - dlon
+    max_lon = longitude + dlon
+    # Tarih değiştirme çizgisini aşan kutular minLon > maxLon olarak ifade edilir
+    if min_lon < -180:
+        min_lon += 360
+    if max_lon > 180:
+        max_lon -= 360
+    return min_lon, min_lat, max_lon, max_lat
+
+def _lon_ranges(min_lon, max_lon):
+    if min_lon <= max_lon:
+        return [(min_lon, max_lon)]
+    return [(min_lon, 180), (-180, max_lon)]
+
+def _cell_filter(model, min_lon, min_lat, max_lon, max_lat):
+    """bbox'ın kapsadığı hücreler için indeksli cell aralıkları"""
+    row_start = cell_id(min_lat, 0) // GRID_COLS
+    row_end = cell_id(max_lat, 0) // GRID_COLS
+    if row_end - row_start + 1 > MAX_CELL_ROWS:
+        return None
+
+    ranges = []
+    for range_min, range_max in _lon_ranges(min_lon, max_lon):
+        col_start = cell_id(0, range_min) % GRID_COLS
+        col_end = cell_id(0, range_max) % GRID_COLS
+        if col_start == 0 and col_end == GRID_COLS - 1:
+            # Tam genişlik: satırlar ardışık tek aralık oluşturur
+            ranges.append(model.cell.between(row_start * GRID_COLS, row_end * GRID_COLS + GRID_COLS - 1))
+            continue
+        for row in range(row_start, row_end + 1):
+            ranges.append(model.cell.between(row * GRID_COLS + col_start, row * GRID_COLS + col_end))
+    return or_(*ranges)
+
+def _point(model):
+    return func.ST_SetSRID(func.ST_MakePoint(model.longitude, model.latitude), 4326)
+
+def bbox_filter(model, bbox, postgis=False):
+    """bbox için SQLAlchemy filtre ifadesi"""
+    min_lon, min_lat, max_lon, max_lat = bbox
+    if postgis:
+        envelopes = [
+            _point(model).op('&&')(func.ST_MakeEnvelope(range_min, min_lat, range_max, max_lat, 4326))
+            for range_min, range_max in _lon_ranges(min_lon, max_lon)
+        ]
+        return or_(*envelopes)
+
+    exact = and_(
+        model.latitude.between(min_lat, max_lat),
+        or_(*[model.longitude.between(range_min, range_max) for range_min, range_max in _lon_ranges(min_lon, max_lon)])
+    )
+    cells = _cell_filter(model, min_lon, min_lat, max_lon, max_lat)
+    return and_(cells, exact) if cells is not None else exact
+
+def radius_filter(model, latitude, longitude, radius_km, postgis=False):
+    """Merkezden radius_km içindeki kayıtlar için filtre ifadesi"""
+    box = bbox_filter(model, radius_bbox(latitude, longitude, radius_km), postgis)
+    if postgis:
+        center = func.ST_SetSRID(func.ST_MakePoint(longitude, latitude), 4326)
+        return and_(box, func.ST_DistanceSphere(_point(model), center) <= radius_km * 1000)
+
+    # Eşdikdörtgen yaklaşımı: trigonometri gerektirmediği için SQLite'ta da çalışır
+    cos_lat = math.cos(math.radians(latitude))
+    dlon = func.abs(model.longitude - longitude)
+    # Tarih değiştirme çizgisinin iki yakası arasındaki fark
+    dlon = case((dlon > 180, 360 - dlon), else_=dlon)
+    dy = (model.latitude - latitude) * KM_PER_DEG
+    dx = dlon * KM_PER_DEG * cos_lat
+    return and_(box, dx * dx + dy * dy <= radius_km * radius_km)
+
+def apply_spatial_filters(query, model, args, postgis=False):
+    """İstek parametrelerindeki bbox / lat-lon-radius_km filtrelerini uygula"""
+    bbox = args.get('bbox')
+    if bbox:
+        query = query.filter(bbox_filter(model, parse_bbox(bbox), postgis))
+
+    lat, lon, radius = args.get('lat'), args.get('lon'), args.get('radius_km')
+    if lat or lon or radius:
+        try:
+            lat, lon, radius = float(lat), float(lon), float(radius)
+        except (TypeError, ValueError):
+            raise InvalidSpatialFilter("lat, lon ve radius_km birlikte verilmelidir")
+        query = query.filter(radius_filter(model, lat, lon, radius, postgis))
+
+    return query
+
+_postgis_enabled = None
+
+def postgis_enabled(engine):
+    """Veritabanında PostGIS eklentisi var mı (sonuç önbelleğe alınır)"""
+    global _postgis_enabled
+    if _postgis_enabled is None:
+        if engine.dialect.name != 'postgresql':
+            _postgis_enabled = False
+        else:
+            with engine.connect() as conn:
+                _postgis_enabled = conn.execute(
+                    text("SELECT 1 FROM pg_extension WHERE extname = 'postgis'")
+                ).scalar() is not None
+    return _postgis_enabled
@@ -0,0 +1,636 @@
+# ingest.py
+import csv
+from datetime import datetime, timedelta, timezone
+import os
+import time
+import uuid
+from dotenv import load_dotenv
+from sqlalchemy import func
+from models import Earthquake, Fire, TsunamiAlert, IngestStatus, Session
+from bulk import bulk_upsert
+import upstream
+from cache import result_cache
+from tiles import tile_cache
+from snapshot import earthquake_snapshot, fire_snapshot
+from partitions import fire_conflict_columns
+from events import event_bus
+from metrics import record_parse, record_write
+from geo import cell_id
+import kandilli
+from dedup import assign_canonical
+
+# .env dosyasını yükle
+load_dotenv()
+
+# API endpoint'leri (ölçüm / test için ortam değişkeniyle yerel bir sunucuya yönlendirilebilir)
+KANDILLI_URL = os.getenv('KANDILLI_URL', "http://www.koeri.boun.edu.tr/scripts/lst0.asp")
+EMSC_API = os.getenv('EMSC_API', "https://www.seismicportal.eu/fdsnws/event/1/query")
+
+# Yangın API endpoint'leri
+NASA_FIRMS_API = os.getenv('NASA_FIRMS_API', "https://firms.modaps.eosdis.nasa.gov/api/active_fire/csv")
+# NASA FIRMS için API key gerekli (ücretsiz kayıt)
+NASA_FIRMS_KEY = os.getenv('NASA_FIRMS_KEY', 'demo_key')  # Demo key sınırlı kullanım için
+
+# Tsunami API endpoint'leri
+NOAA_TSUNAMI_API = os.getenv('NOAA_TSUNAMI_API', "https://www.tsunami.gov/events/xml/PHEBxml.xml")
+USGS_EARTHQUAKE_API = os.getenv('USGS_EARTHQUAKE_API', "https://earthquake.usgs.gov/earthquakes/feed/v1.0/summary/significant_hour.geojson")
+
+# Kaynakların varsayılan çekme parametreleri (zamanlayıcı tarafından kullanılır)
+EMSC_LIMIT = int(os.getenv('EMSC_LIMIT', '100'))
+FIRMS_REGION = os.getenv('FIRMS_REGION', 'Global')
+FIRMS_DAYS = int(os.getenv('FIRMS_DAYS', '1'))
+
+# Artımlı çekmede geç yayımlanan olayları kaçırmamak için su seviyesinin bu kadar
+# gerisinden başlanır (sn); aradaki mevcut kayıtlar toplu yazmada atlanır
+WATERMARK_OVERLAP = int(os.getenv('WATERMARK_OVERLAP', '300'))
+
+# FIRMS CSV'si veritabanına bu boyutta partiler halinde yazılır
+FIRMS_BATCH_SIZE = int(os.getenv('FIRMS_BATCH_SIZE', '5000'))
+
+# VIIRS güven seviyeleri (low/nominal/high) için sayısal karşılıklar
+FIRMS_CONFIDENCE_LEVELS = {'l': 30, 'low': 30, 'n': 60, 'nominal': 60, 'h': 90, 'high': 90}
+
+# FIRMS uydu kodları
+FIRMS_SATELLITES = {'T': 'Terra', 'A': 'Aqua', 'N': 'NPP', 'N20': 'NOAA-20', 'N21': 'NOAA-21'}
+
+# Mevcut tsunami uyarılarında güncellenecek kolonlar
+TSUNAMI_UPDATE_COLUMNS = ['alert_level', 'status', 'affected_regions', 'message', 'magnitude', 'updated_at']
+
+def record_ingest_status(source, success, count=0, error=None):
+    """Kaynağın son çekme sonucunu ve devre kesici durumunu IngestStatus tablosuna yaz
+
+    Başarısız denemelerde stale_since (ilk başarısız deneme) işaretlenir; API
+    kayıtları veritabanından sunmaya devam eder ve yanıtlarda bu alanı döndürür.
+    """
+    session = Session()
+    try:
+        now = datetime.utcnow()
+        status = session.query(IngestStatus).get(source)
+        if not status:
+            status = IngestStatus(source=source)
+            session.add(status)
+        
+        status.last_attempt_at = now
+        if success:
+            status.last_success_at = now
+            status.last_count = count
+            status.last_error = None
+            status.stale_since = None
+        else:
+            status.last_error = str(error)[:500] if error else 'Bilinmeyen hata'
+            if status.stale_since is None:
+                status.stale_since = now
+        
+        # Devre kesici bu süreçte tutulur; diğer süreçler (API işçileri) durumu buradan okur
+        breaker = upstream.breaker_status().get(source)
+        if breaker:
+            status.breaker_state = breaker['state']
+            status.breaker_retry_at = datetime.fromisoformat(breaker['retry_at']) if breaker['retry_at'] else None
+        
+        session.commit()
+    except Exception as e:
+        print(f"Çekme durumu kaydedilirken hata: {str(e)}")
+        session.rollback()
+    finally:
+        session.close()
+
+def get_ingest_status(sources=None):
+    """Kaynakların son çekme durumlarını sözlük olarak getir"""
+    session = Session()
+    try:
+        query = session.query(IngestStatus)
+        if sources:
+            query = query.filter(IngestStatus.source.in_(sources))
+        return {status.source: {
+            'last_success_at': status.last_success_at.isoformat() if status.last_success_at else None,
+            'last_attempt_at': status.last_attempt_at.isoformat() if status.last_attempt_at else None,
+            'last_error': status.last_error,
+            'last_count': status.last_count,
+            'data_version': status.data_version or 0,
+            'stale_since': status.stale_since.isoformat() if status.stale_since else None,
+            'breaker': {
+                'state': status.breaker_state or 'closed',
+                'retry_at': status.breaker_retry_at.isoformat() if status.breaker_retry_at else None
+            },
+            'watermark': {
+                'time': status.watermark_time.isoformat(),
+                'id': status.watermark_id
+            } if status.watermark_time else None
+        } for status in query.all()}
+    finally:
+        session.close()
+
+def get_watermark(source):
+    """Kaynağın su seviyesini getir: {'time', 'id', 'updated'} veya None"""
+    session = Session()
+    try:
+        status = session.query(IngestStatus).get(source)
+        if not status or not status.watermark_time:
+            return None
+        return {
+            'time': status.watermark_time,
+            'id': status.watermark_id,
+            'updated': status.watermark_updated
+        }
+    finally:
+        session.close()
+
+def update_watermark(source, time, id, updated=None):
+    """Kaydedilen en yeni olayı su seviyesi olarak yaz (yalnızca ileri taşınır)"""
+    session = Session()
+    try:
+        status = session.query(IngestStatus).get(source)
+        if not status:
+            status = IngestStatus(source=source)
+            session.add(status)
+        
+        if status.watermark_time is None or time >= status.watermark_time:
+            status.watermark_time = time
+            status.watermark_id = id
+        if updated and (status.watermark_updated is None or updated > status.watermark_updated):
+            status.watermark_updated = updated
+        
+        session.commit()
+    except Exception as e:
+        print(f"Su seviyesi kaydedilirken hata: {str(e)}")
+        session.rollback()
+    finally:
+        session.close()
+
+def bump_data_version(session, source):
+    """Kaynağın veri sürümünü artır; kayıtları yazan transaction içinde, commit'ten önce çağrılır
+
+    Sürüm ETag'lere girer ve diğer süreçlere değişikliği bildirir (bkz. conditional.py).
+    """
+    updated = session.query(IngestStatus).filter_by(source=source).update(
+        {IngestStatus.data_version: func.coalesce(IngestStatus.data_version, 0) + 1},
+        synchronize_session=False
+    )
+    if not updated:
+        session.add(IngestStatus(source=source, data_version=1))
+
+def watermark_since(watermark):
+    """Artımlı çekmenin başlangıç zamanı (su seviyesi - WATERMARK_OVERLAP)"""
+    if not watermark:
+        return None
+    return watermark['time'] - timedelta(seconds=WATERMARK_OVERLAP)
+
+def parse_emsc_time(value):
+    """EMSC zamanını (ISO metin veya epoch ms) naive UTC datetime'a çevir"""
+    if value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return datetime.fromtimestamp(value / 1000.0)
+    parsed = datetime.fromisoformat(value)
+    if parsed.tzinfo:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+def ingested_count(result):
+    """Çekme fonksiyonunun sonucundan işlenen kayıt sayısını getir"""
+    if isinstance(result, int):
+        return result
+    return len(result or [])
+
+def get_freshness(sources):
+    """Yanıtlardaki tazelik bilgisi: son başarılı güncelleme ve (çekme başarısızsa) bayatlık başlangıcı"""
+    status = get_ingest_status(sources)
+    return {
+        'last_updated': {source: status.get(source, {}).get('last_success_at') for source in sources},
+        'stale_since': {source: status.get(source, {}).get('stale_since') for source in sources}
+    }
+
+def save_to_database(earthquakes, source):
+    """Deprem verilerini veritabanına toplu olarak kaydet (mevcut event_id'ler atlanır)"""
+    session = Session()
+    try:
+        now = datetime.utcnow()
+        rows = [{
+            'id': str(uuid.uuid4()),
+            'event_id': eq['id'],
+            'source': source,
+            'date': datetime.fromisoformat(eq['date']),
+            'latitude': eq['latitude'],
+            'longitude': eq['longitude'],
+            'depth': eq['depth'],
+            'magnitude': eq['magnitude'],
+            'location': eq['location'],
+            'cell': cell_id(eq['latitude'], eq['longitude']),
+            'created_at': now,
+            'updated_at': now
+        } for eq in earthquakes]
+        
+        # Diğer kaynaklarda kayıtlı aynı depremlere bağla
+        linked = assign_canonical(session, rows, source)
+        
+        started = time.perf_counter()
+        stats = bulk_upsert(session, Earthquake, rows, 'event_id')
+        if stats['inserted']:
+            bump_data_version(session, source)
+        session.commit()
+        record_write(source, stats, time.perf_counter() - started)
+        print(f"{source}: {stats['inserted']} yeni deprem, {stats['skipped']} atlandı, {linked} eşleşme")
+        if stats['inserted']:
+            result_cache.invalidate_source(source)
+            tile_cache.invalidate_layer('earthquakes')
+            earthquake_snapshot.update()
+            event_bus.publish_committed(session, 'earthquakes', source, now)
+        return stats
+    except Exception as e:
+        print(f"Veritabanına kaydetme hatası: {str(e)}")
+        session.rollback()
+        return None
+    finally:
+        session.close()
+
+def fetch_and_save_kandilli_data():
+    """Kandilli'den deprem verilerini çek ve PostgreSQL'e kaydet"""
+    try:
+        since = watermark_since(get_watermark('Kandilli'))
+        response = upstream.conditional_get(KANDILLI_URL, source='Kandilli')
+        if response is None:
+            # Sayfa son çekmeden bu yana değişmedi
+            return []
+        response.encoding = 'utf-8'
+        
+        if response.status_code == 200:
+            started = time.perf_counter()
+            earthquakes = kandilli.parse_page(response.text, since)
+            record_parse('Kandilli', len(earthquakes), time.perf_counter() - started)
+            
+            # Veritabanına kaydet
+            if earthquakes:
+                if not save_to_database(earthquakes, 'Kandilli'):
+                    raise RuntimeError("Kandilli verisi veritabanına kaydedilemedi")
+                newest = max(earthquakes, key=lambda eq: eq['date'])
+                update_watermark('Kandilli', datetime.fromisoformat(newest['date']), newest['id'])
+            upstream.mark_processed(response)
+            return earthquakes
+    except Exception as e:
+        print(f"Kandilli verisi çekilirken hata: {str(e)}")
+        raise
+    return []
+
+def parse_emsc_features(data):
+    """EMSC GeoJSON yanıtındaki olayları ayrıştır; dönüş: (depremler, en son lastupdate)"""
+    earthquakes = []
+    last_update = None
+    for feature in data.get('features', []):
+        try:
+            props = feature['properties']
+            coords = feature['geometry']['coordinates']
+            event_id = f"emsc_{feature['id']}"
+            
+            earthquake = {
+                'id': event_id,
+                'date': parse_emsc_time(props['time']).isoformat(),
+                'latitude': coords[1],
+                'longitude': coords[0],
+                'depth': coords[2],
+                'magnitude': props.get('mag', 0),
+                'location': props.get('place', 'Unknown')
+            }
+            earthquakes.append(earthquake)
+            
+            updated = parse_emsc_time(props.get('lastupdate'))
+            if updated and (last_update is None or updated > last_update):
+                last_update = updated
+        except Exception as e:
+            print(f"EMSC verisi işlenirken hata: {str(e)}")
+            continue
+    return earthquakes, last_update
+
+def save_emsc_page(response):
+    """EMSC yanıtını ayrıştırıp kaydet ve su seviyesini ilerlet; dönüş: (depremler, yanıttaki olay sayısı)"""
+    started = time.perf_counter()
+    data = response.json()
+    earthquakes, last_update = parse_emsc_features(data)
+    record_parse('EMSC', len(earthquakes), time.perf_counter() - started)
+    
+    # Veritabanına kaydet
+    if earthquakes:
+        if not save_to_database(earthquakes, 'EMSC'):
+            raise RuntimeError("EMSC verisi veritabanına kaydedilemedi")
+        newest = max(earthquakes, key=lambda eq: eq['date'])
+        update_watermark('EMSC', datetime.fromisoformat(newest['date']), newest['id'], last_update)
+    upstream.mark_processed(response)
+    return earthquakes, len(data.get('features', []))
+
+def fetch_and_save_emsc_data(min_magnitude=0, limit=100):
+    """EMSC'den deprem verilerini çek ve PostgreSQL'e kaydet"""
+    try:
+        params = {
+            'format': 'json',
+            'limit': limit,
+            'minmag': min_magnitude,
+            'orderby': 'time-desc'
+        }
+        
+        watermark = get_watermark('EMSC')
+        if not watermark:
+            response = upstream.conditional_get(EMSC_API, params=params, source='EMSC')
+            # 204: FDSN servisi yeni olay olmadığını bildirdi
+            if response is None or response.status_code == 204:
+                return []
+            response.raise_for_status()
+            return save_emsc_page(response)[0]
+        
+        # Yalnızca su seviyesinden (WATERMARK_OVERLAP gerisinden) sonraki olaylar, eskiden
+        # yeniye. updatedafter kullanılmaz: lastupdate'i kayıtlı en büyük değerden eski olan
+        # yeni olayları da eler. Sayfa dolu gelirse sonraki sayfa sayfanın en yeni olayından
+        # başlar; aksi halde örtüşme penceresinde limit kadar olay varken su seviyesi ilerlemez.
+        params['orderby'] = 'time-asc'
+        since = watermark_since(watermark)
+        earthquakes = []
+        while True:
+            params['starttime'] = since.isoformat()
+            # Parametreler her çekmede değiştiği için koşullu istek kullanılmaz
+            response = upstream.get(EMSC_API, params=params, source='EMSC')
+            if response.status_code == 204:
+                break
+            response.raise_for_status()
+            page, count = save_emsc_page(response)
+            earthquakes.extend(page)
+            if count < limit or not page:
+                break
+            newest = max(datetime.fromisoformat(eq['date']) for eq in page)
+            if newest <= since:
+                # Sayfadaki tüm olaylar aynı anda; ilerlenemez
+                break
+            since = newest
+        return earthquakes
+    except Exception as e:
+        print(f"EMSC verisi çekilirken hata: {str(e)}")
+        raise
+
+def save_fires_to_database(fires, source):
+    """Yangın verilerini veritabanına toplu olarak kaydet (mevcut fire_id'ler atlanır)"""
+    session = Session()
+    try:
+        now = datetime.utcnow()
+        rows = [{
+            'id': str(uuid.uuid4()),
+            'fire_id': fire['id'],
+            'source': source,
+            'date': datetime.fromisoformat(fire['date']),
+            'latitude': fire['latitude'],
+            'longitude': fire['longitude'],
+            'brightness': fire.get('brightness', 0),
+            'confidence': fire.get('confidence', 0),
+            'frp': fire.get('frp', 0),
+            'scan': fire.get('scan', 0),
+            'track': fire.get('track', 0),
+            'satellite': fire.get('satellite', 'Unknown'),
+            'instrument': fire.get('instrument', 'Unknown'),
+            'version': fire.get('version', '1.0'),
+            'location': fire.get('location', 'Unknown'),
+            'cell': cell_id(fire['latitude'], fire['longitude']),
+            'created_at': now,
+            'updated_at': now
+        } for fire in fires]
+        
+        started = time.perf_counter()
+        stats = bulk_upsert(session, Fire, rows, 'fire_id', conflict_columns=fire_conflict_columns(session))
+        if stats['inserted']:
+            bump_data_version(session, source)
+        session.commit()
+        record_write(source, stats, time.perf_counter() - started)
+        print(f"{source}: {stats['inserted']} yeni yangın, {stats['skipped']} atlandı")
+        if stats['inserted']:
+            result_cache.invalidate_source(source)
+            tile_cache.invalidate_layer('fires')
+            fire_snapshot.update()
+            event_bus.publish_committed(session, 'fires', source, now)
+        return stats
+    except Exception as e:
+        print(f"Yangın verilerini veritabanına kaydetme hatası: {str(e)}")
+        session.rollback()
+        return None
+    finally:
+        session.close()
+
+def parse_firms_row(row, id_prefix, instrument):
+    """FIRMS CSV satırını (başlık adlarıyla) yangın kaydına dönüştür"""
+    # Tarih formatını düzenle
+    acq_date = row['acq_date']  # YYYY-MM-DD
+    acq_time = row['acq_time'].zfill(4)  # HHMM
+    fire_date = datetime.strptime(f"{acq_date} {acq_time}", '%Y-%m-%d %H%M')
+    
+    # MODIS güven değeri sayısal (0-100), VIIRS ise l/n/h harfleriyle gelir
+    confidence = (row.get('confidence') or '0').strip()
+    if confidence.isdigit():
+        confidence = int(confidence)
+    else:
+        confidence = FIRMS_CONFIDENCE_LEVELS.get(confidence.lower(), 0)
+    
+    # MODIS 'brightness', VIIRS 'bright_ti4' kolonunu kullanır
+    brightness = row.get('brightness') or row.get('bright_ti4')
+    satellite = row.get('satellite', '')
+    
+    return {
+        'id': f"{id_prefix}_{row['latitude']}_{row['longitude']}_{acq_date}_{acq_time}",
+        'date': fire_date.isoformat(),
+        'latitude': float(row['latitude']),
+        'longitude': float(row['longitude']),
+        'brightness': float(brightness) if brightness else 0,
+        'confidence': confidence,
+        'frp': float(row['frp']) if row.get('frp') else 0,
+        'scan': float(row['scan']) if row.get('scan') else 0,
+        'track': float(row['track']) if row.get('track') else 0,
+        'satellite': FIRMS_SATELLITES.get(satellite, satellite or 'Unknown'),
+        'instrument': row.get('instrument') or instrument,
+        'version': row.get('version') or 'NRT',
+        'location': f"Lat: {row['latitude']}, Lon: {row['longitude']}"
+    }
+
+def stream_firms_csv(url, source, id_prefix, instrument, batch_size=None):
+    """FIRMS CSV'sini akış halinde oku ve sabit boyutlu partiler halinde kaydet
+
+    Yanıt gövdesi satır satır okunur, bellekte en fazla bir parti tutulur.
+    Dönüş: işlenen kayıt sayısı
+    """
+    batch_size = batch_size or FIRMS_BATCH_SIZE
+    total = 0
+    # Gövde satır satır okunduğundan ayrıştırma süresi yalnızca satır dönüşümlerinin toplamıdır
+    parse_seconds = 0.0
+    
+    response = upstream.conditional_get(url, stream=True, source=source)
+    if response is None:
+        # FIRMS dosyası son çekmeden bu yana değişmedi
+        return 0
+    
+    with response:
+        response.encoding = response.encoding or 'utf-8'
+        
+        reader = csv.DictReader(response.iter_lines(decode_unicode=True))
+        if reader.fieldnames is None:
+            return 0
+        if 'latitude' not in reader.fieldnames or 'acq_date' not in reader.fieldnames:
+            # FIRMS hatalı anahtar vb. durumlarda CSV yerine düz metin döner
+            raise ValueError(f"Beklenmeyen FIRMS yanıtı: {','.join(reader.fieldnames)[:200]}")
+        
+        batch = []
+        for row in reader:
+            started = time.perf_counter()
+            try:
+                batch.append(parse_firms_row(row, id_prefix, instrument))
+            except Exception as e:
+                print(f"{source} satır işlenirken hata: {str(e)}")
+                continue
+            finally:
+                parse_seconds += time.perf_counter() - started
+            
+            if len(batch) >= batch_size:
+                if not save_fires_to_database(batch, source):
+                    raise RuntimeError(f"{source} verisi veritabanına kaydedilemedi")
+                total += len(batch)
+                batch = []
+        
+        # Kalan kayıtları kaydet
+        if batch:
+            if not save_fires_to_database(batch, source):
+                raise RuntimeError(f"{source} verisi veritabanına kaydedilemedi")
+            total += len(batch)
+    
+    record_parse(source, total, parse_seconds)
+    upstream.mark_processed(response)
+    return total
+
+def fetch_and_save_nasa_firms_data(region='Global', days=1):
+    """NASA FIRMS'den yangın verilerini çek ve veritabanına kaydet (işlenen kayıt sayısını döner)"""
+    try:
+        # NASA FIRMS API - MODIS ve VIIRS aktif yangın verileri
+        # Ücretsiz demo key ile sınırlı kullanım
+        url = f"{NASA_FIRMS_API}/{NASA_FIRMS_KEY}/MODIS_NRT/{region}/{days}"
+        return stream_firms_csv(url, 'NASA_FIRMS_MODIS', 'nasa_modis', 'MODIS')
+    except Exception as e:
+        print(f"NASA FIRMS verisi çekilirken hata: {str(e)}")
+        raise
+
+def fetch_and_save_nasa_viirs_data(region='Global', days=1):
+    """NASA FIRMS VIIRS'den yangın verilerini çek ve veritabanına kaydet (işlenen kayıt sayısını döner)"""
+    try:
+        # VIIRS yangın verileri - daha yüksek çözünürlük
+        url = f"{NASA_FIRMS_API}/{NASA_FIRMS_KEY}/VIIRS_SNPP_NRT/{region}/{days}"
+        return stream_firms_csv(url, 'NASA_FIRMS_VIIRS', 'nasa_viirs', 'VIIRS')
+    except Exception as e:
+        print(f"NASA VIIRS verisi çekilirken hata: {str(e)}")
+        raise
+
+def save_tsunami_alerts_to_database(alerts, source):
+    """Tsunami uyarılarını veritabanına toplu olarak kaydet (mevcut uyarıların durumu güncellenir)"""
+    session = Session()
+    try:
+        now = datetime.utcnow()
+        rows = [{
+            'id': str(uuid.uuid4()),
+            'alert_id': alert['id'],
+            'source': source,
+            'date': datetime.fromisoformat(alert['date']),
+            'latitude': alert['latitude'],
+            'longitude': alert['longitude'],
+            'magnitude': alert.get('magnitude', 0),
+            'depth': alert.get('depth', 0),
+            'alert_level': alert.get('alert_level', 'Unknown'),
+            'status': alert.get('status', 'Active'),
+            'affected_regions': alert.get('affected_regions', ''),
+            'message': alert.get('message', ''),
+            'location': alert.get('location', 'Unknown'),
+            'cell': cell_id(alert['latitude'], alert['longitude']),
+            'created_at': now,
+            'updated_at': now
+        } for alert in alerts]
+        
+        started = time.perf_counter()
+        stats = bulk_upsert(session, TsunamiAlert, rows, 'alert_id', update_columns=TSUNAMI_UPDATE_COLUMNS)
+        if stats['inserted'] or stats['updated']:
+            bump_data_version(session, source)
+        session.commit()
+        record_write(source, stats, time.perf_counter() - started)
+        print(f"{source}: {stats['inserted']} yeni tsunami uyarısı, {stats['updated']} güncellendi")
+        if stats['inserted'] or stats['updated']:
+            result_cache.invalidate_source(source)
+            tile_cache.invalidate_layer('tsunami')
+        if stats['inserted']:
+            event_bus.publish_committed(session, 'tsunami', source, now)
+        return stats
+    except Exception as e:
+        print(f"Tsunami uyarılarını veritabanına kaydetme hatası: {str(e)}")
+        session.rollback()
+        return None
+    finally:
+        session.close()
+
+def fetch_and_save_usgs_tsunami_data():
+    """USGS'den tsunami potansiyeli olan depremleri çek"""
+    try:
+        # USGS Significant Earthquakes (son 24 saat)
+        response = upstream.conditional_get(USGS_EARTHQUAKE_API, source='USGS')
+        if response is None:
+            return []
+        
+        if response.status_code == 200:
+            started = time.perf_counter()
+            data = response.json()
+            alerts = []
+            
+            for feature in data.get('features', []):
+                try:
+                    props = feature['properties']
+                    coords = feature['geometry']['coordinates']
+                    
+                    # Tsunami potansiyeli kontrolü (magnitude >= 6.0 ve deniz/kıyı yakını)
+                    magnitude = props.get('mag', 0)
+                    tsunami = props.get('tsunami', 0)
+                    
+                    if magnitude >= 6.0 or tsunami == 1:
+                        alert_id = f"usgs_tsunami_{feature['id']}"
+                        
+                        # Alert level belirleme
+                        alert_level = "Watch"
+                        if magnitude >= 7.0:
+                            alert_level = "Warning"
+                        elif magnitude >= 8.0:
+                            alert_level = "Major Warning"
+                        
+                        status = "Active" if tsunami == 1 else "Potential"
+                        
+                        alert = {
+                            'id': alert_id,
+                            'date': datetime.fromtimestamp(props['time'] / 1000.0).isoformat(),
+                            'latitude': coords[1],
+                            'longitude': coords[0],
+                            'magnitude': magnitude,
+                            'depth': coords[2] if len(coords) > 2 else 0,
+                            'alert_level': alert_level,
+                            'status': status,
+                            'affected_regions': props.get('place', 'Unknown'),
+                            'message': f"Magnitude {magnitude} earthquake detected. Tsunami {status.lower()}.",
+                            'location': props.get('place', 'Unknown')
+                        }
+                        alerts.append(alert)
+                        
+                except Exception as e:
+                    print(f"USGS tsunami verisi işlenirken hata: {str(e)}")
+                    continue
+            record_parse('USGS', len(alerts), time.perf_counter() - started)
+            
+            # Veritabanına kaydet
+            if alerts and not save_tsunami_alerts_to_database(alerts, 'USGS'):
+                raise RuntimeError("USGS tsunami verisi veritabanına kaydedilemedi")
+            upstream.mark_processed(response)
+            return alerts
+            
+    except Exception as e:
+        print(f"USGS tsunami verisi çekilirken hata: {str(e)}")
+        raise
+    return []
+
+# Kaynak adı -> (çekme fonksiyonu, parametreler, varsayılan yenileme aralığı sn)
+INGEST_SOURCES = {
+    'Kandilli': (fetch_and_save_kandilli_data, {}, 300),
+    'EMSC': (fetch_and_save_emsc_data, {'limit': EMSC_LIMIT}, 300),
+    'NASA_FIRMS_MODIS': (fetch_and_save_nasa_firms_data, {'region': FIRMS_REGION, 'days': FIRMS_DAYS}, 900),
+    'NASA_FIRMS_VIIRS': (fetch_and_save_nasa_viirs_data, {'region': FIRMS_REGION, 'days': FIRMS_DAYS}, 900),
+    'USGS': (fetch_and_save_usgs_tsunami_data, {}, 300)
+}
@@ -0,0 +1,112 @@
+# kandilli.py
+"""Kandilli lst0.asp sayfası için sabit genişlikli ayrıştırıcı
+
+Sayfa tek bir <pre> bloğundan oluşur. Başlığın altındaki çizgi satırı
+(---------- -------- ...) kolonların başlangıç konumlarını verir:
+
+    Tarih      Saat      Enlem(N)  Boylam(E) Derinlik(km)  MD   ML   Mw    Yer         Çözüm Niteliği
+    2024.05.01 10:12:33  38.1234   27.1234        7.0      -.-  1.6  -.-   ... (IZMIR)   İlksel
+
+Büyüklük kolonlarında değer yoksa '-.-' yazılır; bu alanlar None olur.
+"""
+import html
+import re
+from datetime import datetime
+
+# Çizgi satırı bulunamazsa kullanılan kolon aralıkları:
+# tarih, saat, enlem, boylam, derinlik, MD/ML/Mw, yer, çözüm niteliği
+DEFAULT_COLUMNS = [(0, 11), (11, 21), (21, 31), (31, 41), (41, 55), (55, 71), (71, 121), (121, None)]
+
+# Kayıtta magnitude alanına yazılacak büyüklük türünün öncelik sırası
+MAGNITUDE_PREFERENCE = ('ml', 'mw', 'md')
+
+_PRE_OPEN = re.compile(r'<pre[^>]*>', re.I)
+_PRE_CLOSE = re.compile(r'</pre>', re.I)
+_RULE = re.compile(r'-+')
+
+def extract_pre(page):
+    """Sayfadaki <pre> bloğunun metnini getir (yoksa None)"""
+    opening = _PRE_OPEN.search(page)
+    if not opening:
+        return None
+    end = page.find('</pre>', opening.end())
+    if end < 0:
+        closing = _PRE_CLOSE.search(page, opening.end())
+        end = closing.start() if closing else len(page)
+    text = page[opening.end():end]
+    return html.unescape(text) if '&' in text else text
+
+def column_spans(rule_line):
+    """Çizgi satırındaki tire gruplarından kolon aralıklarını çıkar"""
+    starts = [match.start() for match in _RULE.finditer(rule_line)]
+    if len(starts) != len(DEFAULT_COLUMNS):
+        return DEFAULT_COLUMNS
+    return list(zip(starts, starts[1:] + [None]))
+
+def _magnitude(value):
+    return None if value == '-.-' else float(value)
+
+def parse_line(line, columns=DEFAULT_COLUMNS):
+    """Tek satırı tipli kayda çevir (veri satırı değilse None)"""
+    if len(line) < 20 or line[4] != '.' or line[13] != ':':
+        return None
+    fields = [line[start:end].strip() for start, end in columns]
+    date_str, time_str, latitude, longitude, depth, magnitudes, location, quality = fields
+
+    date = datetime(
+        int(date_str[0:4]), int(date_str[5:7]), int(date_str[8:10]),
+        int(time_str[0:2]), int(time_str[3:5]), int(time_str[6:8])
+    )
+    md, ml, mw = [_magnitude(value) for value in magnitudes.split()]
+    record = {
+        'id': f"kandilli_{date.timestamp()}",
+        'date': date.isoformat(),
+        'latitude': float(latitude),
+        'longitude': float(longitude),
+        'depth': float(depth),
+        'md': md,
+        'ml': ml,
+        'mw': mw,
+        'magnitude': None,
+        'location': location,
+        'quality': quality
+    }
+    for name in MAGNITUDE_PREFERENCE:
+        if record[name] is not None:
+            record['magnitude'] = record[name]
+            break
+    return record
+
+def parse_page(page, since=None):
+    """Sayfadaki depremleri yeniden eskiye kayıt listesi olarak getir
+
+    since verilirse ondan eski ilk satırda durulur (satırlar yeniden eskiye sıralıdır).
+    """
+    text = extract_pre(page)
+    if text is None:
+        return []
+
+    lines = text.split('\n')
+    columns = DEFAULT_COLUMNS
+    start = 6
+    for index, line in enumerate(lines[:20]):
+        if line.startswith('----------'):
+            columns = column_spans(line.rstrip())
+            start = index + 1
+            break
+
+    # ISO metinleri kronolojik sırada karşılaştırılabilir
+    since = since.isoformat() if since else None
+    earthquakes = []
+    for line in lines[start:]:
+        try:
+            record = parse_line(line.rstrip('\r'), columns)
+        except Exception as e:
+            print(f"Satır işlenirken hata: {str(e)}")
+            continue
+        if record is None:
+            continue
+        if since and record['date'] < since:
+            break
+        earthquakes.append(record)
+    return earthquakes
@@ -0,0 +1,230 @@
+# leader.py
+"""Veri çekme liderliği: birden fazla süreç arasında tek yazıcı
+
+gunicorn ile N işçi (veya birden fazla scheduler.py) çalışırken yalnızca
+kilidi alan süreç zamanlayıcıyı çalıştırır ve (SCHEMA_AUTO_MIGRATE açıksa)
+şema göçlerini uygular; diğerleri yalnızca okuma yapar ve
+LEADER_RETRY_INTERVAL aralıkla kilidi almayı dener. Lider süreç ölürse kilit
+serbest kalır ve diğerlerinden biri devralır.
+
+PostgreSQL'de oturum düzeyinde advisory lock (pg_try_advisory_lock) ayrı bir
+bağlantıda tutulur; bağlantı koparsa kilit kaybedilmiş sayılır ve liderlik
+bırakılır. Diğer veritabanlarında (SQLite) veritabanı dosyasının yanındaki
+kilit dosyası üzerinde işletim sistemi kilidi kullanılır.
+"""
+import os
+import tempfile
+import threading
+from datetime import datetime
+from dotenv import load_dotenv
+from sqlalchemy import text
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+    import msvcrt
+
+# .env dosyasını yükle
+load_dotenv()
+
+# pg_try_advisory_lock anahtarı (aynı veritabanını kullanan başka uygulamalarla çakışmamalı)
+LEADER_LOCK_KEY = int(os.getenv('LEADER_LOCK_KEY', '7265001'))
+# SQLite için kilit dosyası (varsayılan: veritabanı dosyası + .leader.lock)
+LEADER_LOCK_FILE = os.getenv('LEADER_LOCK_FILE')
+# Takipçilerin kilidi yeniden deneme ve liderin kilidi doğrulama aralığı (sn)
+LEADER_RETRY_INTERVAL = float(os.getenv('LEADER_RETRY_INTERVAL', '15'))
+# Lider seçildiğinde bekleyen şema göçlerini uygula (kapalıysa: python migrations.py)
+SCHEMA_AUTO_MIGRATE = os.getenv('SCHEMA_AUTO_MIGRATE', 'true').lower() == 'true'
+
+class AdvisoryLock:
+    """PostgreSQL oturum düzeyinde advisory lock; kilit tutulduğu sürece bağlantı açık kalır"""
+
+    def __init__(self, engine, key=LEADER_LOCK_KEY):
+        self.engine = engine
+        self.key = key
+        self._conn = None
+
+    def __str__(self):
+        return f"pg_advisory_lock({self.key})"
+
+    def acquire(self):
+        # Bağlantı işlem (transaction) içinde beklemesin diye AUTOCOMMIT
+        conn = self.engine.connect().execution_options(isolation_level='AUTOCOMMIT')
+        try:
+            acquired = conn.execute(text('SELECT pg_try_advisory_lock(:key)'), {'key': self.key}).scalar()
+        except Exception:
+            conn.close()
+            raise
+        if acquired:
+            self._conn = conn
+        else:
+            conn.close()
+        return bool(acquired)
+
+    def alive(self):
+        """Kilidi tutan bağlantı hâlâ açık mı"""
+        if self._conn is None:
+            return False
+        try:
+            self._conn.execute(text('SELECT 1'))
+            return True
+        except Exception:
+            self._close()
+            return False
+
+    def release(self):
+        if self._conn is None:
+            return
+        try:
+            self._conn.execute(text('SELECT pg_advisory_unlock(:key)'), {'key': self.key})
+        except Exception:
+            pass
+        self._close()
+
+    def _close(self):
+        try:
+            self._conn.close()
+        except Exception:
+            pass
+        self._conn = None
+
+class FileLock:
+    """Kilit dosyası üzerinde süreç ömrü boyunca tutulan özel kilit (fcntl.flock / msvcrt.locking)"""
+
+    def __init__(self, path):
+        self.path = path
+        self._file = None
+
+    def __str__(self):
+        return self.path
+
+    def acquire(self):
+        f = open(self.path, 'a+')
+        try:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+        except OSError:
+            f.close()
+            return False
+        f.seek(0)
+        f.truncate()
+        f.write(str(os.getpid()))
+        f.flush()
+        self._file = f
+        return True
+
+    def alive(self):
+        return self._file is not None
+
+    def release(self):
+        if self._file is None:
+            return
+        try:
+            if fcntl is not None:
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+            else:
+                self._file.seek(0)
+                msvcrt.locking(self._file.fileno(), msvcrt.LK_UNLCK, 1)
+        except OSError:
+            pass
+        self._file.close()
+        self._file = None
+
+def make_lock(engine):
+    """Veritabanına uygun liderlik kilidi (bağlantı açmaz)"""
+    if engine.dialect.name == 'postgresql':
+        return AdvisoryLock(engine)
+    path = LEADER_LOCK_FILE
+    if not path:
+        database = engine.url.database
+        if database and database != ':memory:':
+            path = os.path.abspath(database) + '.leader.lock'
+        else:
+            path = os.path.join(tempfile.gettempdir(), 'earthquake-ingest.leader.lock')
+    return FileLock(path)
+
+class LeaderElection:
+    """Kilidi arka planda almaya çalışır; alınca on_elected, kaybedince on_lost çağrılır"""
+
+    def __init__(self, lock, on_elected, on_lost=None, interval=LEADER_RETRY_INTERVAL):
+        self.lock = lock
+        self.on_elected = on_elected
+        self.on_lost = on_lost
+        self.interval = interval
+        self.is_leader = False
+        self.since = None
+        self.last_error = None
+        self._stop = threading.Event()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        """Seçim döngüsünü başlat (birden fazla çağrılabilir)"""
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._loop, name='leader-election', daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout=None):
+        """Döngüyü durdur ve lider ise liderliği bırak"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        if self.is_leader:
+            self._step_down()
+        self.lock.release()
+
+    @property
+    def running(self):
+        return self._thread is not None and not self._stop.is_set()
+
+    def _loop(self):
+        while not self._stop.is_set():
+            try:
+                if not self.is_leader:
+                    if self.lock.acquire():
+                        self.is_leader = True
+                        self.since = datetime.utcnow()
+                        print(f"{self.since} - Veri çekme lideri seçildi (pid {os.getpid()}, {self.lock})")
+                        try:
+                            self.on_elected()
+                        except Exception:
+                            # Başlatılamayan lider kilidi bırakır; sonraki turda (başka süreç de) yeniden denenir
+                            self.is_leader = False
+                            self.since = None
+                            self.lock.release()
+                            raise
+                elif not self.lock.alive():
+                    print(f"{datetime.utcnow()} - Liderlik kilidi kaybedildi (pid {os.getpid()})")
+                    self._step_down()
+                self.last_error = None
+            except Exception as e:
+                print(f"Liderlik seçimi hatası: {str(e)}")
+                self.last_error = str(e)
+            self._stop.wait(self.interval)
+
+    def _step_down(self):
+        self.is_leader = False
+        self.since = None
+        if self.on_lost is not None:
+            try:
+                self.on_lost()
+            except Exception as e:
+                print(f"Liderlik bırakılırken hata: {str(e)}")
+
+    def status(self):
+        return {
+            'leader': self.is_leader,
+            'pid': os.getpid(),
+            'since': self.since.isoformat() if self.since else None,
+            'lock': str(self.lock),
+            'running': self.running,
+            'last_error': self.last_error
+        }
@@ -0,0 +1,207 @@
+# metrics.py
+"""Süreç içi sayaç / histogram metrikleri ve Prometheus metin biçimi
+
+API sürecinde GET /metrics ile, ayrı çalışan süreçlerde (scheduler.py,
+earthquake_service.py) METRICS_PORT tanımlıysa serve() ile yayımlanır.
+"""
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from dotenv import load_dotenv
+
+# .env dosyasını yükle
+load_dotenv()
+
+# Ayrı süreçlerin metrikleri yayımlayacağı port (boşsa yayımlanmaz)
+METRICS_PORT = os.getenv('METRICS_PORT', '')
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# Süre (sn) ve boyut (bayt) histogram sınırları
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def _labels(names, values, extra=None):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+def _number(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+class Counter:
+    """Yalnızca artan sayaç"""
+    type = 'counter'
+
+    def __init__(self, name, help, labelnames=()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, value=1, **labels):
+        key = tuple(str(labels.get(name, '')) for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + value
+
+    def samples(self):
+        with self._lock:
+            values = sorted(self._values.items())
+        for key, value in values:
+            yield f"{self.name}{_labels(self.labelnames, key)} {_number(value)}"
+
+class Histogram:
+    """Sınırlara göre birikimli dağılım, toplam ve sayı"""
+    type = 'histogram'
+
+    def __init__(self, name, help, labelnames=(), buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets) + (float('inf'),)
+        self._values = {}  # etiketler -> [sınır sayaçları, toplam, sayı]
+        self._lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        key = tuple(str(labels.get(name, '')) for name in self.labelnames)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = [[0] * len(self.buckets), 0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    entry[0][i] += 1
+                    break
+            entry[1] += value
+            entry[2] += 1
+
+    def time(self, **labels):
+        """with bloğunun süresini gözlemle"""
+        return _Timer(self, labels)
+
+    def samples(self):
+        with self._lock:
+            values = sorted((key, (list(entry[0]), entry[1], entry[2])) for key, entry in self._values.items())
+        for key, (counts, total, count) in values:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                le = f'le="{_number(bound)}"'
+                yield f"{self.name}_bucket{_labels(self.labelnames, key, le)} {cumulative}"
+            yield f"{self.name}_sum{_labels(self.labelnames, key)} {_number(total)}"
+            yield f"{self.name}_count{_labels(self.labelnames, key)} {count}"
+
+class _Timer:
+    def __init__(self, histogram, labels):
+        self.histogram = histogram
+        self.labels = labels
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.histogram.observe(time.perf_counter() - self.started, **self.labels)
+        return False
+
+class Registry:
+    def __init__(self):
+        self._metrics = []
+
+    def counter(self, name, help, labelnames=()):
+        metric = Counter(name, help, labelnames)
+        self._metrics.append(metric)
+        return metric
+
+    def histogram(self, name, help, labelnames=(), buckets=LATENCY_BUCKETS):
+        metric = Histogram(name, help, labelnames, buckets)
+        self._metrics.append(metric)
+        return metric
+
+    def render(self):
+        """Tüm metrikleri Prometheus metin biçiminde döndür"""
+        lines = []
+        for metric in self._metrics:
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.type}")
+            lines.extend(metric.samples())
+        return '\n'.join(lines) + '\n'
+
+registry = Registry()
+
+# Veri çekme aşamaları
+UPSTREAM_FETCH_SECONDS = registry.histogram(
+    'upstream_fetch_seconds', 'Kaynak isteğinin süresi (akış isteklerinde yanıt başlıklarına kadar)', ['source', 'status'])
+INGEST_PARSE_SECONDS = registry.histogram(
+    'ingest_parse_seconds', 'Kaynak yanıtının kayıtlara dönüştürülme süresi', ['source'])
+INGEST_ROWS_PARSED = registry.counter(
+    'ingest_rows_parsed_total', 'Kaynak yanıtından çıkarılan kayıt sayısı', ['source'])
+INGEST_ROWS_WRITTEN = registry.counter(
+    'ingest_rows_written_total', 'Veritabanına yazma sonucu (inserted / updated / skipped / upserted)', ['source', 'result'])
+INGEST_DB_WRITE_SECONDS = registry.histogram(
+    'ingest_db_write_seconds', 'Bir partinin veritabanına yazılma süresi', ['source'])
+INGEST_RUN_SECONDS = registry.histogram(
+    'ingest_run_seconds', 'Bir kaynağın çekme + işleme + yazma toplam süresi', ['source', 'status'])
+UPSTREAM_RETRY_ATTEMPTS = registry.counter(
+    'upstream_retries_total', 'Geçici hata (bağlantı, zaman aşımı, 5xx, 429) sonrası yapılan yeniden denemeler', ['source'])
+UPSTREAM_SHORT_CIRCUITS = registry.counter(
+    'upstream_short_circuits_total', 'Devre kesici açıkken istek yapılmadan reddedilen çağrılar', ['source'])
+UPSTREAM_BREAKER_TRANSITIONS = registry.counter(
+    'upstream_breaker_transitions_total', 'Devre kesicinin geçtiği durumlar (open / half_open / closed)', ['source', 'state'])
+
+# API
+HTTP_REQUEST_SECONDS = registry.histogram(
+    'http_request_duration_seconds', 'Route bazında istek süresi', ['route', 'method', 'status'])
+HTTP_RESPONSE_BYTES = registry.histogram(
+    'http_response_size_bytes', 'Route bazında yanıt gövdesi boyutu', ['route'], SIZE_BUCKETS)
+
+# Olay akışı (bkz. events.py)
+EVENTS_PUBLISHED = registry.counter(
+    'events_published_total', 'Olay kuyruğuna eklenen kayıt sayısı', ['type'])
+EVENTS_SENT = registry.counter(
+    'events_sent_total', 'SSE bağlantılarına gönderilen (filtre sonrası) kayıt sayısı', ['type'])
+
+def record_parse(source, rows, elapsed):
+    """Ayrıştırma süresini ve çıkarılan kayıt sayısını kaydet"""
+    INGEST_PARSE_SECONDS.observe(elapsed, source=source)
+    INGEST_ROWS_PARSED.inc(rows, source=source)
+
+def record_write(source, stats, elapsed):
+    """Yazma süresini ve sonucunu ({'inserted': .., 'skipped': .., ...}) kaydet"""
+    INGEST_DB_WRITE_SECONDS.observe(elapsed, source=source)
+    for result, count in stats.items():
+        if count:
+            INGEST_ROWS_WRITTEN.inc(count, source=source, result=result)
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split('?', 1)[0] != '/metrics':
+            self.send_error(404)
+            return
+        body = registry.render().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', CONTENT_TYPE)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+def serve(port=None):
+    """Metrikleri arka plan iş parçacığında http://0.0.0.0:<port>/metrics adresinde yayımla"""
+    port = port or METRICS_PORT
+    if not port:
+        return None
+    server = ThreadingHTTPServer(('0.0.0.0', int(port)), _Handler)
+    threading.Thread(target=server.serve_forever, name='metrics', daemon=True).start()
+    print(f"Metrikler yayımlanıyor: http://0.0.0.0:{port}/metrics")
+    return server
@@ -0,0 +1,227 @@
+# migrations.py
+"""Sürümlü şema göçleri
+
+create_all() yalnızca eksik tabloları oluşturur, mevcut tabloları değiştirmez.
+Var olan tablolara yapılan her değişiklik (kolon, indeks vb.) buraya sıradaki
+numarayla eklenir. Uygulanan göçler SchemaVersion tablosunda tutulur. Göçler
+yeni veritabanlarında create_all() ile zaten oluşmuş nesneleri yeniden
+oluşturmaya çalışabileceği için tekrar çalıştırılabilir (idempotent) yazılmalıdır.
+
+İsteğe bağlı göçler (OPT_IN_MIGRATIONS) uzun süren veya tabloyu yeniden
+oluşturan değişikliklerdir; başlangıçtaki otomatik göçlerde yalnızca ilgili
+ortam değişkeni açıksa uygulanır, aksi halde elle çalıştırılır.
+
+Kullanım:
+    python migrations.py                  # bekleyen (isteğe bağlı olmayan) göçleri uygula
+    python migrations.py status           # uygulanan / bekleyen göçleri listele
+    python migrations.py partition-fire   # göç 6: Fire'ı bölümlü tabloya çevir
+"""
+import sys
+import time
+from datetime import datetime
+from sqlalchemy import inspect, select, text
+from models import Earthquake, Fire, TsunamiAlert, IngestStatus, SchemaVersion, engine
+from geo import cell_sql, postgis_enabled
+from partitions import FIRE_PARTITIONING, ensure_partitions, is_partitioned
+
+def _columns(conn, table):
+    return {column['name'] for column in inspect(conn).get_columns(table)}
+
+def _add_columns(conn, model, *names):
+    """Modelde tanımlı kolonlardan tabloda eksik olanları ekle"""
+    table = model.__tablename__
+    existing = _columns(conn, table)
+    for name in names:
+        if name not in existing:
+            column_type = model.__table__.c[name].type.compile(dialect=conn.dialect)
+            conn.execute(text(f'ALTER TABLE "{table}" ADD COLUMN {name} {column_type}'))
+
+def _create_model_indexes(conn, *names):
+    """Modellerde tanımlı indekslerden adı verilenleri (yoksa) oluştur"""
+    for model in (Earthquake, Fire, TsunamiAlert):
+        for index in model.__table__.indexes:
+            if index.name in names:
+                index.create(conn, checkfirst=True)
+
+def add_spatial_cells(conn):
+    """cell kolonunu ekle, mevcut kayıtları doldur, mekânsal indeksleri oluştur"""
+    for model in (Earthquake, Fire, TsunamiAlert):
+        table = model.__tablename__
+        if 'cell' not in _columns(conn, table):
+            conn.execute(text(f'ALTER TABLE "{table}" ADD COLUMN cell INTEGER'))
+            conn.execute(text(
+                f'UPDATE "{table}" SET cell = {cell_sql(dialect=conn.dialect.name)} '
+                f'WHERE latitude IS NOT NULL AND longitude IS NOT NULL'
+            ))
+        conn.execute(text(f'CREATE INDEX IF NOT EXISTS "ix_{table}_cell" ON "{table}" (cell)'))
+
+        if postgis_enabled(engine):
+            # PostGIS varsa nokta ifadesi üzerinde GiST indeksi (bbox && ve ST_DistanceSphere için)
+            conn.execute(text(
+                f'CREATE INDEX IF NOT EXISTS "ix_{table}_geom" ON "{table}" '
+                f'USING gist (ST_SetSRID(ST_MakePoint(longitude, latitude), 4326))'
+            ))
+
+def add_query_indexes(conn):
+    """Sorgu kalıplarına uygun bileşik indeksler: (source, date, id), (magnitude, date), (confidence, frp, date)"""
+    # Sonraki göçlerde eklenen kolonların indeksleri burada oluşturulmamalı
+    _create_model_indexes(
+        conn,
+        'ix_Earthquake_source_date', 'ix_Earthquake_magnitude_date', 'ix_Earthquake_date_id',
+        'ix_Fire_source_date', 'ix_Fire_confidence_frp_date', 'ix_Fire_date_id',
+        'ix_TsunamiAlert_source_date', 'ix_TsunamiAlert_magnitude_date'
+    )
+
+def add_ingest_watermarks(conn):
+    """IngestStatus'a kaynak bazlı artımlı çekme sınırı kolonlarını ekle"""
+    _add_columns(conn, IngestStatus, 'watermark_time', 'watermark_id', 'watermark_updated')
+
+def add_earthquake_canonical_id(conn):
+    """Kaynaklar arası eşleştirme için canonical_id; mevcut kayıtlar kendi kanonik kayıtlarıdır"""
+    _add_columns(conn, Earthquake, 'canonical_id')
+    conn.execute(text('UPDATE "Earthquake" SET canonical_id = id WHERE canonical_id IS NULL'))
+    _create_model_indexes(conn, 'ix_Earthquake_canonical_id')
+
+def add_created_at_indexes(conn):
+    """Anlık görüntünün artımlı yenilenmesi için created_at indeksleri (bkz. snapshot.py)"""
+    _create_model_indexes(conn, 'ix_Earthquake_created_at', 'ix_Fire_created_at')
+
+def partition_fire_table(conn):
+    """PostgreSQL: Fire'ı date üzerinde RANGE bölümlü tabloya çevir (SQLite'ta değişiklik yok)
+
+    Mevcut kayıtlar yeni tabloya kopyalanır; indeks ve kısıtlar kopyalamadan
+    sonra üst tabloda oluşturulur ve tüm bölümlere yayılır. Eski tablo
+    (indeksleri _unpartitioned sonekiyle) Fire_unpartitioned olarak tutulur;
+    kopya kontrol edildikten sonra elle silinir. Kayıt sayıları tutmazsa göç
+    geri alınır.
+    """
+    if conn.dialect.name != 'postgresql' or is_partitioned(conn):
+        return
+
+    conn.execute(text('ALTER TABLE "Fire" RENAME TO "Fire_unpartitioned"'))
+    # İndeks ve kısıt adları tabloyla birlikte değişmez; yenileri aynı adlarla oluşturulacak
+    old_indexes = conn.execute(text(
+        "SELECT indexname FROM pg_indexes WHERE schemaname = current_schema() AND tablename = 'Fire_unpartitioned'"
+    )).scalars().all()
+    for name in old_indexes:
+        conn.execute(text(f'ALTER INDEX "{name}" RENAME TO "{name[:48]}_unpartitioned"'))
+    conn.execute(text('CREATE TABLE "Fire" (LIKE "Fire_unpartitioned" INCLUDING DEFAULTS) PARTITION BY RANGE (date)'))
+    conn.execute(text('ALTER TABLE "Fire" ALTER COLUMN date SET NOT NULL'))
+    conn.execute(text('CREATE TABLE "Fire_default" PARTITION OF "Fire" DEFAULT'))
+
+    oldest = conn.execute(text('SELECT min(date) FROM "Fire_unpartitioned"')).scalar()
+    ensure_partitions(conn, first=oldest)
+
+    # Bölüm anahtarı boş olamaz: tarihi olmayan kayıtlar eklenme zamanıyla taşınır
+    columns = [column['name'] for column in inspect(conn).get_columns('Fire_unpartitioned')]
+    names = ', '.join(f'"{name}"' for name in columns)
+    values = ', '.join('COALESCE(date, created_at, now())' if name == 'date' else f'"{name}"' for name in columns)
+    copied = conn.execute(text(f'INSERT INTO "Fire" ({names}) SELECT {values} FROM "Fire_unpartitioned"')).rowcount
+    original = conn.execute(text('SELECT count(*) FROM "Fire_unpartitioned"')).scalar()
+    if copied != original or conn.execute(text('SELECT count(*) FROM "Fire"')).scalar() != original:
+        raise RuntimeError(f"Fire kopyalanamadı: {original} kayıttan {copied} kopyalandı, göç geri alınıyor")
+
+    conn.execute(text('ALTER TABLE "Fire" ADD PRIMARY KEY (id, date)'))
+    conn.execute(text('ALTER TABLE "Fire" ADD CONSTRAINT "Fire_fire_id_date_key" UNIQUE (fire_id, date)'))
+    for index in Fire.__table__.indexes:
+        index.create(conn)
+    if postgis_enabled(engine):
+        conn.execute(text(
+            'CREATE INDEX IF NOT EXISTS "ix_Fire_geom" ON "Fire" '
+            'USING gist (ST_SetSRID(ST_MakePoint(longitude, latitude), 4326))'
+        ))
+    print(f"Fire bölümlendi: {original} kayıt kopyalandı. Eski tablo Fire_unpartitioned olarak tutuldu; "
+          f"kontrol ettikten sonra: DROP TABLE \"Fire_unpartitioned\"")
+
+def add_ingest_data_versions(conn):
+    """IngestStatus'a kaynak bazlı veri sürümü kolonunu ekle (ETag'ler ve süreçler arası geçersizleme)"""
+    _add_columns(conn, IngestStatus, 'data_version')
+
+def add_ingest_breaker_state(conn):
+    """IngestStatus'a bayatlık ve devre kesici durumu kolonlarını ekle"""
+    _add_columns(conn, IngestStatus, 'stale_since', 'breaker_state', 'breaker_retry_at')
+
+def recompute_spatial_cells(conn):
+    """Göç 1'in PostgreSQL'de yuvarlayarak doldurduğu hücreleri cell_id ile uyumlu olarak yeniden hesapla"""
+    if conn.dialect.name == 'sqlite':
+        # SQLite'ta CAST keser, mevcut hücreler zaten doğru
+        return
+    expression = cell_sql(dialect=conn.dialect.name)
+    for model in (Earthquake, Fire, TsunamiAlert):
+        conn.execute(text(
+            f'UPDATE "{model.__tablename__}" SET cell = {expression} '
+            f'WHERE latitude IS NOT NULL AND longitude IS NOT NULL AND cell IS DISTINCT FROM {expression}'
+        ))
+
+# (numara, açıklama, fonksiyon) - sıra değiştirilmez, yalnızca sona eklenir
+MIGRATIONS = [
+    (1, 'spatial grid cells', add_spatial_cells),
+    (2, 'composite query indexes', add_query_indexes),
+    (3, 'ingest watermarks', add_ingest_watermarks),
+    (4, 'earthquake canonical ids', add_earthquake_canonical_id),
+    (5, 'created_at indexes', add_created_at_indexes),
+    (6, 'partitioned fire table', partition_fire_table),
+    (7, 'ingest data versions', add_ingest_data_versions),
+    (8, 'ingest breaker state', add_ingest_breaker_state),
+    (9, 'floor spatial grid cells', recompute_spatial_cells),
+]
+
+# İsteğe bağlı göçler: numara -> otomatik uygulanır mı (ortam değişkeni)
+OPT_IN_MIGRATIONS = {
+    6: FIRE_PARTITIONING
+}
+
+def applied_versions():
+    """Uygulanmış göç numaraları"""
+    SchemaVersion.__table__.create(engine, checkfirst=True)
+    with engine.connect() as conn:
+        return set(conn.execute(select(SchemaVersion.version)).scalars())
+
+def run_migrations(target=None, verbose=False, include=()):
+    """Bekleyen göçleri sırayla uygula (target verilirse o numaraya kadar)
+
+    İsteğe bağlı göçler yalnızca ortam değişkeni açıksa veya include içinde
+    verilmişse uygulanır. Her göç kendi transaction'ında çalışır ve
+    SchemaVersion'a işlenir.
+    Dönüş: uygulanan göç numaraları
+    """
+    applied = applied_versions()
+    done = []
+    for version, name, migrate in MIGRATIONS:
+        if version in applied or (target is not None and version > target):
+            continue
+        if not OPT_IN_MIGRATIONS.get(version, True) and version not in include:
+            continue
+        started = time.monotonic()
+        with engine.begin() as conn:
+            migrate(conn)
+            conn.execute(SchemaVersion.__table__.insert().values(
+                version=version, name=name, applied_at=datetime.utcnow()
+            ))
+        done.append(version)
+        if verbose:
+            print(f"Göç {version} ({name}) uygulandı: {time.monotonic() - started:.2f} sn")
+    return done
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == 'status':
+        applied = applied_versions()
+        for version, name, _ in MIGRATIONS:
+            if version in applied:
+                status = 'uygulandı'
+            elif not OPT_IN_MIGRATIONS.get(version, True):
+                status = 'isteğe bağlı'
+            else:
+                status = 'bekliyor'
+            print(f"{version:>3} {status:<13} {name}")
+        return
+
+    from models import Base
+    Base.metadata.create_all(engine)
+    include = (6,) if len(sys.argv) > 1 and sys.argv[1] == 'partition-fire' else ()
+    done = run_migrations(verbose=True, include=include)
+    if not done:
+        print("Bekleyen göç yok")
+
+if __name__ == '__main__':
+    main()
@@ -1,4 +1,4 @@
-from sqlalchemy import create_engine, Column, Integer, Float, String, DateTime, Boolean, ForeignKey
+from sqlalchemy import create_engine, Column, Integer, Float, String, DateTime, Boolean, ForeignKey, Index
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship, sessionmaker
 from datetime import datetime
@@ -12,6 +12,14 @@ Base = declarative_base()
 
 class Earthquake(Base):
     __tablename__ = 'Earthquake'
+    __table_args__ = (
+        # Kaynak bazlı sayfalı listeler ve büyüklük filtresi (bkz. migrations.py)
+        Index('ix_Earthquake_source_date', 'source', 'date', 'id'),
+        Index('ix_Earthquake_magnitude_date', 'magnitude', 'date'),
+        Index('ix_Earthquake_date_id', 'date', 'id'),
+        # Bellekteki anlık görüntünün artımlı yenilenmesi (bkz. snapshot.py)
+        Index('ix_Earthquake_created_at', 'created_at'),
+    )
 
     id = Column(String, primary_key=True)
     event_id = Column(String, unique=True)
@@ -22,11 +30,20 @@ class Earthquake(Base):
     depth = Column(Float)  # Derinlik (km)
     magnitude = Column(Float)  # Büyüklük
     location = Column(String)  # Yer bilgisi
+    cell = Column(Integer, index=True)  # Izgara hücresi (mekânsal filtre için, bkz. geo.py)
+    canonical_id = Column(String, index=True)  # Aynı depremin kanonik kaydı (kendisiyse kendi id'si, bkz. dedup.py)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
 class Fire(Base):
+    # PostgreSQL'de date üzerinde bölümlenir; birincil anahtar (id, date), benzersizlik (fire_id, date) (bkz. partitions.py)
     __tablename__ = 'Fire'
+    __table_args__ = (
+        Index('ix_Fire_source_date', 'source', 'date', 'id'),
+        Index('ix_Fire_confidence_frp_date', 'confidence', 'frp', 'date'),
+        Index('ix_Fire_date_id', 'date', 'id'),
+        Index('ix_Fire_created_at', 'created_at'),
+    )
 
     id = Column(String, primary_key=True)
     fire_id = Column(String, unique=True)
@@ -43,11 +60,16 @@ class Fire(Base):
     instrument = Column(String)  # Sensör adı (MODIS, VIIRS)
     version = Column(String)  # Veri versiyonu
     location = Column(String)  # Yer bilgisi
+    cell = Column(Integer, index=True)  # Izgara hücresi (mekânsal filtre için, bkz. geo.py)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
 class TsunamiAlert(Base):
     __tablename__ = 'TsunamiAlert'
+    __table_args__ = (
+        Index('ix_TsunamiAlert_source_date', 'source', 'date', 'id'),
+        Index('ix_TsunamiAlert_magnitude_date', 'magnitude', 'date'),
+    )
 
     id = Column(String, primary_key=True)
     alert_id = Column(String, unique=True)
@@ -62,9 +84,34 @@ class TsunamiAlert(Base):
     affected_regions = Column(String)  # Etkilenen bölgeler
     message = Column(String)  # Uyarı mesajı
     location = Column(String)  # Yer bilgisi
+    cell = Column(Integer, index=True)  # Izgara hücresi (mekânsal filtre için, bkz. geo.py)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+class IngestStatus(Base):
+    __tablename__ = 'IngestStatus'
+
+    source = Column(String, primary_key=True)  # Veri kaynağı (Kandilli, EMSC, NASA_FIRMS_MODIS, ...)
+    last_attempt_at = Column(DateTime)  # Son çekme denemesi
+    last_success_at = Column(DateTime)  # Son başarılı çekme (tazelik bilgisi)
+    last_error = Column(String)  # Son hata mesajı
+    last_count = Column(Integer)  # Son çekmede işlenen kayıt sayısı
+    watermark_time = Column(DateTime)  # Kaydedilen en yeni olayın zamanı (artımlı çekme sınırı)
+    watermark_id = Column(String)  # Kaydedilen en yeni olayın kimliği
+    watermark_updated = Column(DateTime)  # Kaynağın bildirdiği en son güncellenme zamanı (EMSC lastupdate)
+    data_version = Column(Integer, default=0)  # Kaynağın kayıtları her değiştiğinde artar (ETag'ler, bkz. conditional.py)
+    stale_since = Column(DateTime)  # Son başarılı çekmeden sonraki ilk başarısız deneme (başarıda temizlenir)
+    breaker_state = Column(String)  # Son çekmedeki devre kesici durumu (closed / open / half_open, bkz. upstream.py)
+    breaker_retry_at = Column(DateTime)  # Açık devrenin yeniden deneneceği zaman
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+class SchemaVersion(Base):
+    __tablename__ = 'SchemaVersion'
+
+    version = Column(Integer, primary_key=True)  # Göç numarası
+    name = Column(String)  # Göç açıklaması
+    applied_at = Column(DateTime, default=datetime.utcnow)
+
 # PostgreSQL veritabanı bağlantısı
 DATABASE_URL = os.getenv('DATABASE_URL')
 if DATABASE_URL and '?schema=' in DATABASE_URL:
@@ -80,6 +127,8 @@ engine = create_engine(DATABASE_URL)
 # Session oluştur
 Session = sessionmaker(bind=engine)
 
-# Tabloları oluştur
+# Tabloları oluştur ve bekleyen şema göçlerini uygula
 def init_db():
-    Base.metadata.create_all(engine) 
\ No newline at end of file
+    from migrations import run_migrations
+    Base.metadata.create_all(engine)
+    run_migrations()
\ No newline at end of file
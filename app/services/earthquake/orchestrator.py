@@ -0,0 +1,77 @@
+# orchestrator.py
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+from dotenv import load_dotenv
+from ingest import INGEST_SOURCES, ingested_count, record_ingest_status
+from metrics import INGEST_RUN_SECONDS
+from upstream import CircuitOpenError
+
+# .env dosyasını yükle
+load_dotenv()
+
+# Eşzamanlı çekme için iş parçacığı sayısı
+FETCH_MAX_WORKERS = int(os.getenv('FETCH_MAX_WORKERS', '8'))
+# Kaynak başına varsayılan bekleme süresi (sn), FETCH_DEADLINE_<KAYNAK> ile değiştirilebilir
+FETCH_DEADLINE = float(os.getenv('FETCH_DEADLINE', '10'))
+
+_executor = ThreadPoolExecutor(max_workers=FETCH_MAX_WORKERS, thread_name_prefix='fetch')
+_in_flight = {}
+_in_flight_lock = threading.Lock()
+
+def get_deadline(source):
+    """Kaynağın bekleme süresini getir"""
+    return float(os.getenv(f"FETCH_DEADLINE_{source.upper()}", FETCH_DEADLINE))
+
+def _run(source, func, kwargs):
+    started = time.monotonic()
+    try:
+        items = func(**kwargs)
+        record_ingest_status(source, True, count=ingested_count(items))
+        outcome = {'status': 'ok', 'count': ingested_count(items)}
+    except CircuitOpenError as e:
+        # Kaynak devre dışı: istek yapılmadı, API son başarılı verileri sunmaya devam eder
+        record_ingest_status(source, False, error=e)
+        outcome = {'status': 'circuit_open', 'error': str(e)}
+    except Exception as e:
+        record_ingest_status(source, False, error=e)
+        outcome = {'status': 'error', 'error': str(e)}
+    elapsed = time.monotonic() - started
+    INGEST_RUN_SECONDS.observe(elapsed, source=source, status=outcome['status'])
+    outcome['elapsed_ms'] = round(elapsed * 1000)
+    return outcome
+
+def _submit(source):
+    """Kaynağı çekmeye gönder; aynı kaynak zaten çekiliyorsa mevcut işi kullan"""
+    with _in_flight_lock:
+        future = _in_flight.get(source)
+        if future is None or future.done():
+            func, kwargs, _ = INGEST_SOURCES[source]
+            future = _executor.submit(_run, source, func, kwargs)
+            _in_flight[source] = future
+        return future
+
+def fetch_sources(sources, deadline=None):
+    """Kaynakları eşzamanlı çek ve her birinin sonucunu getir
+
+    Her kaynak kendi süresi kadar beklenir; süresi dolan kaynak arka planda
+    tamamlanır ve diğerlerini bekletmez.
+    Dönüş: {kaynak: {'status': 'ok'|'timeout'|'error'|'circuit_open', 'elapsed_ms': .., ...}}
+    """
+    started = time.monotonic()
+    futures = {source: _submit(source) for source in sources}
+    deadlines = {source: deadline if deadline is not None else get_deadline(source) for source in sources}
+
+    outcomes = {}
+    for source in sorted(sources, key=deadlines.get):
+        remaining = max(0, started + deadlines[source] - time.monotonic())
+        try:
+            outcomes[source] = futures[source].result(timeout=remaining)
+        except TimeoutError:
+            outcomes[source] = {
+                'status': 'timeout',
+                'elapsed_ms': round((time.monotonic() - started) * 1000)
+            }
+
+    return outcomes
@@ -0,0 +1,62 @@
+# pagination.py
+import base64
+import os
+from datetime import datetime
+from sqlalchemy import and_, or_
+from dotenv import load_dotenv
+
+# .env dosyasını yükle
+load_dotenv()
+
+# limit verilmediğinde kullanılan sayfa boyutu ve sunucu tarafı üst sınır
+API_DEFAULT_PAGE_SIZE = int(os.getenv('API_DEFAULT_PAGE_SIZE', '500'))
+API_MAX_PAGE_SIZE = int(os.getenv('API_MAX_PAGE_SIZE', '5000'))
+
+class InvalidCursor(ValueError):
+    """Çözülemeyen sayfalama imleci"""
+
+def clamp_limit(limit):
+    """İstenen sayfa boyutunu 1..API_MAX_PAGE_SIZE aralığına sınırla"""
+    if limit is None:
+        return API_DEFAULT_PAGE_SIZE
+    return max(1, min(limit, API_MAX_PAGE_SIZE))
+
+def encode_cursor(date, id):
+    """(date, id) çiftini URL'de kullanılabilir imlece dönüştür"""
+    raw = f"{date.isoformat()}|{id}".encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+def decode_cursor(cursor):
+    """İmleci (date, id) çiftine çevir"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        date_str, id = base64.urlsafe_b64decode(padded.encode('ascii')).decode('utf-8').split('|', 1)
+        return datetime.fromisoformat(date_str), id
+    except Exception:
+        raise InvalidCursor(f"Geçersiz imleç: {cursor}")
+
+def keyset(query, model, position=None):
+    """Sorguyu (date, id) azalan sırasına koy ve position'dan (decode_cursor ile çözülmüş imleç) sonrasıyla sınırla"""
+    query = query.order_by(model.date.desc(), model.id.desc())
+
+    if position:
+        date, id = position
+        query = query.filter(or_(
+            model.date < date,
+            and_(model.date == date, model.id < id)
+        ))
+
+    return query
+
+def paginate(query, model, limit, position=None):
+    """Sorguyu (date, id) üzerinde azalan sırada keyset sayfalama ile çalıştır
+
+    Dönüş: (kayıtlar, next_cursor) - son sayfada next_cursor None olur
+    """
+    items = keyset(query, model, position).limit(limit + 1).all()
+    next_cursor = None
+    if len(items) > limit:
+        items = items[:limit]
+        next_cursor = encode_cursor(items[-1].date, items[-1].id)
+
+    return items, next_cursor
@@ -0,0 +1,265 @@
+# partitions.py
+"""Fire tablosunun zamana göre bölümlenmesi ve eski kayıtların arşivlenmesi
+
+PostgreSQL'de Fire, date üzerinde RANGE ile bölümlenmiş bir tablodur (bkz.
+migrations.py, göç 6). Her bölüm FIRE_PARTITION_DAYS günlük bir aralıktır ve
+Fire_pYYYYMMDD olarak adlandırılır; hiçbir aralığa düşmeyen kayıtlar
+Fire_default bölümüne yazılır. date filtresi içeren sorgular yalnızca ilgili
+bölümleri, (date, id) sıralı sayfalar ise en yeni bölümlerden başlayarak tarar.
+
+SQLite'ta tek tablo kalır; aynı aralıklar mantıksal bölüm olarak kullanılır ve
+saklama süresini aşan aralıkların kayıtları tablodan çıkarılır.
+
+Saklama: bitişi FIRE_RETENTION_DAYS'ten eski olan bölümler ARCHIVE_DIR altına
+gzip'li CSV olarak yazılır; ardından PostgreSQL'de bölüm ayrılıp (DETACH)
+silinir, SQLite'ta aralığın kayıtları silinir.
+
+Kullanım:
+    python partitions.py            # eksik bölümleri oluştur, saklama politikasını uygula
+    python partitions.py status     # bölümleri ve kayıt sayılarını listele
+"""
+import csv
+import gzip
+import os
+import re
+import sys
+from datetime import datetime, timedelta
+from dotenv import load_dotenv
+from sqlalchemy import Column, MetaData, Table, func, select, text
+from models import Fire, engine
+
+# .env dosyasını yükle
+load_dotenv()
+
+# Bölüm uzunluğu (gün); bölümler 1970-01-05 (Pazartesi) başlangıçlı aralıklara hizalanır
+FIRE_PARTITION_DAYS = int(os.getenv('FIRE_PARTITION_DAYS', '7'))
+# Şimdiki bölümden sonra önceden oluşturulan bölüm sayısı
+FIRE_PARTITIONS_AHEAD = int(os.getenv('FIRE_PARTITIONS_AHEAD', '2'))
+# Bu kadar günden eski bölümler arşivlenip silinir (0: saklama politikası kapalı, varsayılan)
+FIRE_RETENTION_DAYS = int(os.getenv('FIRE_RETENTION_DAYS', '0'))
+# Göç 6 (Fire'ın bölümlü tabloya çevrilmesi) otomatik göçlerle uygulansın mı; kapalıyken
+# yalnızca elle: python migrations.py partition-fire
+FIRE_PARTITIONING = os.getenv('FIRE_PARTITIONING', 'false').lower() == 'true'
+# Arşiv dosyalarının klasörü
+ARCHIVE_DIR = os.getenv('ARCHIVE_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'archive'))
+
+PARTITION_EPOCH = datetime(1970, 1, 5)
+FIRE_SOURCES = ['NASA_FIRMS_MODIS', 'NASA_FIRMS_VIIRS']
+
+_BOUND = re.compile(r"FROM \('([^']+)'\) TO \('([^']+)'\)")
+
+def partition_start(date):
+    """Tarihi içeren bölümün başlangıcı"""
+    days = (date - PARTITION_EPOCH).days
+    return PARTITION_EPOCH + timedelta(days=days - days % FIRE_PARTITION_DAYS)
+
+def partition_name(start):
+    return f"Fire_p{start:%Y%m%d}"
+
+def is_partitioned(conn):
+    """Fire tablosu PostgreSQL'de bölümlenmiş mi"""
+    if conn.dialect.name != 'postgresql':
+        return False
+    return conn.execute(text(
+        "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table pt "
+        "JOIN pg_class c ON c.oid = pt.partrelid WHERE c.relname = 'Fire')"
+    )).scalar()
+
+def fire_conflict_columns(session):
+    """Toplu yazmada çakışma hedefi: bölümlü tabloda benzersizlik (fire_id, date) üzerindedir
+
+    Göç 6 uygulama çalışırken (başka süreçte) uygulanabileceği için sonuç
+    saklanmaz; katalog sorgusu her partide yeniden yapılır.
+    """
+    return ['fire_id', 'date'] if is_partitioned(session.connection()) else ['fire_id']
+
+def list_partitions(conn):
+    """Bağlı bölümler: [(ad, başlangıç, bitiş)]; varsayılan bölümde başlangıç / bitiş None"""
+    rows = conn.execute(text(
+        "SELECT c.relname, pg_get_expr(c.relpartbound, c.oid) FROM pg_inherits i "
+        "JOIN pg_class c ON c.oid = i.inhrelid JOIN pg_class p ON p.oid = i.inhparent "
+        "WHERE p.relname = 'Fire'"
+    )).fetchall()
+    partitions = []
+    for name, bound in rows:
+        match = _BOUND.search(bound)
+        if match:
+            partitions.append((name, datetime.fromisoformat(match.group(1)), datetime.fromisoformat(match.group(2))))
+        else:
+            partitions.append((name, None, None))
+    return sorted(partitions, key=lambda p: (p[1] is None, p[1] or datetime.min))
+
+def create_partition(conn, start):
+    """start ile başlayan bölümü oluştur; varsayılan bölüme düşmüş kayıtları içine taşı"""
+    name = partition_name(start)
+    end = start + timedelta(days=FIRE_PARTITION_DAYS)
+    bounds = {'start': start, 'end': end}
+    # Varsayılan bölümde bu aralıkta kayıt varken PARTITION OF hata verir: önce ayrı tablo
+    # oluşturulup kayıtlar taşınır, sonra bağlanır
+    conn.execute(text(f'CREATE TABLE "{name}" (LIKE "Fire" INCLUDING DEFAULTS)'))
+    conn.execute(text(
+        f'WITH moved AS (DELETE FROM "Fire_default" WHERE date >= :start AND date < :end RETURNING *) '
+        f'INSERT INTO "{name}" SELECT * FROM moved'
+    ), bounds)
+    conn.execute(text(
+        f'ALTER TABLE "Fire" ATTACH PARTITION "{name}" FOR VALUES FROM (:start) TO (:end)'
+    ), bounds)
+    return name
+
+def ensure_partitions(conn, now=None, first=None):
+    """first'ten (verilmezse şimdiki bölümden) FIRE_PARTITIONS_AHEAD sonrasına kadar eksik bölümleri oluştur"""
+    now = now or datetime.utcnow()
+    existing = {start for _, start, _ in list_partitions(conn) if start is not None}
+    start = partition_start(first or now)
+    last = partition_start(now) + timedelta(days=FIRE_PARTITION_DAYS * FIRE_PARTITIONS_AHEAD)
+    created = []
+    while start <= last:
+        if start not in existing:
+            created.append(create_partition(conn, start))
+        start += timedelta(days=FIRE_PARTITION_DAYS)
+    return created
+
+def _table(name):
+    """Fire ile aynı kolonlara sahip başka bir tablo (ayrılmış bölüm)"""
+    return Table(name, MetaData(), *[Column(column.name, column.type) for column in Fire.__table__.columns])
+
+def _archive_path(start, end):
+    folder = os.path.join(ARCHIVE_DIR, 'Fire')
+    os.makedirs(folder, exist_ok=True)
+    # Aynı aralığa geç gelen kayıtlar sonradan ayrıca arşivlenebilir; dosyalar üzerine yazılmaz
+    return os.path.join(folder, f"Fire_{start:%Y%m%d}_{end:%Y%m%d}_{datetime.utcnow():%Y%m%d%H%M%S%f}.csv.gz")
+
+def archive_rows(conn, query, path):
+    """Sorgu sonucunu gzip'li CSV'ye yaz (yarım dosya bırakmamak için geçici adla)"""
+    result = conn.execution_options(stream_results=True).execute(query)
+    count = 0
+    temp_path = path + '.tmp'
+    with gzip.open(temp_path, 'wt', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(result.keys())
+        for row in result:
+            writer.writerow(row)
+            count += 1
+    if count:
+        os.replace(temp_path, path)
+    else:
+        os.remove(temp_path)
+    return count
+
+def _apply_retention_postgres(cutoff):
+    archived = 0
+    with engine.begin() as conn:
+        ensure_partitions(conn)
+        expired = [(name, start, end) for name, start, end in list_partitions(conn) if end is not None and end <= cutoff]
+        for name, _, _ in expired:
+            # Ayırma kısa bir kilit alır; arşivleme bağlı tabloyu kilitlemeden yapılır
+            conn.execute(text(f'ALTER TABLE "Fire" DETACH PARTITION "{name}"'))
+
+    with engine.connect() as conn:
+        # Önceki bir çalışmada ayrılıp silinemeyen bölümler de arşivlenir
+        detached = conn.execute(text(
+            "SELECT relname FROM pg_class WHERE relname LIKE 'Fire\\_p%' AND relkind = 'r' AND NOT relispartition"
+        )).scalars().all()
+
+    for name in detached:
+        start = datetime.strptime(name[len('Fire_p'):], '%Y%m%d')
+        with engine.begin() as conn:
+            archived += archive_rows(conn, select(_table(name)),
+                                     _archive_path(start, start + timedelta(days=FIRE_PARTITION_DAYS)))
+            conn.execute(text(f'DROP TABLE "{name}"'))
+
+    # Hiçbir bölüme düşmemiş eski kayıtlar
+    with engine.begin() as conn:
+        default = _table('Fire_default')
+        oldest = conn.execute(select(func.min(default.c.date))).scalar()
+        if oldest is not None and oldest < cutoff:
+            archived += archive_rows(conn, select(default).where(default.c.date < cutoff), _archive_path(oldest, cutoff))
+            conn.execute(default.delete().where(default.c.date < cutoff))
+    return archived
+
+def _apply_retention_rows(cutoff):
+    """Tek tablolu veritabanları: süresi dolan her aralığı arşivle ve sil"""
+    archived = 0
+    table = Fire.__table__
+    with engine.connect() as conn:
+        oldest = conn.execute(select(func.min(table.c.date))).scalar()
+    if oldest is None:
+        return 0
+
+    start = partition_start(oldest)
+    while start + timedelta(days=FIRE_PARTITION_DAYS) <= cutoff:
+        end = start + timedelta(days=FIRE_PARTITION_DAYS)
+        in_range = (table.c.date >= start) & (table.c.date < end)
+        with engine.begin() as conn:
+            count = archive_rows(conn, select(table).where(in_range), _archive_path(start, end))
+            if count:
+                conn.execute(table.delete().where(in_range))
+        archived += count
+        start = end
+    return archived
+
+def apply_retention(now=None):
+    """Eksik bölümleri oluştur, süresi dolan bölümleri arşivleyip sil
+
+    Dönüş: arşivlenen kayıt sayısı
+    """
+    if FIRE_RETENTION_DAYS <= 0:
+        if engine.dialect.name == 'postgresql':
+            with engine.begin() as conn:
+                if is_partitioned(conn):
+                    ensure_partitions(conn)
+        return 0
+
+    cutoff = (now or datetime.utcnow()) - timedelta(days=FIRE_RETENTION_DAYS)
+    with engine.connect() as conn:
+        partitioned = is_partitioned(conn)
+    archived = _apply_retention_postgres(cutoff) if partitioned else _apply_retention_rows(cutoff)
+
+    if archived:
+        from ingest import bump_data_version
+        from models import Session
+        session = Session()
+        try:
+            for source in FIRE_SOURCES:
+                bump_data_version(session, source)
+            session.commit()
+        finally:
+            session.close()
+
+        from cache import result_cache
+        from snapshot import fire_snapshot
+        from tiles import tile_cache
+        for source in FIRE_SOURCES:
+            result_cache.invalidate_source(source)
+        tile_cache.invalidate_layer('fires')
+        fire_snapshot.clear()
+        print(f"Saklama politikası: {archived} yangın kaydı arşivlendi ({ARCHIVE_DIR})")
+    return archived
+
+def status():
+    """Bölümler (veya SQLite'ta mantıksal aralıklar) ve kayıt sayıları"""
+    with engine.connect() as conn:
+        if is_partitioned(conn):
+            return [(name, start, end, conn.execute(text(f'SELECT count(*) FROM "{name}"')).scalar())
+                    for name, start, end in list_partitions(conn)]
+        table = Fire.__table__
+        counts = {}
+        for (date,) in conn.execution_options(stream_results=True).execute(select(table.c.date)):
+            if date is not None:
+                start = partition_start(date)
+                counts[start] = counts.get(start, 0) + 1
+        return [(partition_name(start), start, start + timedelta(days=FIRE_PARTITION_DAYS), counts[start])
+                for start in sorted(counts)]
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == 'status':
+        for name, start, end, count in status():
+            bounds = f"{start:%Y-%m-%d} - {end:%Y-%m-%d}" if start else 'varsayılan'
+            print(f"{name:<18}{bounds:<26}{count:>10}")
+        return
+
+    archived = apply_retention()
+    print(f"{archived} kayıt arşivlendi")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,157 @@
+# scheduler.py
+import os
+import threading
+import time
+from datetime import datetime
+from dotenv import load_dotenv
+from ingest import INGEST_SOURCES, ingested_count, record_ingest_status
+from partitions import apply_retention
+import metrics
+
+# .env dosyasını yükle
+load_dotenv()
+
+# Bölüm bakımı ve saklama politikasının çalışma aralığı (sn, 0: kapalı; bkz. partitions.py)
+RETENTION_INTERVAL = int(os.getenv('RETENTION_INTERVAL', '3600'))
+
+class IngestJob:
+    """Tek bir veri kaynağının periyodik çekme görevi"""
+
+    def __init__(self, name, func, interval, kwargs=None):
+        self.name = name
+        self.func = func
+        self.interval = interval
+        self.kwargs = kwargs or {}
+        self.last_run = None
+        self.last_duration = None
+        self.last_error = None
+        self.runs = 0
+        self.failures = 0
+
+class IngestScheduler:
+    """Her kaynağı kendi aralığında arka planda yenileyen zamanlayıcı"""
+
+    def __init__(self, jobs):
+        self.jobs = {job.name: job for job in jobs}
+        self._stop = threading.Event()
+        self._threads = []
+        self._lock = threading.Lock()
+
+    def start(self):
+        """Her görev için bir daemon thread başlat (birden fazla çağrılabilir)"""
+        with self._lock:
+            if self._threads:
+                return
+            self._stop.clear()
+            for job in self.jobs.values():
+                thread = threading.Thread(target=self._loop, args=(job,), name=f"ingest-{job.name}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def stop(self, timeout=None):
+        """Tüm görevleri durdur"""
+        self._stop.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    @property
+    def running(self):
+        return bool(self._threads) and not self._stop.is_set()
+
+    def _loop(self, job):
+        # Sonraki çalışma zamanı önceki planlanan zamana göre hesaplanır,
+        # böylece çekme süresi aralığa eklenmez
+        next_run = time.monotonic()
+        while not self._stop.is_set():
+            self.run_job(job)
+            next_run += job.interval
+            delay = next_run - time.monotonic()
+            if delay < 0:
+                # Çekme aralıktan uzun sürdüyse kaçan turları atla
+                next_run = time.monotonic()
+                delay = 0
+            self._stop.wait(delay)
+
+    def run_job(self, job):
+        """Görevi bir kez çalıştır ve sonucu IngestStatus'a yaz"""
+        started = time.monotonic()
+        status = 'error'
+        try:
+            items = job.func(**job.kwargs)
+            job.last_error = None
+            record_ingest_status(job.name, True, count=ingested_count(items))
+            status = 'ok'
+            return True
+        except Exception as e:
+            print(f"{job.name} çekme görevi başarısız: {str(e)}")
+            job.last_error = str(e)
+            job.failures += 1
+            record_ingest_status(job.name, False, error=e)
+            return False
+        finally:
+            job.runs += 1
+            job.last_run = datetime.utcnow()
+            job.last_duration = time.monotonic() - started
+            metrics.INGEST_RUN_SECONDS.observe(job.last_duration, source=job.name, status=status)
+
+    def run_once(self):
+        """Tüm görevleri sırayla bir kez çalıştır"""
+        return {name: self.run_job(job) for name, job in self.jobs.items()}
+
+    def status(self):
+        """Görevlerin anlık durumunu getir"""
+        return {name: {
+            'interval': job.interval,
+            'runs': job.runs,
+            'failures': job.failures,
+            'last_run': job.last_run.isoformat() if job.last_run else None,
+            'last_duration_ms': round(job.last_duration * 1000) if job.last_duration is not None else None,
+            'last_error': job.last_error
+        } for name, job in self.jobs.items()}
+
+def build_scheduler():
+    """INGEST_SOURCES ve ortam değişkenlerinden zamanlayıcıyı oluştur
+
+    Aralıklar INGEST_INTERVAL_<KAYNAK> (sn) ile değiştirilebilir,
+    0 verilen kaynaklar devre dışı kalır. Saklama politikası da aynı
+    zamanlayıcıda 'Retention' görevi olarak çalışır.
+    """
+    jobs = []
+    for name, (func, kwargs, default_interval) in INGEST_SOURCES.items():
+        interval = int(os.getenv(f"INGEST_INTERVAL_{name.upper()}", default_interval))
+        if interval > 0:
+            jobs.append(IngestJob(name, func, interval, kwargs))
+    if RETENTION_INTERVAL > 0:
+        jobs.append(IngestJob('Retention', apply_retention, RETENTION_INTERVAL))
+    return IngestScheduler(jobs)
+
+def main():
+    """Ayrı worker olarak çalıştır (INGEST_MODE=worker)
+
+    Birden fazla worker çalıştırılırsa yalnızca liderlik kilidini alan
+    zamanlayıcıyı çalıştırır; diğerleri yedekte bekler (bkz. leader.py).
+    """
+    from models import engine, init_db
+    from leader import SCHEMA_AUTO_MIGRATE, LeaderElection, make_lock
+    metrics.serve()
+
+    scheduler = build_scheduler()
+
+    def start():
+        if SCHEMA_AUTO_MIGRATE:
+            init_db()
+        scheduler.start()
+        print(f"{datetime.now()} - Veri çekme zamanlayıcısı başlatıldı: {', '.join(scheduler.jobs)}")
+
+    election = LeaderElection(make_lock(engine), start, lambda: scheduler.stop(timeout=5))
+    election.start()
+    print(f"{datetime.now()} - Liderlik kilidi bekleniyor ({election.lock})")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        election.stop(timeout=5)
+
+if __name__ == "__main__":
+    main()
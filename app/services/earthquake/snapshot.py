@@ -0,0 +1,256 @@
+# snapshot.py
+"""Son günlerin deprem ve yangın kayıtlarının bellekte kolon dizileri halinde tutulması
+
+Liste endpoint'lerinin çoğu son 24 saat - 7 gün aralığını sorgular. Bu aralık
+(SNAPSHOT_DAYS) her kolon için bir NumPy dizisinde, metin kolonları ise ortak
+bir metin tablosuna işaret eden kodlar olarak tutulur; büyüklük / güven / FRP /
+bbox filtreleri ORM sorgusu yerine vektörel maskelerle yanıtlanır.
+
+Veri çekme sonrası update() ile yalnızca yeni kayıtlar eklenir; başka bir
+süreç yazıyorsa (INGEST_MODE=worker) okumalar en fazla
+SNAPSHOT_REFRESH_INTERVAL sn'de bir artımlı yenileme yapar. İstenen aralık
+anlık görüntüden eskiye uzanıyorsa ve sayfa tamamen içinden dolmuyorsa
+select() None döner; çağıran veritabanına düşer.
+"""
+import os
+import threading
+import time
+from collections import namedtuple
+from datetime import datetime, timedelta
+import numpy as np
+from dotenv import load_dotenv
+from sqlalchemy import Integer
+from models import Earthquake, Fire, Session
+from pagination import encode_cursor
+
+# .env dosyasını yükle
+load_dotenv()
+
+SNAPSHOT_ENABLED = os.getenv('SNAPSHOT_ENABLED', 'true').lower() == 'true'
+# Bellekte tutulan aralık (gün)
+SNAPSHOT_DAYS = int(os.getenv('SNAPSHOT_DAYS', '7'))
+# Okumalarda artımlı yenileme aralığı (sn); başka süreçlerin yazdıklarını görmek için
+SNAPSHOT_REFRESH_INTERVAL = float(os.getenv('SNAPSHOT_REFRESH_INTERVAL', '30'))
+# Eşzamanlı partiler created_at sırasıyla commit edilmeyebilir; artımlı yenileme
+# son yenilemenin bu kadar sn gerisinden başlar (mevcut kimlikler atlanır)
+SNAPSHOT_OVERLAP = int(os.getenv('SNAPSHOT_OVERLAP', '300'))
+
+class _Columns:
+    """Bir yenilemenin sonucu; diziler oluşturulduktan sonra değiştirilmez"""
+
+    def __init__(self, since, ids, times, numeric, codes, table):
+        self.since = since  # Bu tarihten yeni tüm kayıtlar dizilerde
+        self.ids = ids  # bayt dizisi (S), sıra: date azalan, id azalan
+        self.times = times  # datetime64[us]
+        self.numeric = numeric  # kolon -> float64 (boş değerler NaN)
+        self.codes = codes  # kolon -> int32 (metin tablosundaki sıra, 0 = boş)
+        self.table = table  # (metin listesi, metin -> kod); sıkıştırmada yenisi oluşturulur
+
+    def __len__(self):
+        return len(self.ids)
+
+    def take(self, index):
+        return _Columns(
+            self.since, self.ids[index], self.times[index],
+            {name: values[index] for name, values in self.numeric.items()},
+            {name: values[index] for name, values in self.codes.items()},
+            self.table
+        )
+
+class ColumnSnapshot:
+    """Bir modelin son SNAPSHOT_DAYS gününün kolon dizileri"""
+
+    def __init__(self, model, numeric, strings):
+        self.model = model
+        self.numeric = tuple(numeric)
+        self.strings = tuple(strings)
+        self.integers = {name for name in self.numeric if isinstance(model.__table__.c[name].type, Integer)}
+        self.Row = namedtuple(f"{model.__name__}Row", ('id', 'date') + self.numeric + self.strings)
+        self._columns = None
+        self._table = [None]  # metin tablosu (yalnızca sona eklenir)
+        self._table_index = {None: 0}
+        self._watermark = None
+        self._refreshed = 0.0
+        self._lock = threading.Lock()
+        self.refreshes = 0
+        self.loads = 0
+
+    def _encode(self, value):
+        code = self._table_index.get(value)
+        if code is None:
+            code = self._table_index[value] = len(self._table)
+            self._table.append(value)
+        return code
+
+    def _load(self, session, since, created_since=None):
+        """Kayıtları veritabanından okuyup kolon dizilerine çevir"""
+        model = self.model
+        columns = [model.id, model.date] + [getattr(model, name) for name in self.numeric + self.strings]
+        query = session.query(*columns).filter(model.date >= since)
+        if created_since is not None:
+            query = query.filter(model.created_at >= created_since)
+        rows = query.all()
+
+        offset = 2 + len(self.numeric)
+        return _Columns(
+            since,
+            np.array([row[0].encode('utf-8') for row in rows], dtype='S'),
+            np.array([row[1] for row in rows], dtype='datetime64[us]'),
+            {name: np.array([row[2 + i] for row in rows], dtype=np.float64)
+             for i, name in enumerate(self.numeric)},
+            {name: np.array([self._encode(row[offset + i]) for row in rows], dtype=np.int32)
+             for i, name in enumerate(self.strings)},
+            (self._table, self._table_index)
+        )
+
+    def _compact(self, columns):
+        """Artık kullanılmayan metinleri tablodan çıkar"""
+        used = np.unique(np.concatenate([columns.codes[name] for name in self.strings] + [np.zeros(1, np.int32)]))
+        remap = np.zeros(len(self._table), dtype=np.int32)
+        remap[used] = np.arange(len(used), dtype=np.int32)
+        self._table = [self._table[i] for i in used]
+        self._table_index = {value: i for i, value in enumerate(self._table)}
+        return _Columns(columns.since, columns.ids, columns.times, columns.numeric,
+                        {name: remap[codes] for name, codes in columns.codes.items()},
+                        (self._table, self._table_index))
+
+    @staticmethod
+    def _sorted(columns):
+        """date azalan, id azalan sıraya koy (pagination.keyset ile aynı sıra)"""
+        return columns.take(np.lexsort((columns.ids, columns.times))[::-1])
+
+    def refresh(self, force=False):
+        """Anlık görüntüyü ilk seferde tamamen, sonrasında artımlı olarak yenile"""
+        if not SNAPSHOT_ENABLED:
+            return
+        if not force and self._columns is not None and time.monotonic() - self._refreshed < SNAPSHOT_REFRESH_INTERVAL:
+            return
+
+        with self._lock:
+            if not force and self._columns is not None and time.monotonic() - self._refreshed < SNAPSHOT_REFRESH_INTERVAL:
+                return
+            session = Session()
+            try:
+                started = datetime.utcnow()
+                since = started - timedelta(days=SNAPSHOT_DAYS)
+                current = self._columns
+                if current is None:
+                    columns = self._sorted(self._load(session, since))
+                    self.loads += 1
+                else:
+                    # Pencereden çıkanları at (sıra korunur), yeni kayıtları ekle
+                    current = current.take(current.times >= np.datetime64(since))
+                    current.since = since
+                    added = self._load(session, since, self._watermark - timedelta(seconds=SNAPSHOT_OVERLAP))
+                    if len(added):
+                        added = added.take(~np.isin(added.ids, current.ids))
+                    if len(added):
+                        current = self._sorted(_Columns(
+                            since,
+                            np.concatenate([current.ids, added.ids]),
+                            np.concatenate([current.times, added.times]),
+                            {name: np.concatenate([current.numeric[name], added.numeric[name]]) for name in self.numeric},
+                            {name: np.concatenate([current.codes[name], added.codes[name]]) for name in self.strings},
+                            added.table
+                        ))
+                    columns = current
+                    if len(self._table) > 2 * len(columns) + 1024:
+                        columns = self._compact(columns)
+
+                self._columns = columns
+                self._watermark = started
+                self._refreshed = time.monotonic()
+                self.refreshes += 1
+            except Exception as e:
+                print(f"Anlık görüntü yenileme hatası ({self.model.__name__}): {str(e)}")
+            finally:
+                session.close()
+
+    def update(self):
+        """Veri çekme sonrası çağrılır: yüklüyse yeni kayıtları hemen ekle"""
+        if self._columns is not None:
+            self.refresh(force=True)
+
+    def clear(self):
+        """Dizileri bırak; sonraki okuma veritabanından yeniden yükler (kayıt silindiğinde)"""
+        with self._lock:
+            self._columns = None
+
+    def select(self, limit, cursor=None, since=None, bbox=None, minimums=None, source=None):
+        """Filtreleri maskelerle uygulayıp (date, id) azalan sırada bir sayfa döndür
+
+        cursor çözülmüş (date, id) çiftidir. Dönüş: (kayıtlar, next_cursor);
+        istenen aralık anlık görüntüyü aşıyor ve sayfa içinden dolmuyorsa None.
+        """
+        if not SNAPSHOT_ENABLED:
+            return None
+        self.refresh()
+        columns = self._columns
+        if columns is None:
+            return None
+
+        mask = np.ones(len(columns), dtype=bool)
+        if since is not None:
+            mask &= columns.times >= np.datetime64(since)
+        if source is not None:
+            mask &= columns.codes['source'] == columns.table[1].get(source, -1)
+        for name, minimum in (minimums or {}).items():
+            mask &= columns.numeric[name] >= minimum
+        if bbox is not None:
+            min_lon, min_lat, max_lon, max_lat = bbox
+            lat, lon = columns.numeric['latitude'], columns.numeric['longitude']
+            mask &= (lat >= min_lat) & (lat <= max_lat)
+            if min_lon <= max_lon:
+                mask &= (lon >= min_lon) & (lon <= max_lon)
+            else:
+                # Tarih değiştirme çizgisini aşan kutu
+                mask &= (lon >= min_lon) | (lon <= max_lon)
+        if cursor is not None:
+            date, id = np.datetime64(cursor[0]), cursor[1].encode('utf-8')
+            mask &= (columns.times < date) | ((columns.times == date) & (columns.ids < id))
+
+        index = np.flatnonzero(mask)[:limit + 1]
+        covered = since is not None and since >= columns.since
+        if len(index) <= limit and not covered:
+            # Sayfanın devamı anlık görüntüden eski kayıtlarda olabilir
+            return None
+
+        items = self._rows(columns, index[:limit])
+        next_cursor = encode_cursor(items[-1].date, items[-1].id) if len(index) > limit else None
+        return items, next_cursor
+
+    def _rows(self, columns, index):
+        values = [
+            [id.decode('utf-8') for id in columns.ids[index].tolist()],
+            columns.times[index].tolist()
+        ]
+        for name in self.numeric:
+            column = columns.numeric[name][index].tolist()
+            convert = int if name in self.integers else float
+            values.append([None if value != value else convert(value) for value in column])
+        table = columns.table[0]
+        for name in self.strings:
+            values.append([table[code] for code in columns.codes[name][index].tolist()])
+        return [self.Row(*row) for row in zip(*values)]
+
+    def stats(self):
+        columns = self._columns
+        if columns is None:
+            return {'enabled': SNAPSHOT_ENABLED, 'loaded': False}
+        arrays = [columns.ids, columns.times] + list(columns.numeric.values()) + list(columns.codes.values())
+        return {
+            'enabled': SNAPSHOT_ENABLED,
+            'loaded': True,
+            'rows': len(columns),
+            'since': columns.since.isoformat(),
+            'strings': len(self._table),
+            'bytes': sum(array.nbytes for array in arrays),
+            'loads': self.loads,
+            'refreshes': self.refreshes,
+            'age_seconds': round(time.monotonic() - self._refreshed, 1)
+        }
+
+earthquake_snapshot = ColumnSnapshot(
+    Earthquake, ('latitude', 'longitude', 'depth', 'magnitude'), ('source', 'location'))
+fire_snapshot = ColumnSnapshot(
+    Fire, ('latitude', 'longitude', 'brightness', 'confidence', 'frp'), ('source', 'satellite', 'instrument', 'location'))
@@ -0,0 +1,94 @@
+# streaming.py
+import json
+import os
+from flask import Response, stream_with_context
+from dotenv import load_dotenv
+from pagination import encode_cursor, keyset
+
+# .env dosyasını yükle
+load_dotenv()
+
+# Veritabanından tek seferde çekilen satır sayısı (sunucu tarafı imleç)
+STREAM_BATCH_SIZE = int(os.getenv('STREAM_BATCH_SIZE', '1000'))
+# Akış modunda limit verilmediğinde kullanılan ve aşılamayan satır sayısı
+API_MAX_STREAM_SIZE = int(os.getenv('API_MAX_STREAM_SIZE', '1000000'))
+
+# format parametresi -> içerik türü
+STREAM_FORMATS = {
+    'ndjson': 'application/x-ndjson',
+    'stream': 'application/json'
+}
+
+class InvalidFormat(ValueError):
+    """Desteklenmeyen format parametresi"""
+
+def get_format(args):
+    """İstekteki format parametresini oku: 'json' (varsayılan), 'ndjson' veya 'stream'"""
+    fmt = args.get('format', default='json', type=str).lower()
+    if fmt != 'json' and fmt not in STREAM_FORMATS:
+        raise InvalidFormat(f"Geçersiz format: {fmt} (json, ndjson veya stream olmalıdır)")
+    return fmt
+
+def clamp_stream_limit(limit):
+    """Akış modundaki satır sınırını 1..API_MAX_STREAM_SIZE aralığına sınırla"""
+    if limit is None:
+        return API_MAX_STREAM_SIZE
+    return max(1, min(limit, API_MAX_STREAM_SIZE))
+
+def _dumps(value):
+    return json.dumps(value, ensure_ascii=False, separators=(',', ':'))
+
+def iter_rows(query, model, limit, position, state):
+    """Satırları yield_per ile parça parça getir; sınır aşılırsa state['next_cursor'] doldurulur"""
+    rows = keyset(query, model, position).limit(limit + 1).yield_per(STREAM_BATCH_SIZE)
+    count = 0
+    last = None
+    for row in rows:
+        if count == limit:
+            state['next_cursor'] = encode_cursor(last.date, last.id)
+            break
+        count += 1
+        last = row
+        yield row
+    state['count'] = count
+
+def iter_batches(rows):
+    """Satırları STREAM_BATCH_SIZE boyutunda listeler halinde getir"""
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) == STREAM_BATCH_SIZE:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+def stream_response(session, query, model, serialize, items_key, meta, fmt, limit, position):
+    """Sorgu sonucunu satırlar geldikçe yazan yanıt oluştur (session akış bitince kapanır)
+
+    position, çağıranın yanıt başlamadan çözüp doğruladığı (date, id) imlecidir;
+    akış başladıktan sonra hata 400 olarak döndürülemez.
+    serialize bir satır listesini sözlük listesine çevirir ve her parça için çağrılır.
+    ndjson: her satır bir JSON nesnesi; sonraki sayfa imleci yazılmaz.
+    stream: normal yanıtla aynı nesne; count ve next_cursor dizinin ardından yazılır.
+    """
+    state = {'count': 0, 'next_cursor': None}
+
+    def generate():
+        try:
+            batches = iter_batches(iter_rows(query, model, limit, position, state))
+            if fmt == 'ndjson':
+                for batch in batches:
+                    yield ''.join(_dumps(item) + '\n' for item in serialize(batch))
+                return
+
+            yield _dumps(meta)[:-1] + (',' if meta else '') + f'"limit":{limit},"{items_key}":['
+            separator = ''
+            for batch in batches:
+                yield separator + ','.join(_dumps(item) for item in serialize(batch))
+                separator = ','
+            yield f'],"count":{state["count"]},"next_cursor":{_dumps(state["next_cursor"])}}}'
+        finally:
+            session.close()
+
+    return Response(stream_with_context(generate()), mimetype=STREAM_FORMATS[fmt])
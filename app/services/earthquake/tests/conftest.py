@@ -0,0 +1,31 @@
+# conftest.py
+"""Testler geçici bir SQLite veritabanıyla çalışır
+
+Modüller ortam değişkenlerini içe aktarılırken okuduğundan DATABASE_URL ve
+INGEST_MODE burada, testler içe aktarılmadan önce ayarlanır. PostgreSQL'e
+özgü testler TEST_DATABASE_URL verilmişse çalışır.
+"""
+import os
+import sys
+import tempfile
+
+os.environ['DATABASE_URL'] = 'sqlite:///' + os.path.join(tempfile.mkdtemp(), 'test.db')
+os.environ['INGEST_MODE'] = 'off'
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import pytest
+from models import Base, Session, init_db
+
+init_db()
+
+@pytest.fixture
+def session():
+    """Boş tablolarla açılan oturum"""
+    session = Session()
+    for table in reversed(Base.metadata.sorted_tables):
+        if table.name != 'SchemaVersion':
+            session.execute(table.delete())
+    session.commit()
+    yield session
+    session.close()
@@ -0,0 +1,69 @@
+# test_bulk.py
+"""bulk_upsert'in eklenen / güncellenen / atlanan sayıları"""
+import os
+from datetime import datetime, timedelta
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from bulk import bulk_upsert
+from models import TsunamiAlert
+
+UPDATE_COLUMNS = ['status', 'message', 'updated_at']
+
+def _row(alert_id, status, written_at):
+    return {
+        'id': f'row-{alert_id}-{written_at.timestamp()}',
+        'alert_id': alert_id,
+        'source': 'NOAA',
+        'date': datetime(2024, 1, 1),
+        'latitude': 38.0,
+        'longitude': 27.0,
+        'magnitude': 6.0,
+        'depth': 10.0,
+        'alert_level': 'Warning',
+        'status': status,
+        'affected_regions': '',
+        'message': 'test',
+        'location': 'Ege',
+        'cell': None,
+        'created_at': written_at,
+        'updated_at': written_at
+    }
+
+def _check_counts(session):
+    first = datetime(2024, 1, 1, 12)
+    stats = bulk_upsert(session, TsunamiAlert, [_row(id, 'Active', first) for id in 'abc'], 'alert_id',
+                        update_columns=UPDATE_COLUMNS, chunk_size=2)
+    assert stats == {'inserted': 3, 'updated': 0, 'skipped': 0}
+
+    # a aynı (yalnızca zaman damgası farklı), b değişti, d yeni ve partide iki kez
+    second = first + timedelta(minutes=5)
+    rows = [_row('a', 'Active', second), _row('b', 'Cancelled', second),
+            _row('d', 'Active', second), _row('d', 'Active', second)]
+    stats = bulk_upsert(session, TsunamiAlert, rows, 'alert_id', update_columns=UPDATE_COLUMNS, chunk_size=2)
+    assert stats == {'inserted': 1, 'updated': 1, 'skipped': 2}
+
+    alerts = {alert.alert_id: alert for alert in session.query(TsunamiAlert)}
+    assert alerts['a'].updated_at == first
+    assert (alerts['b'].status, alerts['b'].updated_at) == ('Cancelled', second)
+
+    # update_columns yoksa mevcut kayıtlar atlanır
+    stats = bulk_upsert(session, TsunamiAlert, [_row(id, 'Expired', second) for id in 'abe'], 'alert_id')
+    assert stats == {'inserted': 1, 'updated': 0, 'skipped': 2}
+    assert session.query(TsunamiAlert).count() == 5
+
+def test_bulk_upsert_counts_on_sqlite(session):
+    _check_counts(session)
+
+@pytest.mark.skipif(not os.getenv('TEST_DATABASE_URL'), reason='TEST_DATABASE_URL (PostgreSQL) verilmedi')
+def test_bulk_upsert_counts_on_postgresql():
+    bind = create_engine(os.environ['TEST_DATABASE_URL'])
+    TsunamiAlert.__table__.create(bind, checkfirst=True)
+    session = sessionmaker(bind=bind)()
+    try:
+        session.execute(TsunamiAlert.__table__.delete())
+        _check_counts(session)
+    finally:
+        session.rollback()
+        session.close()
+        bind.dispose()
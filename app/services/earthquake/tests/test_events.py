@@ -0,0 +1,50 @@
+# test_events.py
+"""Veritabanı yoklamasının sırası ve geç commit edilen kayıtlar"""
+from datetime import datetime, timedelta
+import pytest
+import events
+from events import EventBus
+from models import Earthquake
+
+BASE = datetime(2024, 1, 1, 12)
+
+def _add(session, id, seconds):
+    session.add(Earthquake(id=id, event_id=id, canonical_id=id, source='EMSC', date=BASE,
+                           latitude=38.0, longitude=27.0, magnitude=4.0,
+                           created_at=BASE + timedelta(seconds=seconds)))
+    session.commit()
+
+@pytest.fixture
+def bus(session):
+    _add(session, 'old', 0)
+    bus = EventBus()
+    bus.start_id = bus.last_id
+    bus._prime(session)
+    return bus
+
+def _published(bus):
+    batches, missed = bus.since(bus.start_id)
+    assert not missed
+    return [item['id'] for _, kind, _, items in batches for item in items]
+
+def test_poll_publishes_in_created_order(bus, session):
+    _add(session, 'b', 2)
+    _add(session, 'a', 1)
+    bus._poll_kind(session, 'earthquakes')
+    assert _published(bus) == ['a', 'b']
+
+def test_late_commit_inside_overlap_is_published_once(bus, session):
+    _add(session, 'a', 10)
+    bus._poll_kind(session, 'earthquakes')
+    # Su seviyesinden eski created_at ile sonradan görünen kayıt
+    _add(session, 'late', 5)
+    bus._poll_kind(session, 'earthquakes')
+    bus._poll_kind(session, 'earthquakes')
+    assert _published(bus) == ['a', 'late']
+
+def test_poll_pages_through_large_batches(bus, session, monkeypatch):
+    monkeypatch.setattr(events, 'EVENT_POLL_BATCH', 2)
+    for i in range(5):
+        _add(session, f'e{i}', 1)
+    bus._poll_kind(session, 'earthquakes')
+    assert _published(bus) == [f'e{i}' for i in range(5)]
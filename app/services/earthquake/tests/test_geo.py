@@ -0,0 +1,33 @@
+# test_geo.py
+"""cell_sql ifadesinin cell_id ile aynı hücreyi vermesi"""
+import os
+import random
+import pytest
+from sqlalchemy import create_engine, text
+from geo import cell_id, cell_sql
+from models import engine
+
+def _points():
+    # Sınırlar, hücre kenarları ve negatif koordinatlar (PostgreSQL'de CAST yuvarlar)
+    points = [(-90, -180), (90, 180), (-89.9, -179.9), (0, 0), (-0.25, -0.25), (-0.5, -0.5),
+              (0.49, 0.51), (-45.75, 120.3), (38.1, -122.26), (89.99, 179.99)]
+    rng = random.Random(1)
+    points += [(rng.uniform(-90, 90), rng.uniform(-180, 180)) for _ in range(500)]
+    return points
+
+def _cells(bind, cast_type):
+    expression = cell_sql(f'CAST(:lat AS {cast_type})', f'CAST(:lon AS {cast_type})', bind.dialect.name)
+    with bind.connect() as conn:
+        return [conn.execute(text(f'SELECT {expression}'), {'lat': lat, 'lon': lon}).scalar()
+                for lat, lon in _points()]
+
+def test_cell_sql_matches_cell_id_on_sqlite():
+    assert _cells(engine, 'REAL') == [cell_id(lat, lon) for lat, lon in _points()]
+
+@pytest.mark.skipif(not os.getenv('TEST_DATABASE_URL'), reason='TEST_DATABASE_URL (PostgreSQL) verilmedi')
+def test_cell_sql_matches_cell_id_on_postgresql():
+    bind = create_engine(os.environ['TEST_DATABASE_URL'])
+    try:
+        assert _cells(bind, 'DOUBLE PRECISION') == [cell_id(lat, lon) for lat, lon in _points()]
+    finally:
+        bind.dispose()
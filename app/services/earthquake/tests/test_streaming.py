@@ -0,0 +1,37 @@
+# test_streaming.py
+"""Akış formatlarında imleçle devam ve geçersiz imleç hatası"""
+import json
+from datetime import datetime, timedelta
+import pytest
+from app import create_app
+from geo import cell_id
+from models import Earthquake
+
+@pytest.fixture
+def client(session):
+    base = datetime.utcnow().replace(microsecond=0)
+    for i in range(3):
+        session.add(Earthquake(id=f'eq{i}', event_id=f'kandilli_{i}', canonical_id=f'eq{i}', source='Kandilli',
+                               date=base - timedelta(minutes=i), latitude=39.0, longitude=32.0 + i,
+                               depth=7.0, magnitude=3.0 + i, location='Ankara', cell=cell_id(39.0, 32.0 + i)))
+    session.commit()
+    return create_app().test_client()
+
+def test_stream_continues_from_cursor(client):
+    first = client.get('/api/earthquakes/kandilli?limit=2').get_json()
+    assert [eq['id'] for eq in first['earthquakes']] == ['eq0', 'eq1']
+
+    response = client.get(f"/api/earthquakes/kandilli?format=stream&cursor={first['next_cursor']}")
+    assert response.status_code == 200
+    body = json.loads(response.get_data())
+    assert [eq['id'] for eq in body['earthquakes']] == ['eq2']
+    assert body['next_cursor'] is None
+
+    response = client.get(f"/api/earthquakes/kandilli?format=ndjson&cursor={first['next_cursor']}")
+    assert [json.loads(line)['id'] for line in response.get_data(as_text=True).splitlines()] == ['eq2']
+
+@pytest.mark.parametrize('fmt', ['json', 'stream', 'ndjson'])
+def test_invalid_cursor_is_rejected_before_streaming(client, fmt):
+    response = client.get(f'/api/earthquakes/kandilli?format={fmt}&cursor=bozuk')
+    assert response.status_code == 400
+    assert response.is_json
@@ -0,0 +1,67 @@
+# test_upstream.py
+"""Devre kesicinin yarı açık durumdan kapanması"""
+import pytest
+import requests
+import upstream
+from upstream import CircuitBreaker, CircuitOpenError
+
+class FakeResponse:
+    def __init__(self, status_code=200):
+        self.status_code = status_code
+
+    def close(self):
+        pass
+
+@pytest.fixture
+def breaker(monkeypatch):
+    """Tek hatada açılan, beklemesiz devre kesici"""
+    breaker = CircuitBreaker('test', failures=1, cooldown=0)
+    monkeypatch.setitem(upstream._breakers, 'test', breaker)
+    monkeypatch.setattr(upstream, 'backoff', lambda attempt: 0)
+    return breaker
+
+def _get():
+    return upstream.get('http://upstream.test/feed', source='test')
+
+def _send_with(monkeypatch, outcome):
+    def send(*args):
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+    monkeypatch.setattr(upstream, '_send', send)
+
+def test_probe_success_closes_breaker(breaker, monkeypatch):
+    _send_with(monkeypatch, requests.ConnectionError('kapalı'))
+    with pytest.raises(requests.ConnectionError):
+        _get()
+    assert breaker.state == 'open'
+
+    _send_with(monkeypatch, FakeResponse(200))
+    assert _get().status_code == 200
+    assert breaker.state == 'closed'
+    assert breaker.failures == 0
+
+def test_concurrent_request_short_circuits_during_probe(breaker):
+    breaker.record_failure('kapalı')
+    assert breaker.before_request() is True
+    assert breaker.state == 'half_open'
+    with pytest.raises(CircuitOpenError):
+        breaker.before_request()
+
+def test_probe_failure_reopens_breaker(breaker, monkeypatch):
+    breaker.record_failure('kapalı')
+    _send_with(monkeypatch, FakeResponse(503))
+    assert _get().status_code == 503
+    assert breaker.state == 'open'
+
+def test_unexpected_probe_error_releases_probe(breaker, monkeypatch):
+    breaker.record_failure('kapalı')
+    _send_with(monkeypatch, ValueError('beklenmeyen'))
+    with pytest.raises(ValueError):
+        _get()
+    assert breaker.state == 'half_open'
+
+    # Deneme hakkı bırakıldı: sonraki istek yeniden dener ve devreyi kapatır
+    _send_with(monkeypatch, FakeResponse(200))
+    assert _get().status_code == 200
+    assert breaker.state == 'closed'
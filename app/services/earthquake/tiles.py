@@ -0,0 +1,204 @@
+# tiles.py
+"""z/x/y harita karoları (kompakt GeoJSON) ve disk önbelleği
+
+Karolar mevcut tablolardan üretilir ve cache/tiles altında katman bazında
+saklanır. Her katmanın bir nesil (generation) numarası vardır; yeni kayıt
+yazıldığında nesil değişir ve eski karolar silinir. Nesil bilgisi dosyada
+tutulduğu için ayrı süreçte çalışan veri çekme işçisi de API'nin karolarını
+geçersiz kılabilir.
+"""
+import json
+import math
+import os
+import shutil
+import threading
+import time
+from datetime import datetime, timedelta
+from dotenv import load_dotenv
+from models import Earthquake, Fire, TsunamiAlert
+from geo import bbox_filter
+from aggregate import fire_grid, zoom_cell_deg
+from dedup import canonical_filter
+
+# .env dosyasını yükle
+load_dotenv()
+
+TILE_CACHE_DIR = os.getenv('TILE_CACHE_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cache', 'tiles'))
+TILE_MAX_ZOOM = int(os.getenv('TILE_MAX_ZOOM', '18'))
+# Bir karoda en fazla nokta sayısı (en yeniler)
+TILE_MAX_FEATURES = int(os.getenv('TILE_MAX_FEATURES', '5000'))
+# Bu zoom seviyesinin altında yangınlar ızgara hücresi olarak döner
+TILE_FIRE_CLUSTER_ZOOM = int(os.getenv('TILE_FIRE_CLUSTER_ZOOM', '6'))
+# days penceresi kaydığı için karolar yeni veri gelmese de bu süreden sonra yenilenir (sn)
+TILE_CACHE_TTL = int(os.getenv('TILE_CACHE_TTL', '900'))
+TILE_MAX_DAYS = int(os.getenv('TILE_MAX_DAYS', '30'))
+
+class InvalidTile(ValueError):
+    """Hatalı katman / z / x / y / days parametreleri"""
+
+# katman -> (model, varsayılan gün, id / source / date dışında karoya giren alanlar)
+TILE_LAYERS = {
+    'earthquakes': (Earthquake, 7, ('magnitude', 'depth', 'location')),
+    'fires': (Fire, 1, ('frp', 'confidence', 'brightness')),
+    'tsunami': (TsunamiAlert, 30, ('magnitude', 'alert_level', 'status'))
+}
+
+def tile_bbox(z, x, y):
+    """Karonun (minLon, minLat, maxLon, maxLat) sınırları"""
+    n = 2 ** z
+    min_lon = x / n * 360 - 180
+    max_lon = (x + 1) / n * 360 - 180
+    max_lat = math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * y / n))))
+    min_lat = math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * (y + 1) / n))))
+    return min_lon, min_lat, max_lon, max_lat
+
+def coordinate_precision(z):
+    """Zoom seviyesinde bir pikselden daha ince ayrıntı taşımayan ondalık basamak sayısı"""
+    pixel_deg = 360 / (256 * 2 ** z)
+    return max(0, math.ceil(-math.log10(pixel_deg)))
+
+def validate_tile(layer, z, x, y, days):
+    if layer not in TILE_LAYERS:
+        raise InvalidTile(f"Bilinmeyen katman: {layer} ({', '.join(TILE_LAYERS)})")
+    if not (0 <= z <= TILE_MAX_ZOOM):
+        raise InvalidTile(f"z 0 ile {TILE_MAX_ZOOM} arasında olmalıdır")
+    if not (0 <= x < 2 ** z and 0 <= y < 2 ** z):
+        raise InvalidTile("x / y bu zoom seviyesi için geçersiz")
+    if not (1 <= days <= TILE_MAX_DAYS):
+        raise InvalidTile(f"days 1 ile {TILE_MAX_DAYS} arasında olmalıdır")
+
+def _point(longitude, latitude, precision, properties):
+    return {
+        'type': 'Feature',
+        'geometry': {'type': 'Point', 'coordinates': [round(longitude, precision), round(latitude, precision)]},
+        'properties': properties
+    }
+
+def build_tile(session, layer, z, x, y, days, postgis=False):
+    """Karoyu veritabanından üret (GeoJSON FeatureCollection sözlüğü)"""
+    model, _, fields = TILE_LAYERS[layer]
+    bbox = tile_bbox(z, x, y)
+    precision = coordinate_precision(z)
+    since = datetime.utcnow() - timedelta(days=days)
+
+    if layer == 'fires' and z < TILE_FIRE_CLUSTER_ZOOM:
+        # Düşük zoom: tek tek nokta yerine hücre toplamları
+        _, cells = fire_grid(session, zoom_cell_deg(z), bbox, [Fire.date >= since], postgis)
+        features = [
+            _point(lon, lat, precision, {
+                'count': count, 'max_frp': max_frp, 'mean_brightness': mean_brightness, 'max_confidence': max_confidence
+            })
+            for lat, lon, count, max_frp, mean_brightness, max_confidence in cells
+        ]
+        return {'type': 'FeatureCollection', 'clustered': True, 'features': features}
+
+    # Yalnızca karoya giren kolonlar; ORDER BY ... LIMIT tarih indeksini zorladığından
+    # karodaki satırlar mekânsal filtreyle alınıp bellekte sıralanır
+    columns = [model.id, model.source, model.date, model.latitude, model.longitude]
+    columns += [getattr(model, field) for field in fields]
+    query = session.query(*columns).filter(
+        model.date >= since,
+        bbox_filter(model, bbox, postgis)
+    )
+    if layer == 'earthquakes':
+        query = query.filter(canonical_filter())
+    rows = sorted(query, key=lambda row: row.date, reverse=True)
+    truncated = len(rows) > TILE_MAX_FEATURES
+    features = []
+    for id, source, date, latitude, longitude, *values in rows[:TILE_MAX_FEATURES]:
+        properties = {'id': id, 'source': source, 'date': date.isoformat()}
+        properties.update(zip(fields, values))
+        features.append(_point(longitude, latitude, precision, properties))
+    return {'type': 'FeatureCollection', 'clustered': False, 'truncated': truncated, 'features': features}
+
+def encode_tile(tile):
+    return json.dumps(tile, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+class TileCache:
+    """Karoları <kök>/<katman>/<nesil>/d<gün>/<z>/<x>/<y>.json dosyalarında tutan disk önbelleği"""
+
+    def __init__(self, root=TILE_CACHE_DIR, ttl=TILE_CACHE_TTL):
+        self.root = root
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def _generation_file(self, layer):
+        return os.path.join(self.root, layer, 'GENERATION')
+
+    def generation(self, layer):
+        """Katmanın geçerli nesli"""
+        try:
+            with open(self._generation_file(layer), encoding='utf-8') as f:
+                return f.read().strip() or '0'
+        except OSError:
+            return '0'
+
+    def path(self, layer, generation, z, x, y, days):
+        return os.path.join(self.root, layer, generation, f"d{days}", str(z), str(x), f"{y}.json")
+
+    def get(self, layer, generation, z, x, y, days):
+        """Geçerli karo içeriğini getir, yoksa None"""
+        path = self.path(layer, generation, z, x, y, days)
+        try:
+            if time.time() - os.path.getmtime(path) <= self.ttl:
+                with open(path, 'rb') as f:
+                    body = f.read()
+                with self._lock:
+                    self.hits += 1
+                return body
+        except OSError:
+            pass
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def set(self, layer, generation, z, x, y, days, body):
+        """Karoyu yaz (geçici dosya + rename; okuyucular yarım dosya görmez)
+
+        generation, karo üretilmeden önce okunan nesildir: üretim sırasında
+        katman geçersiz kılınırsa karo eski nesle yazılır ve bir daha okunmaz.
+        """
+        path = self.path(layer, generation, z, x, y, days)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp, 'wb') as f:
+                f.write(body)
+            os.replace(tmp, path)
+        except OSError as e:
+            print(f"Karo önbelleğe yazılırken hata: {str(e)}")
+
+    def invalidate_layer(self, layer):
+        """Katmanın neslini değiştir ve eski karoları sil"""
+        layer_dir = os.path.join(self.root, layer)
+        generation = str(time.time_ns())
+        try:
+            os.makedirs(layer_dir, exist_ok=True)
+            tmp = f"{self._generation_file(layer)}.{os.getpid()}.tmp"
+            with open(tmp, 'w', encoding='utf-8') as f:
+                f.write(generation)
+            os.replace(tmp, self._generation_file(layer))
+            for name in os.listdir(layer_dir):
+                old = os.path.join(layer_dir, name)
+                if name != generation and os.path.isdir(old):
+                    shutil.rmtree(old, ignore_errors=True)
+        except OSError as e:
+            print(f"Karo önbelleği temizlenirken hata: {str(e)}")
+            return
+        with self._lock:
+            self.invalidations += 1
+
+    def stats(self):
+        with self._lock:
+            return {
+                'root': self.root,
+                'hits': self.hits,
+                'misses': self.misses,
+                'invalidations': self.invalidations,
+                'generations': {layer: self.generation(layer) for layer in TILE_LAYERS}
+            }
+
+tile_cache = TileCache()
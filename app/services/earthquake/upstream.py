@@ -0,0 +1,332 @@
+# upstream.py
+import hashlib
+import os
+import random
+import threading
+import time
+from collections import deque
+from datetime import datetime, timedelta
+from urllib.parse import urlsplit
+import requests
+from requests.adapters import HTTPAdapter
+from dotenv import load_dotenv
+from metrics import UPSTREAM_BREAKER_TRANSITIONS, UPSTREAM_FETCH_SECONDS, UPSTREAM_RETRY_ATTEMPTS, UPSTREAM_SHORT_CIRCUITS
+
+# .env dosyasını yükle
+load_dotenv()
+
+# Varsayılan zaman aşımları (sn): (bağlantı, okuma)
+UPSTREAM_CONNECT_TIMEOUT = float(os.getenv('UPSTREAM_CONNECT_TIMEOUT', '5'))
+UPSTREAM_READ_TIMEOUT = float(os.getenv('UPSTREAM_READ_TIMEOUT', '30'))
+DEFAULT_TIMEOUT = (UPSTREAM_CONNECT_TIMEOUT, UPSTREAM_READ_TIMEOUT)
+
+# Host başına açık tutulacak bağlantı sayısı
+UPSTREAM_POOL_SIZE = int(os.getenv('UPSTREAM_POOL_SIZE', '4'))
+
+USER_AGENT = 'EmergencyManagement-EarthquakeService/1.0'
+
+# Geçici hatalarda (bağlantı, zaman aşımı, 5xx, 429) istek başına en fazla yeniden deneme
+UPSTREAM_RETRIES = int(os.getenv('UPSTREAM_RETRIES', '2'))
+# Yeniden deneme beklemesi: UPSTREAM_BACKOFF * 2^deneme (sn, UPSTREAM_BACKOFF_MAX ile sınırlı, rastgele yayılımlı)
+UPSTREAM_BACKOFF = float(os.getenv('UPSTREAM_BACKOFF', '0.5'))
+UPSTREAM_BACKOFF_MAX = float(os.getenv('UPSTREAM_BACKOFF_MAX', '8'))
+# Yeniden deneme bütçesi: kaynak başına son UPSTREAM_RETRY_WINDOW sn'deki isteklerin en fazla bu oranı
+# kadar yeniden deneme (en az UPSTREAM_RETRY_MIN); kaynak çöktüğünde denemeler yükü katlamaz
+UPSTREAM_RETRY_RATIO = float(os.getenv('UPSTREAM_RETRY_RATIO', '0.2'))
+UPSTREAM_RETRY_MIN = int(os.getenv('UPSTREAM_RETRY_MIN', '3'))
+UPSTREAM_RETRY_WINDOW = float(os.getenv('UPSTREAM_RETRY_WINDOW', '600'))
+# Art arda bu kadar başarısız istekten sonra devre açılır
+UPSTREAM_BREAKER_FAILURES = int(os.getenv('UPSTREAM_BREAKER_FAILURES', '3'))
+# Açık devrenin deneme isteğine (half-open) kadar beklediği süre (sn); deneme başarısız olursa
+# süre UPSTREAM_BREAKER_MAX_COOLDOWN'a kadar ikiye katlanır
+UPSTREAM_BREAKER_COOLDOWN = float(os.getenv('UPSTREAM_BREAKER_COOLDOWN', '60'))
+UPSTREAM_BREAKER_MAX_COOLDOWN = float(os.getenv('UPSTREAM_BREAKER_MAX_COOLDOWN', '1800'))
+
+_sessions = {}
+_sessions_lock = threading.Lock()
+
+# İstek anahtarı -> {'etag', 'last_modified', 'hash'} (son işlenen yanıtın doğrulayıcıları)
+_validators = {}
+_validators_lock = threading.Lock()
+
+class CircuitOpenError(RuntimeError):
+    """Kaynağın devre kesicisi açık; istek yapılmadan reddedildi"""
+
+class RetryBudget:
+    """Kayan pencerede istek sayısına oranla sınırlı yeniden deneme hakkı"""
+
+    def __init__(self, ratio=UPSTREAM_RETRY_RATIO, minimum=UPSTREAM_RETRY_MIN, window=UPSTREAM_RETRY_WINDOW):
+        self.ratio = ratio
+        self.minimum = minimum
+        self.window = window
+        self._requests = deque()
+        self._retries = deque()
+
+    def _trim(self, now):
+        for times in (self._requests, self._retries):
+            while times and times[0] < now - self.window:
+                times.popleft()
+
+    def record_request(self):
+        self._requests.append(time.monotonic())
+
+    def try_spend(self):
+        """Bütçe elveriyorsa bir yeniden deneme hakkı harca"""
+        now = time.monotonic()
+        self._trim(now)
+        if len(self._retries) >= max(self.minimum, self.ratio * len(self._requests)):
+            return False
+        self._retries.append(now)
+        return True
+
+    def status(self):
+        self._trim(time.monotonic())
+        return {'requests': len(self._requests), 'retries': len(self._retries)}
+
+class CircuitBreaker:
+    """Kaynak başına devre kesici: closed -> (art arda hata) open -> (bekleme) half_open -> closed / open
+
+    Açık devrede istekler yapılmadan CircuitOpenError ile reddedilir. Bekleme
+    süresi dolunca tek bir deneme isteğine izin verilir (half_open); başarılıysa
+    devre kapanır, değilse bekleme süresi ikiye katlanarak yeniden açılır.
+    """
+
+    def __init__(self, name, failures=UPSTREAM_BREAKER_FAILURES, cooldown=UPSTREAM_BREAKER_COOLDOWN,
+                 max_cooldown=UPSTREAM_BREAKER_MAX_COOLDOWN):
+        self.name = name
+        self.failure_threshold = failures
+        self.base_cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.state = 'closed'
+        self.failures = 0
+        self.cooldown = cooldown
+        self.opened_at = None
+        self.retry_at = None  # monotonic
+        self.last_error = None
+        self.short_circuits = 0
+        self.budget = RetryBudget()
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def _transition(self, state):
+        self.state = state
+        UPSTREAM_BREAKER_TRANSITIONS.inc(source=self.name, state=state)
+
+    def before_request(self):
+        """İstek yapılabilir mi; açık devrede (veya deneme sürerken) CircuitOpenError
+
+        Dönüş: istek yarı açık devrenin deneme isteğiyse True (sonunda end_probe çağrılır)
+        """
+        with self._lock:
+            if self.state == 'open' and time.monotonic() >= self.retry_at:
+                self._transition('half_open')
+            if self.state == 'closed' or (self.state == 'half_open' and not self._probing):
+                self._probing = self.state == 'half_open'
+                self.budget.record_request()
+                return self._probing
+            self.short_circuits += 1
+            if self.state == 'half_open':
+                message = f"{self.name} devre kesicisi yarı açık, deneme isteği sürüyor"
+            else:
+                message = (f"{self.name} devre kesicisi açık ({self.last_error}); "
+                           f"{max(0, self.retry_at - time.monotonic()):.0f} sn sonra yeniden denenecek")
+        UPSTREAM_SHORT_CIRCUITS.inc(source=self.name)
+        raise CircuitOpenError(message)
+
+    def end_probe(self):
+        """Deneme isteği bitti; sonucu işlenmeden (beklenmeyen hatayla) bittiyse sonraki istek yeniden dener"""
+        with self._lock:
+            self._probing = False
+
+    def record_success(self):
+        with self._lock:
+            self._probing = False
+            self.failures = 0
+            self.cooldown = self.base_cooldown
+            self.last_error = None
+            if self.state != 'closed':
+                self.opened_at = None
+                self.retry_at = None
+                self._transition('closed')
+
+    def record_failure(self, error):
+        with self._lock:
+            self.last_error = str(error)[:200]
+            self.failures += 1
+            if self.state == 'half_open':
+                # Deneme başarısız: daha uzun bekle
+                self.cooldown = min(self.cooldown * 2, self.max_cooldown)
+            elif self.state != 'closed' or self.failures < self.failure_threshold:
+                return
+            self._probing = False
+            self.opened_at = datetime.utcnow()
+            self.retry_at = time.monotonic() + self.cooldown
+            self._transition('open')
+
+    def status(self):
+        with self._lock:
+            return {
+                'state': self.state,
+                'failures': self.failures,
+                'opened_at': self.opened_at.isoformat() if self.opened_at else None,
+                'retry_at': (datetime.utcnow() + timedelta(seconds=max(0, self.retry_at - time.monotonic()))).isoformat()
+                            if self.state == 'open' else None,
+                'cooldown': self.cooldown,
+                'last_error': self.last_error,
+                'short_circuits': self.short_circuits,
+                'retry_budget': self.budget.status()
+            }
+
+_breakers = {}
+_breakers_lock = threading.Lock()
+
+def get_breaker(name):
+    """Kaynağın (verilmezse host'un) devre kesicisi"""
+    with _breakers_lock:
+        breaker = _breakers.get(name)
+        if breaker is None:
+            breaker = _breakers[name] = CircuitBreaker(name)
+        return breaker
+
+def breaker_status():
+    """Bu süreçteki devre kesicilerin durumu"""
+    with _breakers_lock:
+        breakers = list(_breakers.values())
+    return {breaker.name: breaker.status() for breaker in breakers}
+
+def backoff(attempt):
+    """attempt'inci yeniden denemeden önceki bekleme (üstel, rastgele yayılımlı)"""
+    return min(UPSTREAM_BACKOFF_MAX, UPSTREAM_BACKOFF * 2 ** attempt) * random.uniform(0.5, 1)
+
+def _transient(response):
+    return response.status_code >= 500 or response.status_code == 429
+
+def get_session(url):
+    """URL'nin host'u için paylaşılan (keep-alive) oturumu getir"""
+    host = urlsplit(url).netloc
+    with _sessions_lock:
+        session = _sessions.get(host)
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=UPSTREAM_POOL_SIZE)
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            session.headers['User-Agent'] = USER_AGENT
+            _sessions[host] = session
+        return session
+
+def request_key(url, params=None):
+    """URL ve parametrelerden doğrulayıcı anahtarı oluştur"""
+    if not params:
+        return url
+    return url + '?' + '&'.join(f"{k}={v}" for k, v in sorted(params.items()))
+
+def _send(url, params, timeout, stream, headers, name):
+    started = time.perf_counter()
+    status = 'error'
+    try:
+        response = get_session(url).get(url, params=params, timeout=timeout or DEFAULT_TIMEOUT, stream=stream, headers=headers)
+        status = str(response.status_code)
+        return response
+    finally:
+        UPSTREAM_FETCH_SECONDS.observe(time.perf_counter() - started, source=name, status=status)
+
+def get(url, params=None, timeout=None, stream=False, headers=None, source=None):
+    """Paylaşılan oturumla GET isteği yap (zaman aşımı her zaman uygulanır)
+
+    Kaynağın (verilmezse host'un) devre kesicisi açıksa CircuitOpenError
+    fırlatır. Bağlantı hatası, zaman aşımı, 5xx ve 429 yanıtları yeniden
+    deneme bütçesi elverdiği sürece üstel beklemeyle en fazla UPSTREAM_RETRIES
+    kez yeniden denenir; denemeler tükenince son hata fırlatılır veya son
+    yanıt döner ve devre kesiciye hata olarak işlenir. Her deneme
+    upstream_fetch_seconds metriğine yazılır.
+    """
+    name = source or urlsplit(url).netloc
+    breaker = get_breaker(name)
+    probe = breaker.before_request()
+    try:
+        attempt = 0
+        while True:
+            error = None
+            try:
+                response = _send(url, params, timeout, stream, headers, name)
+            except requests.RequestException as e:
+                response, error = None, e
+            
+            if response is not None and not _transient(response):
+                breaker.record_success()
+                return response
+            
+            # Yarı açık devrede deneme isteği tekrarlanmaz
+            if attempt >= UPSTREAM_RETRIES or probe or not breaker.budget.try_spend():
+                breaker.record_failure(error or f"HTTP {response.status_code}")
+                if response is None:
+                    raise error
+                return response
+            
+            if response is not None:
+                response.close()
+            UPSTREAM_RETRY_ATTEMPTS.inc(source=name)
+            time.sleep(backoff(attempt))
+            attempt += 1
+    finally:
+        if probe:
+            # RequestException dışındaki hatalarda da deneme hakkı bırakılır; aksi halde
+            # devre yarı açık kalır ve süreç yeniden başlayana kadar tüm istekler reddedilir
+            breaker.end_probe()
+
+def conditional_get(url, params=None, timeout=None, stream=False, source=None):
+    """Koşullu GET: kaynak değişmediyse None döner
+
+    Önceki yanıtın ETag/Last-Modified bilgileri gönderilir; 304 gelirse ya da
+    (akış olmayan isteklerde) gövdenin özeti son işlenenle aynıysa None döner.
+    Yanıt başarıyla işlendikten sonra mark_processed() çağrılmalıdır, aksi
+    halde aynı veri bir sonraki çekmede yeniden işlenir.
+    """
+    key = request_key(url, params)
+    with _validators_lock:
+        previous = dict(_validators.get(key, {}))
+
+    headers = {}
+    if previous.get('etag'):
+        headers['If-None-Match'] = previous['etag']
+    if previous.get('last_modified'):
+        headers['If-Modified-Since'] = previous['last_modified']
+
+    response = get(url, params=params, timeout=timeout, stream=stream, headers=headers, source=source)
+    if response.status_code == 304:
+        response.close()
+        return None
+    response.raise_for_status()
+
+    body_hash = None
+    if not stream:
+        body_hash = hashlib.sha256(response.content).hexdigest()
+        if previous.get('hash') == body_hash:
+            return None
+
+    response.upstream_key = key
+    response.upstream_validators = {
+        'etag': response.headers.get('ETag'),
+        'last_modified': response.headers.get('Last-Modified'),
+        'hash': body_hash
+    }
+    return response
+
+def mark_processed(response):
+    """Yanıtın doğrulayıcılarını sakla; sonraki koşullu istekte kullanılır"""
+    key = getattr(response, 'upstream_key', None)
+    if key is None:
+        return
+    with _validators_lock:
+        _validators[key] = response.upstream_validators
+
+def forget(url, params=None):
+    """Kaynağın doğrulayıcılarını sil (bir sonraki çekme tam yapılır)"""
+    with _validators_lock:
+        _validators.pop(request_key(url, params), None)
+
+def forget_all():
+    """Tüm doğrulayıcıları sil (ölçümlerde her turun tam çekme yapması için)"""
+    with _validators_lock:
+        _validators.clear()
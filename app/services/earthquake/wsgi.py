@@ -0,0 +1,12 @@
+# wsgi.py
+"""Üretim girişi (WSGI)
+
+    gunicorn -w 4 --worker-class gthread --threads 8 -b 0.0.0.0:3001 wsgi:application
+
+create_app() veritabanına dokunmaz; işçiler (gerekirse --preload ile fork
+edildikten sonra) ilk isteklerinde liderlik seçimine katılır. INGEST_MODE=inline
+iken yalnızca lider seçilen işçi veri çeker, hepsi okuma isteklerini yanıtlar.
+"""
+from app import create_app
+
+application = create_app()